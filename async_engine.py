@@ -0,0 +1,158 @@
+# async_engine.py
+
+import asyncio
+import contextlib
+import threading
+import time
+from sugang_request import send_sugang_request
+from course_list import divisions
+from scheduler import FixedRateScheduler
+import metrics
+
+
+async def run_engine(subject_data, handle_response, concurrency=4, scheduler=None,
+                     attempts_per_course=1, retry_delay=1.0, priorities=None,
+                     watch=None, watch_interval=1.0, retry=None, pending=None, on_reject=None,
+                     send=None, label=None):
+    """subject_data 의 모든 과목을 동시에 신청하고, 성공한 과목의 남은 시도는 즉시 취소
+
+    전송 속도는 scheduler 가 정하며, priorities 에 없는 과목은 작성 순서대로 우선순위를 받는다.
+    watch 를 주면 watch_interval 마다 호출해 True 가 나오면 (과목 목록이 바뀌면)
+    추가된 과목의 시도를 시작하고 빠지거나 분반이 바뀐 과목의 시도는 취소한다.
+    retry(RetryPolicy) 를 주면 실패 종류별 대기 시간을 retry_delay 에 더하고,
+    서킷 브레이커가 열려 있는 동안에는 전송하지 않는다.
+
+    분반이 여럿인 과목은 분반마다 시도를 만들되, 두 분반이 함께 신청되지 않도록 한 번에 한 분반만
+    요청 중이게 하고 한 분반이 성공하면 나머지 분반의 시도를 취소한다. pending(과목) 은 아직 신청할
+    분반을, on_reject(과목, 분반) 은 다시 보내도 소용없는 거절을 처리한다 (기본값은 과목을 목록에서 뺌).
+
+    send(과목, 분반) 로 전송 함수를 바꿀 수 있고 (계정별 세션으로 보낼 때), label 을 주면 출력 앞에 붙인다.
+    scheduler 와 retry 를 여러 엔진이 함께 쓰면 서버 전체 전송 속도 상한과 서킷 브레이커를 공유한다.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    if scheduler is None:
+        scheduler = FixedRateScheduler(4.0)
+    priorities = priorities or {}
+    if send is None:
+        send = send_sugang_request
+    prefix = f"[{label}] " if label else ""
+    if pending is None:
+        def pending(course):
+            return divisions(subject_data[course]) if course in subject_data else ()
+    if on_reject is None:
+        def on_reject(course, div):
+            print(f"{prefix}재시도해도 신청할 수 없어 {course} 제외합니다.")
+            subject_data.pop(course, None)
+    course_tasks = {}   # 학수번호: (분반 항목, 시도 태스크 목록, 전송 중단 이벤트)
+
+    def cancel_course(course):
+        current = asyncio.current_task()
+        _, tasks, stop = course_tasks.get(course, (None, (), None))
+        # 태스크를 취소해도 이미 스레드 풀에 넘긴 전송은 멈추지 않으므로 작업 스레드가 볼 표시를 남김
+        if stop is not None:
+            stop.set()
+        for task in tasks:
+            if task is not current:
+                task.cancel()
+
+    def send_unless_stopped(stop, course, div):
+        # 스레드 풀에서 차례를 기다리는 사이 과목이 성공하거나 빠졌으면 보내지 않음
+        if stop.is_set():
+            return None
+        response = send(course, div)
+        if response.result.granted:
+            # 이벤트 루프가 결과를 처리하기 전에 다음 작업이 같은 스레드에서 바로 시작될 수 있으므로 여기서 먼저 멈춤
+            stop.set()
+        return response
+
+    def wanted(course, entry, div):
+        return subject_data.get(course) == entry and div in pending(course)
+
+    async def attempt_loop(course, entry, div, priority, guard, stop):
+        while wanted(course, entry, div):
+            backoff = 0.0
+            try:
+                if retry is not None and retry.open:
+                    await retry.wait_async()
+                # 결과 처리까지 잠금을 쥐고 있어 다른 분반은 이 요청이 끝난 뒤에야 보냄
+                async with guard:
+                    # 기다리는 사이 다른 분반이 성공했거나 이 분반이 제외되었으면 보내지 않음
+                    if not wanted(course, entry, div):
+                        return
+                    async with semaphore:
+                        await scheduler.acquire(priority)
+                        start = time.monotonic()
+                        try:
+                            response = await asyncio.to_thread(send_unless_stopped, stop, course, div)
+                        except Exception:
+                            scheduler.observe(time.monotonic() - start, error=True)
+                            raise
+                        if response is None:
+                            return
+                        scheduler.observe(time.monotonic() - start, response.result)
+                        if retry is not None:
+                            _, backoff = retry.record(result=response.result)
+                        metrics.set_gauge('sugang_send_rate', scheduler.rate)
+                    print(f"{prefix}수강신청 요청 전송 - 학수번호: {course}, 분반: {div} "
+                          f"(연결 재사용: {response.reused}, {response.elapsed * 1000:.1f}ms)")
+                    result = response.result
+                    print(f"{prefix}응답: {result.outcome.value} (코드: {result.code}) {result.message}")
+                    # 대기하는 사이 다른 시도가 먼저 성공했거나 목록에서 빠졌으면 결과를 버림
+                    if not wanted(course, entry, div):
+                        return
+                    if handle_response(course, div, result):
+                        print(f"{prefix}수강신청 성공으로 {course} 제거합니다. (분반 {div})")
+                        subject_data.pop(course, None)
+                        cancel_course(course)
+                        return
+                    if not result.retry:
+                        on_reject(course, div)
+                        if course not in subject_data:
+                            cancel_course(course)
+                        return
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                if retry is not None:
+                    failure, backoff = retry.record(error=e)
+                    print(f"{prefix}요청 중 오류 발생 ({failure.value}, {backoff:.2f}초 후 재시도):", e)
+                else:
+                    print(f"{prefix}요청 중 오류 발생:", e)
+            await asyncio.sleep(retry_delay + backoff)
+
+    def sync_courses():
+        # 목록에 맞춰 시도 태스크를 만들거나 취소 (분반 항목이 같고 진행 중이면 그대로 둠)
+        for index, (course, entry) in enumerate(list(subject_data.items())):
+            current = course_tasks.get(course)
+            if current is not None and current[0] == entry and not all(t.done() for t in current[1]):
+                continue
+            if current is not None:
+                cancel_course(course)
+            priority = priorities.get(course, index)
+            guard = asyncio.Lock() if len(divisions(entry)) > 1 else contextlib.nullcontext()
+            stop = threading.Event()
+            course_tasks[course] = (entry, [
+                asyncio.create_task(attempt_loop(course, entry, div, priority, guard, stop))
+                for _ in range(attempts_per_course)
+                for div in pending(course)   # 분반 우선순위 순으로 번갈아 가며 잠금을 받음
+            ], stop)
+        for course in list(course_tasks):
+            if course not in subject_data:
+                cancel_course(course)
+                del course_tasks[course]
+
+    sync_courses()
+    while True:
+        tasks = [task for _, group, _ in course_tasks.values() for task in group if not task.done()]
+        if watch is None:
+            await asyncio.gather(*tasks, return_exceptions=True)
+            break
+        if not tasks and not subject_data:
+            break
+        if tasks:
+            await asyncio.wait(tasks, timeout=watch_interval)
+        else:
+            await asyncio.sleep(watch_interval)
+        if watch():
+            sync_courses()
+    return not subject_data
@@ -0,0 +1,110 @@
+# clock_sync.py
+
+import math
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+
+INDEX_PATH = '/index.do'
+KST = timezone(timedelta(hours=9))
+SPIN_WINDOW = 0.02   # 목표 시각 직전 이 시간(초) 동안은 sleep 대신 바쁜 대기
+PROBE_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+    'Accept': '*/*',
+}
+
+
+@dataclass
+class ClockEstimate:
+    offset: float      # 서버 시각 - 로컬 시각 (초)
+    error: float       # 추정 오차 범위 (± 초)
+    rtt: float         # 가장 짧았던 왕복 시간 (초)
+    probes: int
+
+    def server_time(self, local=None):
+        return (time.time() if local is None else local) + self.offset
+
+    def local_time(self, server):
+        return server - self.offset
+
+
+def probe_date(pool, path=INDEX_PATH):
+    """HEAD 요청 한 번으로 (보낸 시각, 받은 시각, 서버 Date 시각) 을 얻음"""
+    t0 = time.time()
+    response, _ = pool.request('HEAD', path, headers=PROBE_HEADERS)
+    t1 = time.time()
+    date = response.getheader('Date')
+    if not date:
+        raise RuntimeError('서버 응답에 Date 헤더가 없습니다.')
+    return t0, t1, parsedate_to_datetime(date).timestamp()
+
+
+def estimate_offset(pool, probes=8, path=INDEX_PATH):
+    """Date 헤더(초 단위)로 서버 시계와의 차이를 추정
+
+    서버가 요청을 처리한 시각은 [Date, Date + 1) 안에 있고 로컬 시각으로는 [t0, t1] 안에
+    있으므로, 오프셋은 [Date - t1, Date + 1 - t0] 구간에 있다. 첫 측정 뒤에는 서버의 초가
+    바뀌는 순간에 요청이 처리되도록 전송 시각을 맞춰 구간을 좁혀 나간다.
+    """
+    t0, t1, date = probe_date(pool, path)
+    lo, hi = date - t1, date + 1 - t0
+    rtt = t1 - t0
+    for _ in range(probes - 1):
+        mid = (lo + hi) / 2
+        # 다음 서버 초 경계에 요청이 도착하도록 보낼 로컬 시각 계산
+        boundary = math.floor(time.time() + mid + rtt) + 1
+        send_at = boundary - mid - rtt / 2
+        time.sleep(max(0.0, send_at - time.time()))
+
+        t0, t1, date = probe_date(pool, path)
+        rtt = min(rtt, t1 - t0)
+        new_lo, new_hi = date - t1, date + 1 - t0
+        if max(lo, new_lo) <= min(hi, new_hi):
+            lo, hi = max(lo, new_lo), min(hi, new_hi)
+        else:
+            # 네트워크 지연이 튀어 구간이 어긋나면 최근 측정으로 다시 시작
+            lo, hi = new_lo, new_hi
+    return ClockEstimate(offset=(lo + hi) / 2, error=(hi - lo) / 2, rtt=rtt, probes=probes)
+
+
+def parse_server_time(text):
+    """'YYYY-MM-DD HH:MM:SS[.ffffff]' (한국 시간) 을 epoch 초로 변환"""
+    moment = datetime.fromisoformat(text)
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=KST)
+    return moment.timestamp()
+
+
+def sleep_until(local_target):
+    """local_target(epoch 초)까지 대기 (마지막 구간은 바쁜 대기로 정밀하게)"""
+    remaining = local_target - time.time()
+    if remaining > SPIN_WINDOW:
+        time.sleep(remaining - SPIN_WINDOW)
+    deadline = time.perf_counter() + (local_target - time.time())
+    while time.perf_counter() < deadline:
+        pass
+
+
+def fire_batch(jobs, local_target):
+    """jobs 의 각 함수를 local_target 에 동시에 실행하고 (실제 실행 시각, 결과 또는 예외) 목록을 돌려줌"""
+    start = threading.Event()
+    results = [None] * len(jobs)
+
+    def worker(index, job):
+        start.wait()
+        sent = time.time()
+        try:
+            results[index] = (sent, job())
+        except Exception as e:
+            results[index] = (sent, e)
+
+    threads = [threading.Thread(target=worker, args=(i, job), daemon=True) for i, job in enumerate(jobs)]
+    for thread in threads:
+        thread.start()
+    sleep_until(local_target)
+    start.set()
+    for thread in threads:
+        thread.join()
+    return results
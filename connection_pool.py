@@ -0,0 +1,359 @@
+# connection_pool.py
+
+import contextlib
+import http.client
+import select
+import socket
+import ssl
+import threading
+import time
+import metrics
+
+# 재사용 중인 연결에서 서버가 먼저 끊었을 때 발생하는 예외들
+STALE_ERRORS = (ConnectionError, http.client.RemoteDisconnected, http.client.BadStatusLine)
+
+
+_SSL_CONTEXT = None
+
+
+def default_ssl_context():
+    global _SSL_CONTEXT
+    if _SSL_CONTEXT is None:
+        _SSL_CONTEXT = ssl.create_default_context()
+    return _SSL_CONTEXT
+
+
+# 호스트 주소 캐시 (없으면 연결할 때마다 getaddrinfo)
+DNS_CACHE = None
+
+
+def set_dns_cache(cache):
+    global DNS_CACHE
+    DNS_CACHE = cache
+
+
+# (호스트, 포트) 별 마지막 TLS 세션 -> (SSLContext, SSLSession)
+# 다시 연결할 때 이 세션을 넘기면 전체 핸드셰이크 대신 세션 재개를 시도한다.
+# ssl.SSLSession 은 직렬화할 수 없어 프로세스 안에서만 유지된다 (풀을 새로 만들어도 유지).
+TLS_SESSIONS = {}
+
+metrics.REGISTRY.describe('sugang_tls_handshakes_total', 'TLS 핸드셰이크 수 (resumed: 세션 재개 여부)')
+
+
+class PooledConnection:
+    """호스트 하나에 열어둔 keep-alive 소켓"""
+
+    def __init__(self, sock, timings=None):
+        self.sock = sock
+        self.timings = timings or {}   # 연결할 때 걸린 단계별 시간 (dns/connect/tls)
+        self.created = time.monotonic()
+        self.last_used = self.created
+        self.requests = 0
+
+    def is_alive(self):
+        # 유휴 상태인데 읽을 데이터(EOF 포함)가 있으면 서버가 연결을 닫은 것
+        if self.sock is None:
+            return False
+        try:
+            readable, _, _ = select.select([self.sock], [], [], 0)
+        except (OSError, ValueError):
+            return False
+        if not readable:
+            return True
+        if isinstance(self.sock, ssl.SSLSocket):
+            return self._drain_tls()
+        return False
+
+    def _drain_tls(self):
+        # TLS 1.3 서버는 핸드셰이크 뒤에 세션 티켓을 보내므로 유휴 연결도 읽을 수 있는 상태가 됨
+        # 논블로킹으로 읽어 티켓 같은 TLS 레코드만 있었으면 (SSLWantReadError) 살아 있는 연결
+        timeout = self.sock.gettimeout()
+        try:
+            self.sock.setblocking(False)
+            self.sock.recv(1)
+        except ssl.SSLWantReadError:
+            return True
+        except (OSError, ValueError):
+            return False
+        finally:
+            try:
+                self.sock.settimeout(timeout)
+            except OSError:
+                pass
+        # EOF(b'') 이거나 요청하지 않은 응답 데이터가 남아 있으면 쓸 수 없음
+        return False
+
+    def abort(self):
+        # 다른 스레드에서 recv 중인 요청을 깨움 (소켓 정리는 그 스레드가 close 로 함)
+        sock = self.sock
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    def close(self):
+        if self.sock is not None:
+            try:
+                self.sock.close()
+            except OSError:
+                pass
+            self.sock = None
+
+
+class CancelToken:
+    """진행 중인 요청을 다른 스레드에서 취소 (헤지 요청 중 늦은 쪽을 끊을 때 사용)"""
+
+    def __init__(self):
+        self.cancelled = False
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def attach(self, conn):
+        with self._lock:
+            self._conn = conn
+            cancelled = self.cancelled
+        if cancelled:
+            conn.abort()
+
+    def cancel(self):
+        with self._lock:
+            self.cancelled = True
+            conn = self._conn
+        if conn is not None:
+            conn.abort()
+
+
+class PoolResponse:
+    """HTTPResponse 와 연결 재사용 여부를 함께 담는 응답"""
+
+    def __init__(self, raw, reused, timings):
+        self.raw = raw
+        self.reused = reused
+        self.timings = timings     # 단계별 시간(초): dns, connect, tls, ttfb
+        self.status = raw.status
+        self.headers = raw.headers
+
+    def getheader(self, name, default=None):
+        return self.raw.getheader(name, default)
+
+    def read(self, amt=None):
+        return self.raw.read(amt)
+
+    def read1(self, amt=-1):
+        # 도착한 만큼만 읽어 돌려줌 (스트리밍 파싱용)
+        return self.raw.read1(amt)
+
+
+def build_request(method, path, headers, body=None):
+    # 요청 라인, 헤더, 본문을 한 번에 보낼 바이트열로 조립
+    lines = [f'{method} {path} HTTP/1.1']
+    lines.extend(f'{name}: {value}' for name, value in headers.items())
+    if body is not None:
+        lines.append(f'Content-Length: {len(body)}')
+    head = ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1')
+    return head + body if body else head
+
+
+class ConnectionPool:
+    """호스트 하나에 대한 HTTP/1.1 keep-alive 연결 풀"""
+
+    def __init__(self, host, port=443, use_tls=True, maxsize=4, idle_timeout=30.0, timeout=None, ssl_context=None):
+        self.host = host
+        self.port = port
+        self.use_tls = use_tls
+        self.maxsize = maxsize
+        self.idle_timeout = idle_timeout
+        self.timeout = timeout
+        self._ssl_context = ssl_context
+        self.connects = 0
+        self.reuses = 0
+        self.tls_full = 0        # 전체 TLS 핸드셰이크 수
+        self.tls_resumed = 0     # 세션을 재개한 TLS 핸드셰이크 수
+        self._idle = []
+        self._lock = threading.Lock()
+
+    @property
+    def ssl_context(self):
+        # 인증서 묶음을 읽는 데 수십 ms 가 걸리므로 첫 TLS 연결 때 만들어 모든 풀이 함께 씀
+        if self._ssl_context is None and self.use_tls:
+            self._ssl_context = default_ssl_context()
+        return self._ssl_context
+
+    @property
+    def host_header(self):
+        default_port = 443 if self.use_tls else 80
+        return self.host if self.port == default_port else f'{self.host}:{self.port}'
+
+    def _resolve(self):
+        if DNS_CACHE is not None:
+            return DNS_CACHE.resolve(self.host, self.port)
+        return socket.getaddrinfo(self.host, self.port, 0, socket.SOCK_STREAM)
+
+    def _tls_session(self, context):
+        entry = TLS_SESSIONS.get((self.host, self.port))
+        # 다른 SSLContext 에서 만든 세션은 넘길 수 없음
+        if entry is None or entry[0] is not context:
+            return None
+        return entry[1]
+
+    def _remember_session(self, sock):
+        # TLS 1.3 은 핸드셰이크 뒤 첫 응답과 함께 티켓이 오므로 응답을 읽은 뒤에도 다시 저장
+        session = sock.session
+        if session is not None and (session.has_ticket or sock.version() != 'TLSv1.3'):
+            TLS_SESSIONS[(self.host, self.port)] = (sock.context, session)
+
+    def _connect(self):
+        # DNS, TCP 연결, TLS 핸드셰이크를 나눠서 시간을 잼
+        t0 = time.perf_counter()
+        addresses = self._resolve()
+        t1 = time.perf_counter()
+        sock = None
+        error = OSError(f'{self.host} 주소를 찾지 못했습니다.')
+        for family, type_, proto, _, address in addresses:
+            try:
+                sock = socket.socket(family, type_, proto)
+                sock.settimeout(self.timeout)
+                sock.connect(address)
+                break
+            except OSError as e:
+                error = e
+                if sock is not None:
+                    sock.close()
+                sock = None
+        if sock is None:
+            # 캐시한 주소가 바뀌었을 수 있으므로 다음 연결은 새로 조회
+            if DNS_CACHE is not None:
+                DNS_CACHE.forget(self.host, self.port)
+            raise error
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        t2 = time.perf_counter()
+        timings = {'dns': t1 - t0, 'connect': t2 - t1}
+        resumed = None
+        if self.use_tls:
+            context = self.ssl_context
+            try:
+                sock = context.wrap_socket(sock, server_hostname=self.host, session=self._tls_session(context))
+            except BaseException:
+                sock.close()
+                raise
+            timings['tls'] = time.perf_counter() - t2
+            resumed = sock.session_reused
+            self._remember_session(sock)
+            metrics.inc('sugang_tls_handshakes_total', resumed=str(resumed).lower())
+        with self._lock:
+            self.connects += 1
+            if resumed is not None:
+                self.tls_resumed += resumed
+                self.tls_full += not resumed
+        return PooledConnection(sock, timings)
+
+    def _acquire(self):
+        # 가장 최근에 쓴 연결부터 꺼내고, 오래됐거나 끊긴 연결은 버림
+        now = time.monotonic()
+        while True:
+            with self._lock:
+                if not self._idle:
+                    break
+                conn = self._idle.pop()
+            if now - conn.last_used < self.idle_timeout and conn.is_alive():
+                if self.use_tls:
+                    # 유휴 중에 받은 세션 티켓을 다음 연결에 쓸 수 있게 저장
+                    self._remember_session(conn.sock)
+                return conn, True
+            conn.close()
+        return self._connect(), False
+
+    def _release(self, conn):
+        conn.last_used = time.monotonic()
+        conn.requests += 1
+        if self.use_tls:
+            self._remember_session(conn.sock)
+        with self._lock:
+            if len(self._idle) < self.maxsize:
+                self._idle.append(conn)
+                return
+        conn.close()
+
+    def _send(self, conn, method, payload):
+        conn.sock.settimeout(self.timeout)
+        start = time.perf_counter()
+        conn.sock.sendall(payload)
+        raw = http.client.HTTPResponse(conn.sock, method=method)
+        raw.begin()
+        # 전송 시작부터 응답 헤더를 다 받을 때까지 (첫 바이트 대기)
+        raw.ttfb = time.perf_counter() - start
+        return raw
+
+    def prewarm(self, count=None):
+        """요청 전에 연결을 미리 열어 DNS/TCP/TLS 비용을 앞당김"""
+        count = self.maxsize if count is None else min(count, self.maxsize)
+        with self._lock:
+            missing = count - len(self._idle)
+        for _ in range(missing):
+            self._release(self._connect())
+        return count
+
+    def base_headers(self):
+        """모든 요청에 들어가는 기본 헤더"""
+        return {'Host': self.host_header, 'Connection': 'keep-alive'}
+
+    def open(self, method, path, body=None, headers=None):
+        """요청을 보내고 PoolResponse 를 돌려줌 (본문을 끝까지 읽어야 연결이 풀로 돌아감)"""
+        request_headers = self.base_headers()
+        request_headers.update(headers or {})
+        return self.open_raw(method, build_request(method, path, request_headers, body))
+
+    @contextlib.contextmanager
+    def open_raw(self, method, payload, cancel=None):
+        """미리 조립한 요청 바이트열을 그대로 보냄 (cancel 토큰으로 다른 스레드에서 끊을 수 있음)"""
+        conn, reused = self._acquire()
+        if cancel is not None:
+            cancel.attach(conn)
+        try:
+            raw = self._send(conn, method, payload)
+        except STALE_ERRORS:
+            conn.close()
+            if not reused or (cancel is not None and cancel.cancelled):
+                raise
+            # 재사용한 연결이 그 사이 끊겼으면 새 연결로 한 번만 다시 보냄
+            conn, reused = self._connect(), False
+            if cancel is not None:
+                cancel.attach(conn)
+            try:
+                raw = self._send(conn, method, payload)
+            except BaseException:
+                conn.close()
+                raise
+        except BaseException:
+            conn.close()
+            raise
+
+        if reused:
+            with self._lock:
+                self.reuses += 1
+            timings = {'ttfb': raw.ttfb}
+        else:
+            timings = dict(conn.timings, ttfb=raw.ttfb)
+
+        try:
+            yield PoolResponse(raw, reused, timings)
+        except BaseException:
+            conn.close()
+            raise
+        if raw.isclosed() and not raw.will_close and not (cancel is not None and cancel.cancelled):
+            self._release(conn)
+        else:
+            conn.close()
+
+    def request(self, method, path, body=None, headers=None):
+        """본문까지 모두 읽은 뒤 (응답, 본문 바이트) 를 돌려줌"""
+        with self.open(method, path, body, headers) as response:
+            data = response.read()
+        return response, data
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
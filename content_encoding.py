@@ -0,0 +1,107 @@
+# content_encoding.py
+
+import zlib
+
+# brotli 는 선택 설치 (pip install brotli 또는 brotlicffi) - 없으면 br 을 요청하지 않음
+try:
+    import brotli
+except ImportError:
+    try:
+        import brotlicffi as brotli
+    except ImportError:
+        brotli = None
+
+SUPPORTED = ('gzip', 'deflate', 'br') if brotli is not None else ('gzip', 'deflate')
+ACCEPT_ENCODING = ', '.join(SUPPORTED)
+
+
+class DecodingError(ValueError):
+    pass
+
+
+class _ZlibDecoder:
+    def __init__(self, wbits):
+        self._obj = zlib.decompressobj(wbits) if wbits is not None else None
+        self._head = b''
+
+    def decompress(self, chunk):
+        if self._obj is None:
+            # deflate 는 zlib 헤더가 있는 경우와 없는(raw) 경우가 섞여 있어 앞 두 바이트로 구분
+            chunk = self._head + chunk
+            if len(chunk) < 2:
+                self._head = chunk
+                return b''
+            self._head = b''
+            if chunk[0] & 0x0f == 8 and ((chunk[0] << 8) | chunk[1]) % 31 == 0:
+                self._obj = zlib.decompressobj(zlib.MAX_WBITS)
+            else:
+                self._obj = zlib.decompressobj(-zlib.MAX_WBITS)
+        try:
+            return self._obj.decompress(chunk)
+        except zlib.error as e:
+            raise DecodingError(f'압축 해제 실패: {e}') from e
+
+    def flush(self):
+        return self._obj.flush() if self._obj is not None else b''
+
+
+class _BrotliDecoder:
+    def __init__(self):
+        self._obj = brotli.Decompressor()
+        # brotli 는 process, brotlicffi 는 decompress
+        self._process = getattr(self._obj, 'process', None) or self._obj.decompress
+
+    def decompress(self, chunk):
+        try:
+            return self._process(chunk)
+        except brotli.error as e:
+            raise DecodingError(f'압축 해제 실패: {e}') from e
+
+    def flush(self):
+        return b''
+
+
+class _ChainDecoder:
+    """여러 번 압축된 경우 (Content-Encoding: gzip, br) 적용 역순으로 풂"""
+
+    def __init__(self, decoders):
+        self.decoders = decoders
+
+    def decompress(self, chunk):
+        for decoder in self.decoders:
+            chunk = decoder.decompress(chunk)
+        return chunk
+
+    def flush(self):
+        data = b''
+        for decoder in self.decoders:
+            if data:
+                data = decoder.decompress(data)
+            data += decoder.flush()
+        return data
+
+
+def _decoder(name):
+    if name in ('gzip', 'x-gzip'):
+        return _ZlibDecoder(16 + zlib.MAX_WBITS)
+    if name == 'deflate':
+        return _ZlibDecoder(None)
+    if name == 'br':
+        if brotli is None:
+            raise DecodingError('br 응답을 풀려면 brotli 패키지가 필요합니다.')
+        return _BrotliDecoder()
+    raise DecodingError(f'지원하지 않는 Content-Encoding: {name}')
+
+
+def make_decoder(content_encoding):
+    """Content-Encoding 헤더에 맞는 조각 단위 압축 해제기 (압축이 없으면 None)
+
+    decompress(chunk) 는 지금까지 받은 조각으로 풀 수 있는 만큼만 돌려주므로
+    응답을 끝까지 받기 전에도 파서에 넘길 수 있다.
+    """
+    names = [name.strip().lower() for name in (content_encoding or '').split(',')]
+    names = [name for name in names if name and name != 'identity']
+    if not names:
+        return None
+    decoders = [_decoder(name) for name in reversed(names)]
+    return decoders[0] if len(decoders) == 1 else _ChainDecoder(decoders)
@@ -0,0 +1,162 @@
+# course_list.py
+
+import json
+import os
+import re
+import time
+from event_log import log_event
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "subjects.json")
+CHECK_INTERVAL = 1.0   # 파일 변경 여부를 확인하는 최소 간격(초)
+
+COURSE_RE = re.compile(r'^[A-Z0-9]{4,12}$')
+
+
+def divisions(entry):
+    """분반 항목(분반 하나 또는 우선순위 순 분반 튜플)을 분반 튜플로"""
+    return entry if isinstance(entry, tuple) else (entry,)
+
+
+def expand(data):
+    """{학수번호: 분반 항목} 을 (학수번호, 분반) 목록으로 풀어 씀 (분반은 우선순위 순)"""
+    return [(course, div) for course, entry in data.items() for div in divisions(entry)]
+
+
+def _division(course, div):
+    if isinstance(div, str) and div.isdigit():
+        div = int(div)
+    if isinstance(div, bool) or not isinstance(div, int) or not 1 <= div <= 99:
+        raise ValueError(f"{course} 의 분반이 잘못되었습니다: {div!r}")
+    return div
+
+
+def validate(raw):
+    """파일 내용을 검사해 (subject_data, subject_priority) 를 돌려줌 (잘못되면 ValueError)
+
+    분반은 하나(1) 또는 우선순위 순 목록([3, 1, 2]) 으로 쓸 수 있으며, 목록은 튜플로 바꾼다.
+    """
+    if not isinstance(raw, dict) or not isinstance(raw.get("subject_data"), dict):
+        raise ValueError('"subject_data" 객체가 없습니다.')
+    unknown = set(raw) - {"subject_data", "subject_priority"}
+    if unknown:
+        raise ValueError(f"알 수 없는 항목: {', '.join(sorted(unknown))}")
+
+    data = {}
+    for course, div in raw["subject_data"].items():
+        if not COURSE_RE.match(course):
+            raise ValueError(f"학수번호 형식이 잘못되었습니다: {course!r}")
+        if isinstance(div, (list, tuple)):
+            divs = tuple(_division(course, d) for d in div)
+            if not divs or len(set(divs)) != len(divs):
+                raise ValueError(f"{course} 의 분반 목록이 비었거나 중복되었습니다: {div!r}")
+            data[course] = divs if len(divs) > 1 else divs[0]
+        else:
+            data[course] = _division(course, div)
+
+    priority = {}
+    raw_priority = raw.get("subject_priority", {})
+    if not isinstance(raw_priority, dict):
+        raise ValueError('"subject_priority" 는 객체여야 합니다.')
+    for course, value in raw_priority.items():
+        if course not in data:
+            raise ValueError(f"subject_data 에 없는 과목의 우선순위: {course!r}")
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise ValueError(f"{course} 의 우선순위가 숫자가 아닙니다: {value!r}")
+        priority[course] = value
+    return data, priority
+
+
+class CourseList:
+    """과목 목록 파일을 감시하다가 바뀌면 실행 중인 목록에 반영
+
+    data 와 priority 는 같은 dict 를 계속 수정하므로 요청 루프가 참조를 그대로 들고 있어도 된다.
+    잘못된 파일은 거부하고 마지막으로 읽은 정상 목록을 유지한다.
+    """
+
+    def __init__(self, path=DEFAULT_PATH, fallback=None, on_change=None, check_interval=CHECK_INTERVAL):
+        self.path = path
+        self.on_change = on_change
+        self.check_interval = check_interval
+        self.data = {}
+        self.priority = {}
+        self.reloads = 0
+        self.rejected = 0
+        self._loaded = {}         # 마지막으로 적용한 파일 내용 (학수번호: 분반)
+        self._finished = {}       # 실행 중 성공/제외되어 목록에서 빠진 과목
+        self._signature = None
+        self._next_check = 0.0
+        self.error = None         # 마지막으로 거부한 파일의 오류
+        # 파일이 아직 없으면 subjects.py 목록으로 시작하고, 나중에 파일이 생기면 그때 반영
+        if fallback is not None and self._stat() is None:
+            self._use_fallback(fallback)
+        self.check(force=True)
+        # 처음 읽은 파일이 잘못되었으면 빈 목록을 "모두 성공" 으로 착각하지 않도록
+        # subjects.py 목록으로 시작하거나, 대신할 목록이 없으면 중단
+        if self.rejected:
+            if fallback is None:
+                raise ValueError(f"과목 목록 파일이 잘못되었습니다 ({self.path}): {self.error}")
+            print("subjects.py 의 과목 목록으로 시작합니다.")
+            self._use_fallback(fallback)
+
+    def _use_fallback(self, fallback):
+        data, priority = validate({"subject_data": fallback[0], "subject_priority": fallback[1]})
+        self.data.update(data)
+        self.priority.update(priority)
+        self._loaded = dict(data)
+
+    def _stat(self):
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def check(self, force=False):
+        """파일이 바뀌었으면 다시 읽어 반영하고, 목록이 바뀌었으면 True"""
+        now = time.monotonic()
+        if not force and now < self._next_check:
+            return False
+        self._next_check = now + self.check_interval
+        signature = self._stat()
+        if signature is None or signature == self._signature:
+            return False
+        self._signature = signature
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data, priority = validate(json.load(f))
+        except (OSError, ValueError) as e:
+            self.rejected += 1
+            self.error = e
+            log_event('courses_rejected', path=self.path, error=str(e))
+            print("과목 목록 파일이 잘못되어 이전 목록을 유지합니다:", e)
+            return False
+        return self._apply(data, priority)
+
+    def _apply(self, data, priority):
+        # 실행 중 목록에서 빠진 과목은 끝난 것으로 기억 (파일에서 분반을 바꾸면 다시 신청)
+        for course, div in self._loaded.items():
+            if course not in self.data:
+                self._finished[course] = div
+        self._loaded = dict(data)
+        wanted = {course: div for course, div in data.items() if self._finished.get(course) != div}
+
+        added = [course for course in wanted if course not in self.data]
+        removed = [course for course in self.data if course not in wanted]
+        changed = [course for course in wanted if course in self.data and self.data[course] != wanted[course]]
+        priority_changed = priority != self.priority
+
+        for course in removed:
+            del self.data[course]
+        self.data.update(wanted)
+        self.priority.clear()
+        self.priority.update(priority)
+
+        if not (added or removed or changed or priority_changed):
+            return False
+        self.reloads += 1
+        log_event('courses_reloaded', added=added, removed=removed, changed=changed,
+                  courses=dict(self.data))
+        print(f"과목 목록 갱신 - 추가: {added or '-'}, 제거: {removed or '-'}, 분반 변경: {changed or '-'}")
+        if self.on_change is not None:
+            self.on_change(self)
+        return True
@@ -6,3 +6,7 @@ NTFY_TOPIC = "SM-Sugang"  # ntfy 앱에서 해당 토픽을 구독
 # 수강신청 서버 세션 토큰
 SGJSESSIONID = ""
 WMONID = ""
+
+# SSO 로그인 정보 (입력하면 세션 토큰을 자동으로 받고, 만료 시 다시 로그인)
+SMU_ID = ""
+SMU_PW = ""
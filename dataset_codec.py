@@ -0,0 +1,98 @@
+# dataset_codec.py
+"""
+수강신청 서버의 데이터셋 폼 형식 인코더/디코더
+
+요청 본문은 application/x-www-form-urlencoded 이며 데이터셋마다 @dN# 접두어를 붙인다.
+    @dN#열이름=값     데이터 (ds 는 행 순서대로 같은 열 이름이 반복됨)
+    @d#=@dN#          본문에 들어 있는 데이터셋 목록 (데이터셋마다 한 번)
+    @dN#=이름         데이터셋 이름 (dmParamTlsnAplyDirect 등)
+    @dN#tp=dm|ds      dm: 한 행짜리 데이터맵, ds: 여러 행 데이터셋
+데이터셋이 하나인 dm 요청은 기존에 직접 만들던 본문과 바이트 단위로 같다.
+"""
+
+import re
+import urllib.parse
+from dataclasses import dataclass, field
+
+KEY_RE = re.compile(r'^(@d\d+#)(.*)$')
+
+
+@dataclass
+class Dataset:
+    name: str
+    rows: list = field(default_factory=list)   # 열 이름: 값 dict 목록 (dm 은 한 행)
+    kind: str = 'dm'
+
+    @property
+    def row(self):
+        """dm 의 한 행 (행이 없으면 빈 dict)"""
+        return self.rows[0] if self.rows else {}
+
+
+def encode_pairs(datasets, fields=None):
+    """데이터셋 목록을 (키, 값) 목록으로 (fields 는 데이터셋 밖의 일반 폼 항목)"""
+    pairs = [(key, str(value)) for key, value in (fields or {}).items()]
+    for index, dataset in enumerate(datasets, 1):
+        if dataset.kind not in ('dm', 'ds'):
+            raise ValueError(f'알 수 없는 데이터셋 종류: {dataset.kind!r}')
+        if dataset.kind == 'dm' and len(dataset.rows) > 1:
+            raise ValueError(f'dm 데이터셋은 한 행만 가질 수 있습니다: {dataset.name}')
+        prefix = f'@d{index}#'
+        columns = list(dict.fromkeys(column for row in dataset.rows for column in row))
+        if 'tp' in columns or '' in columns:
+            raise ValueError(f'쓸 수 없는 열 이름: {dataset.name}')
+        # ds 는 모든 행이 같은 열을 갖도록 빈 값을 채움 (행 순서대로 열이 반복됨)
+        for row in dataset.rows:
+            pairs.extend((prefix + column, str(row.get(column, ''))) for column in columns)
+    for index, dataset in enumerate(datasets, 1):
+        prefix = f'@d{index}#'
+        pairs.extend([('@d#', prefix), (prefix, dataset.name), (prefix + 'tp', dataset.kind)])
+    return pairs
+
+
+def encode(datasets, fields=None):
+    """데이터셋 목록을 요청 본문 바이트열로"""
+    return urllib.parse.urlencode(encode_pairs(datasets, fields)).encode('utf-8')
+
+
+def decode(body):
+    """요청 본문을 ({이름: Dataset}, {일반 폼 항목}) 으로 (형식이 잘못되면 ValueError)"""
+    if isinstance(body, bytes):
+        body = body.decode('utf-8')
+    pairs = urllib.parse.parse_qsl(body, keep_blank_values=True)
+    prefixes = [value for key, value in pairs if key == '@d#']
+    meta = {prefix: {} for prefix in prefixes}
+    columns = {prefix: {} for prefix in prefixes}
+    fields = {}
+    for key, value in pairs:
+        if key == '@d#':
+            continue
+        match = KEY_RE.match(key)
+        if match is None or match.group(1) not in meta:
+            fields[key] = value
+            continue
+        prefix, column = match.groups()
+        if column in ('', 'tp'):
+            meta[prefix][column] = value
+        else:
+            columns[prefix].setdefault(column, []).append(value)
+
+    datasets = {}
+    for prefix in prefixes:
+        name, kind = meta[prefix].get(''), meta[prefix].get('tp', 'dm')
+        if not name:
+            raise ValueError(f'데이터셋 이름이 없습니다: {prefix}')
+        if kind not in ('dm', 'ds'):
+            raise ValueError(f'알 수 없는 데이터셋 종류: {kind!r}')
+        values = columns[prefix]
+        counts = {len(v) for v in values.values()}
+        if len(counts) > 1:
+            raise ValueError(f'{name} 의 열마다 행 수가 다릅니다.')
+        count = counts.pop() if counts else 0
+        if kind == 'dm':
+            # dm 은 같은 키가 여러 번 오면 마지막 값을 씀
+            rows = [{column: v[-1] for column, v in values.items()}] if values else []
+        else:
+            rows = [{column: v[i] for column, v in values.items()} for i in range(count)]
+        datasets[name] = Dataset(name, rows, kind)
+    return datasets, fields
@@ -0,0 +1,109 @@
+# dns_cache.py
+"""
+호스트 주소 조회 결과를 TTL 동안 재사용하고 파일에 저장하는 캐시
+
+재시작한 프로세스도 첫 연결부터 DNS 조회 없이 바로 접속할 수 있다.
+getaddrinfo 는 레코드의 실제 TTL 을 알려주지 않으므로 고정 TTL 을 쓴다.
+조회가 실패하면 (DNS 장애) 만료된 주소라도 stale_grace 초까지는 그대로 쓴다.
+"""
+
+import json
+import os
+import socket
+import threading
+import time
+import metrics
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".sugang_dns.json")
+DEFAULT_TTL = 300.0
+STALE_GRACE = 3600.0
+
+metrics.REGISTRY.describe('sugang_dns_lookups_total', '주소 조회 출처별 수 (cache, network, stale)')
+
+
+def _dump(addresses):
+    return [[int(family), int(type_), proto, canonname, list(address)]
+            for family, type_, proto, canonname, address in addresses]
+
+
+def _load(rows):
+    return [(socket.AddressFamily(family), socket.SocketKind(type_), proto, canonname, tuple(address))
+            for family, type_, proto, canonname, address in rows]
+
+
+class DnsCache:
+    """(호스트, 포트) 별 getaddrinfo 결과 캐시"""
+
+    def __init__(self, path=DEFAULT_PATH, ttl=DEFAULT_TTL, stale_grace=STALE_GRACE,
+                 resolver=socket.getaddrinfo, clock=time.time):
+        self.path = path
+        self.ttl = ttl
+        self.stale_grace = stale_grace
+        self.resolver = resolver
+        self.clock = clock     # 재시작 후에도 이어지도록 벽시계 기준
+        self.entries = {}      # 'host:port' -> (만료 시각, 주소 목록)
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self._lock = threading.Lock()
+        self.load()
+
+    def load(self):
+        """저장된 주소를 불러옴 (파일이 없거나 깨졌으면 빈 캐시로 시작)"""
+        if not self.path:
+            return 0
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                data = json.load(f)
+            entries = {key: (float(entry['expires']), _load(entry['addresses'])) for key, entry in data.items()}
+        except (OSError, ValueError, KeyError, TypeError):
+            return 0
+        with self._lock:
+            self.entries.update(entries)
+        return len(entries)
+
+    def save(self):
+        if not self.path:
+            return
+        with self._lock:
+            data = {key: {'expires': expires, 'addresses': _dump(addresses)}
+                    for key, (expires, addresses) in self.entries.items()}
+        # 임시 파일에 쓴 뒤 교체해서, 쓰는 도중 종료돼도 캐시가 깨지지 않게 함
+        tmp_path = f'{self.path}.tmp'
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print('DNS 캐시 저장 실패:', e)
+
+    def resolve(self, host, port):
+        """socket.getaddrinfo(host, port, 0, SOCK_STREAM) 와 같은 형식의 주소 목록"""
+        key = f'{host}:{port}'
+        now = self.clock()
+        entry = self.entries.get(key)
+        if entry is not None and entry[0] > now:
+            self.hits += 1
+            metrics.inc('sugang_dns_lookups_total', source='cache')
+            return entry[1]
+        try:
+            addresses = self.resolver(host, port, 0, socket.SOCK_STREAM)
+        except OSError:
+            if entry is not None and entry[0] + self.stale_grace > now:
+                self.stale += 1
+                metrics.inc('sugang_dns_lookups_total', source='stale')
+                return entry[1]
+            raise
+        self.misses += 1
+        metrics.inc('sugang_dns_lookups_total', source='network')
+        with self._lock:
+            self.entries[key] = (now + self.ttl, addresses)
+        self.save()
+        return addresses
+
+    def forget(self, host, port):
+        """캐시한 주소로 연결하지 못했을 때 다음 연결은 새로 조회하도록 지움"""
+        with self._lock:
+            removed = self.entries.pop(f'{host}:{port}', None)
+        if removed is not None:
+            self.save()
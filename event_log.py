@@ -0,0 +1,107 @@
+# event_log.py
+
+import atexit
+import json
+import os
+import queue
+import threading
+import time
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "logs", "sugang_events.jsonl")
+MAX_BYTES = 20 * 1024 * 1024   # 이 크기를 넘으면 파일을 돌려씀
+BACKUPS = 5                    # 보관할 이전 파일 수 (.1 이 가장 최근)
+FLUSH_INTERVAL = 0.5           # 버퍼를 파일로 내보내는 최대 간격(초)
+
+
+class EventLog:
+    """JSONL 이벤트를 백그라운드 스레드에서 모아 쓰는 추가 전용 로그"""
+
+    def __init__(self, path=DEFAULT_PATH, max_bytes=MAX_BYTES, backups=BACKUPS):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.written = 0
+        self._queue = queue.SimpleQueue()
+        self._closed = threading.Event()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(path, "ab")
+        self._size = self._file.tell()
+        self._thread = threading.Thread(target=self._run, name="event-log", daemon=True)
+        self._thread.start()
+
+    def write(self, kind, fields):
+        # 호출한 쪽은 큐에 넣기만 하고 바로 돌아감 (직렬화와 파일 쓰기는 작성 스레드에서)
+        self._queue.put((time.time(), kind, fields))
+
+    def _rotate(self):
+        self._file.close()
+        for index in range(self.backups - 1, 0, -1):
+            older = f"{self.path}.{index}"
+            if os.path.exists(older):
+                os.replace(older, f"{self.path}.{index + 1}")
+        if self.backups:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+        self._file = open(self.path, "ab")
+        self._size = 0
+
+    def _drain(self, first):
+        lines = [first]
+        while True:
+            try:
+                lines.append(self._queue.get_nowait())
+            except queue.Empty:
+                return lines
+
+    def _run(self):
+        while not (self._closed.is_set() and self._queue.empty()):
+            try:
+                first = self._queue.get(timeout=FLUSH_INTERVAL)
+            except queue.Empty:
+                continue
+            if first is None:
+                continue
+            for item in self._drain(first):
+                if item is None:
+                    continue
+                ts, kind, fields = item
+                line = (json.dumps({"ts": round(ts, 6), "kind": kind, **fields},
+                                   ensure_ascii=False, default=str) + "\n").encode("utf-8")
+                if self._size + len(line) > self.max_bytes and self._size:
+                    self._rotate()
+                self._file.write(line)
+                self._size += len(line)
+                self.written += 1
+            self._file.flush()
+
+    def close(self, timeout=5.0):
+        self._closed.set()
+        self._queue.put(None)
+        self._thread.join(timeout)
+        self._file.close()
+
+
+_log = None
+
+
+def configure(path=DEFAULT_PATH, max_bytes=MAX_BYTES, backups=BACKUPS):
+    """이벤트 로그를 켬 (켜기 전에는 log_event 가 아무것도 하지 않음)"""
+    global _log
+    if _log is not None:
+        _log.close()
+    _log = EventLog(path, max_bytes, backups)
+    return _log
+
+
+def log_event(kind, **fields):
+    if _log is not None:
+        _log.write(kind, fields)
+
+
+@atexit.register
+def _close():
+    if _log is not None:
+        _log.close()
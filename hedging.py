@@ -0,0 +1,143 @@
+# hedging.py
+
+import collections
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from connection_pool import CancelToken
+import metrics
+from event_log import log_event
+
+metrics.REGISTRY.describe('sugang_hedges_total', '백업 요청을 보낸 수 (먼저 응답한 쪽별)')
+metrics.REGISTRY.describe('sugang_hedge_delay_seconds', '현재 백업 요청을 보내기까지 기다리는 시간')
+
+
+class Hedger:
+    """느린 요청에 백업 요청을 하나 더 보내고 먼저 온 응답을 씀
+
+    최근 응답 시간의 percentile 분위수(최소 min_delay)가 지나도 응답이 없으면 다른 연결로
+    같은 요청을 한 번 더 보내고, 먼저 끝난 쪽이 나머지 요청의 소켓을 끊는다.
+    백업 요청 수는 전체 요청의 max_ratio 를 넘지 않는다.
+    """
+
+    def __init__(self, percentile=95, max_ratio=0.05, min_delay=0.02, initial_delay=0.5,
+                 window=200, min_samples=20, workers=8):
+        self.percentile = percentile
+        self.max_ratio = max_ratio
+        self.min_delay = min_delay
+        self.initial_delay = initial_delay
+        self.min_samples = min_samples
+        self.requests = 0
+        self.hedges = 0
+        self.backup_wins = 0
+        self._latencies = collections.deque(maxlen=window)
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='hedge')
+
+    def delay(self):
+        """백업 요청을 보내기 전에 기다릴 시간(초)"""
+        with self._lock:
+            samples = sorted(self._latencies)
+        if len(samples) < self.min_samples:
+            return self.initial_delay
+        index = min(len(samples) - 1, int(len(samples) * self.percentile / 100))
+        return max(self.min_delay, samples[index])
+
+    def observe(self, latency):
+        with self._lock:
+            self._latencies.append(latency)
+
+    def _take_budget(self):
+        # 백업 요청 비율 상한을 엄격하게 지킴 (지금 보내도 max_ratio 이하일 때만)
+        with self._lock:
+            if self.hedges + 1 > self.max_ratio * self.requests:
+                return False
+            self.hedges += 1
+            return True
+
+    def run(self, send):
+        """send(cancel_token) 을 실행하고, 늦으면 백업 요청을 보내 먼저 온 결과를 돌려줌
+
+        돌려주는 값은 (응답, 승자) 이며 승자는 백업을 보내지 않았으면 None, 아니면 'primary' 또는 'backup'.
+        """
+        with self._lock:
+            self.requests += 1
+        delay = self.delay()
+        metrics.set_gauge('sugang_hedge_delay_seconds', delay)
+        call = _HedgedCall(self, send)
+        backup = self._executor.submit(call.backup, delay)
+
+        start = time.perf_counter()
+        try:
+            response = send(call.tokens['primary'])
+        except Exception as e:
+            call.primary_done.set()
+            winner = call.finish('primary', error=e)
+        else:
+            self.observe(time.perf_counter() - start)
+            call.primary_done.set()
+            winner = call.finish('primary', response=response)
+
+        if winner is None:
+            # 주 요청이 실패했거나 백업에 밀려 끊긴 경우: 백업 결과를 기다림
+            backup.result()
+            winner = call.winner
+        response, error = call.results[winner] if winner else (None, call.results['primary'][1])
+        if error is not None:
+            raise error
+        hedged = call.launched
+        if hedged:
+            metrics.inc('sugang_hedges_total', winner=winner)
+            log_event('hedge', winner=winner, delay=round(delay, 6))
+            if winner == 'backup':
+                with self._lock:
+                    self.backup_wins += 1
+        return response, winner if hedged else None
+
+    def stats(self):
+        return {'requests': self.requests, 'hedges': self.hedges, 'backup_wins': self.backup_wins,
+                'hedge_ratio': self.hedges / self.requests if self.requests else 0.0,
+                'delay': self.delay()}
+
+
+class _HedgedCall:
+    """주 요청과 백업 요청 중 먼저 성공한 쪽을 정함"""
+
+    def __init__(self, hedger, send):
+        self.hedger = hedger
+        self.send = send
+        self.tokens = {'primary': CancelToken(), 'backup': CancelToken()}
+        self.primary_done = threading.Event()
+        self.launched = False
+        self.winner = None
+        self.results = {}
+        self._lock = threading.Lock()
+
+    def finish(self, name, response=None, error=None):
+        """결과를 기록하고, 처음 성공한 쪽이면 상대 요청을 끊고 승자 이름을 돌려줌"""
+        other = 'backup' if name == 'primary' else 'primary'
+        with self._lock:
+            self.results[name] = (response, error)
+            if error is None and self.winner is None:
+                self.winner = name
+                won = True
+            else:
+                won = False
+            winner = self.winner
+        if won:
+            self.tokens[other].cancel()
+        return winner
+
+    def backup(self, delay):
+        # delay 안에 주 요청이 끝나거나 백업 예산이 없으면 보내지 않음
+        if self.primary_done.wait(delay) or not self.hedger._take_budget():
+            return
+        self.launched = True
+        start = time.perf_counter()
+        try:
+            response = self.send(self.tokens['backup'])
+        except Exception as e:
+            self.finish('backup', error=e)
+            return
+        self.hedger.observe(time.perf_counter() - start)
+        self.finish('backup', response=response)
@@ -0,0 +1,240 @@
+# log_analyzer.py
+"""
+이벤트 로그 분석기
+
+event_log 가 남긴 JSONL 파일을 한 줄씩 읽으며 (파일 전체를 메모리에 올리지 않음)
+과목별 응답 시간 분위수, 성공 시각, 오류가 몰린 구간을 보여줍니다.
+
+python log_analyzer.py [로그 경로 ...] [--burst-threshold 5] [--json]
+경로를 주지 않으면 logs/sugang_events.jsonl 과 돌려쓴 이전 파일(.1, .2 ...)을 오래된 순서로 읽습니다.
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+
+from event_log import DEFAULT_PATH
+from metrics import Histogram, _finite
+
+# 분위수 근사에 쓰는 구간 (초) - 값을 모두 저장하지 않고 구간별 개수만 셈
+LATENCY_BUCKETS = tuple(round(0.001 * 1.25 ** i, 6) for i in range(50))
+
+ERROR_OUTCOMES = {'server_error'}
+
+
+def log_files(paths):
+    """경로마다 돌려쓴 파일까지 포함해 오래된 것부터 나열"""
+    files = []
+    for path in paths:
+        rotated = glob.glob(f'{glob.escape(path)}.[0-9]*')
+        rotated = [p for p in rotated if p.rsplit('.', 1)[1].isdigit()]
+        rotated.sort(key=lambda p: int(p.rsplit('.', 1)[1]), reverse=True)
+        files.extend(rotated)
+        if os.path.exists(path):
+            files.append(path)
+    return files
+
+
+def read_events(files):
+    """여러 파일의 이벤트를 차례로 하나씩 돌려줌 (깨진 줄은 건너뜀)"""
+    for path in files:
+        with open(path, 'rb') as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue
+
+
+class CourseStats:
+    def __init__(self):
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.attempts = 0
+        self.errors = 0
+        self.outcomes = {}
+        self.first = None
+        self.granted_at = None
+
+    def to_dict(self, finite=False):
+        """요약을 dict 로 (finite 이면 마지막 구간을 넘은 분위수 inf 를 JSON 에 쓸 수 있게 None 으로)"""
+        quantiles = {f'p{int(q * 100)}': self.latency.quantile(q) for q in (0.5, 0.9, 0.99)}
+        if finite:
+            quantiles = {key: _finite(value) for key, value in quantiles.items()}
+        return {
+            'attempts': self.attempts,
+            'errors': self.errors,
+            'outcomes': self.outcomes,
+            'mean': self.latency.sum / self.latency.count if self.latency.count else None,
+            **quantiles,
+            'first_attempt': self.first,
+            'granted_at': self.granted_at,
+        }
+
+
+class Analyzer:
+    """이벤트를 하나씩 받아 요약을 갱신 (메모리는 과목 수와 오류 구간 수에만 비례)"""
+
+    def __init__(self, burst_threshold=5):
+        self.burst_threshold = burst_threshold
+        self.courses = {}
+        self.kinds = {}
+        self.timeline = []      # 성공, 세션 갱신 등 드문 이벤트만 보관
+        self.bursts = []
+        self.start = None
+        self.end = None
+        self._second = None
+        self._second_errors = 0
+        self._burst = None
+
+    def _course(self, event):
+        key = f"{event.get('course')}-{event.get('div')}"
+        stats = self.courses.get(key)
+        if stats is None:
+            stats = self.courses[key] = CourseStats()
+        return stats
+
+    def _count_error(self, ts):
+        second = int(ts)
+        if second != self._second:
+            self._close_second()
+            self._second = second
+            self._second_errors = 0
+        self._second_errors += 1
+
+    def _close_second(self):
+        # 오류가 기준 이상인 초가 이어지면 하나의 오류 구간으로 묶음
+        if self._second is None:
+            return
+        if self._second_errors >= self.burst_threshold:
+            if self._burst and self._burst['end'] == self._second - 1:
+                self._burst['end'] = self._second
+                self._burst['errors'] += self._second_errors
+                self._burst['peak'] = max(self._burst['peak'], self._second_errors)
+            else:
+                self._burst = {'start': self._second, 'end': self._second,
+                               'errors': self._second_errors, 'peak': self._second_errors}
+                self.bursts.append(self._burst)
+        elif self._burst and self._second > self._burst['end'] + 1:
+            self._burst = None
+
+    def add(self, event):
+        ts = event.get('ts', 0)
+        kind = event.get('kind')
+        self.kinds[kind] = self.kinds.get(kind, 0) + 1
+        if self.start is None or ts < self.start:
+            self.start = ts
+        if self.end is None or ts > self.end:
+            self.end = ts
+
+        if kind == 'attempt':
+            stats = self._course(event)
+            stats.attempts += 1
+            if stats.first is None:
+                stats.first = ts
+            outcome = event.get('outcome')
+            stats.outcomes[outcome] = stats.outcomes.get(outcome, 0) + 1
+            if event.get('elapsed') is not None:
+                stats.latency.observe(event['elapsed'])
+            if outcome in ERROR_OUTCOMES:
+                stats.errors += 1
+                self._count_error(ts)
+            if event.get('granted') and stats.granted_at is None:
+                stats.granted_at = ts
+                self.timeline.append({'ts': ts, 'event': 'granted', 'course': event.get('course'),
+                                      'div': event.get('div'), 'attempt': event.get('attempt')})
+        elif kind == 'attempt_error':
+            stats = self._course(event)
+            stats.attempts += 1
+            stats.errors += 1
+            if stats.first is None:
+                stats.first = ts
+            stats.outcomes['error'] = stats.outcomes.get('error', 0) + 1
+            self._count_error(ts)
+        elif kind in ('session_refresh', 'launch', 'clock_sync'):
+            self.timeline.append({'ts': ts, 'event': kind,
+                                  **{k: v for k, v in event.items() if k not in ('ts', 'kind')}})
+
+    def finish(self):
+        self._close_second()
+        self._second = None
+        return self
+
+    def report(self, finite=False):
+        return {
+            'start': self.start,
+            'end': self.end,
+            'events': self.kinds,
+            'courses': {key: stats.to_dict(finite) for key, stats in sorted(self.courses.items())},
+            'timeline': self.timeline,
+            'error_bursts': self.bursts,
+        }
+
+
+def format_time(ts):
+    if ts is None:
+        return '-'
+    return time.strftime('%H:%M:%S', time.localtime(ts)) + f'.{int(ts % 1 * 1000):03d}'
+
+
+def format_ms(value):
+    if value is None:
+        return '-'
+    if value == float('inf'):
+        return 'inf'
+    return f'{value * 1000:.1f}'
+
+
+def print_report(report):
+    print(f"기간: {format_time(report['start'])} ~ {format_time(report['end'])}")
+    print("이벤트:", ", ".join(f"{kind} {count}" for kind, count in report['events'].items()))
+
+    print(f"\n{'과목':<14}{'시도':>6}{'오류':>6}{'평균ms':>9}{'p50':>9}{'p90':>9}{'p99':>9}  성공 시각")
+    for key, stats in report['courses'].items():
+        print(f"{key:<14}{stats['attempts']:>6}{stats['errors']:>6}{format_ms(stats['mean']):>9}"
+              f"{format_ms(stats['p50']):>9}{format_ms(stats['p90']):>9}{format_ms(stats['p99']):>9}"
+              f"  {format_time(stats['granted_at'])}")
+
+    if report['timeline']:
+        print("\n타임라인")
+        for item in report['timeline']:
+            details = ", ".join(f"{k}={v}" for k, v in item.items() if k not in ('ts', 'event'))
+            print(f"  {format_time(item['ts'])}  {item['event']:<16}{details}")
+
+    if report['error_bursts']:
+        print("\n오류 집중 구간")
+        for burst in report['error_bursts']:
+            print(f"  {format_time(burst['start'])} ~ {format_time(burst['end'] + 1)}  "
+                  f"오류 {burst['errors']}건 (초당 최대 {burst['peak']}건)")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="수강신청 이벤트 로그 분석")
+    parser.add_argument("paths", nargs="*", default=[DEFAULT_PATH], help="이벤트 로그 경로")
+    parser.add_argument("--burst-threshold", type=int, default=5, help="오류 구간으로 볼 초당 오류 수")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON 으로 출력")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    files = log_files(args.paths)
+    if not files:
+        print("로그 파일이 없습니다:", ", ".join(args.paths))
+        return 1
+    analyzer = Analyzer(args.burst_threshold)
+    for event in read_events(files):
+        analyzer.add(event)
+    report = analyzer.finish().report(finite=args.json)
+    if args.json:
+        json.dump(report, sys.stdout, ensure_ascii=False, indent=2)
+        print()
+    else:
+        print_report(report)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,47 +1,419 @@
 # main.py
 
+import os
 import time
-import random
-from sugang_request import send_sugang_request
+import argparse
+from sugang_request import (send_sugang_request, send_sugang_batch, prewarm, set_session, prebuild_requests, set_session_pool,
+                            set_hedging, set_request_timeout, probe_server)
 from notifier import send_mobile_alert
-from subjects import subject_data
+import subjects
+from course_list import CourseList, DEFAULT_PATH as COURSES_PATH, divisions, expand
+from scheduler import make_scheduler
+import metrics
+import event_log
+from response_parser import Outcome
+from session_pool import SessionPool
+from retry_policy import RetryPolicy, CircuitBreaker, make_retry_policy as _make_retry_policy
+from state_store import StateStore, DEFAULT_PATH as STATE_PATH
+from dns_cache import DnsCache, DEFAULT_PATH as DNS_CACHE_PATH, DEFAULT_TTL as DNS_TTL
+from connection_pool import set_dns_cache
+from credentials import SMU_ID, SMU_PW
 
-while True:
+# 재시작해도 남는 상태 (성공한 과목, 마지막 응답 종류, 세션 토큰) - --state 로 경로 지정
+STATE = None
+
+
+def update_session(sgjsessionid, wmonid):
+    set_session(sgjsessionid, wmonid)
+    if STATE is not None:
+        STATE.save_session(sgjsessionid, wmonid)
+
+
+# 실패 종류별 재시도 대기와, 서버가 내려간 동안 전송을 멈추는 서킷 브레이커 (run 에서 옵션대로 다시 만듦)
+RETRY = RetryPolicy(breaker=CircuitBreaker(probe=probe_server))
+
+
+def make_retry_policy(threshold, cooldown):
+    """threshold 번 연속 장애성 실패면 전송을 멈추고 cooldown 초마다 /index.do 로 복구 확인 (0 이면 끄기)"""
+    global RETRY
+    RETRY = _make_retry_policy(threshold, cooldown, probe=probe_server)
+    return RETRY
+
+
+# SSO 계정이 설정되어 있으면 토큰을 자동으로 받고 갱신 (start_sso 에서 생성)
+SESSION = None
+SESSIONS = None
+
+
+def start_sso():
+    """SSO 로그인 세션을 준비 (sso_login 은 계정이 설정된 경우에만 불러옴)"""
+    global SESSION
+    if not SMU_ID:
+        return None
+    from sso_login import SessionManager
+    SESSION = SessionManager(SMU_ID, SMU_PW, on_update=update_session)
     try:
+        SESSION.start()
+        print("SSO 로그인 세션 준비 완료")
+    except Exception as e:
+        print("SSO 로그인 실패, credentials.py 의 토큰을 사용합니다:", e)
+    return SESSION
+
+
+def start_session_pool(size):
+    """SSO 로그인 세션을 size 개까지 모아 돌려 씀 (첫 세션은 SESSION 의 토큰, 나머지는 백그라운드 로그인)"""
+    global SESSIONS
+    from sso_login import login
+    SESSIONS = SessionPool(login=lambda: login(SMU_ID, SMU_PW),
+                           on_refresh=lambda tokens: update_session(tokens["SGJSESSIONID"], tokens["WMONID"]))
+    if SESSION.tokens:
+        SESSIONS.add(SESSION.tokens["SGJSESSIONID"], SESSION.tokens["WMONID"])
+    SESSIONS.fill_in_background(size)
+    set_session_pool(SESSIONS)
+    return SESSIONS
+
+
+def start_hedging(percentile, max_ratio, min_delay):
+    """응답이 늦은 요청에 백업 요청을 하나 더 보냄 (백업 비율은 max_ratio 이하)"""
+    from hedging import Hedger
+    hedger = Hedger(percentile=percentile, max_ratio=max_ratio, min_delay=min_delay)
+    set_hedging(hedger)
+    return hedger
+
+
+# 과목 목록 (subjects.json 이 있으면 그 내용, 없으면 subjects.py) - 실행 중 파일을 고치면 바로 반영
+COURSES = None
+subject_data = {}
+subject_priority = {}
+
+
+def load_courses(path):
+    global COURSES, subject_data, subject_priority
+    COURSES = CourseList(path, fallback=(subjects.subject_data, subjects.subject_priority),
+                         on_change=lambda courses: prebuild_requests(expand(courses.data)))
+    subject_data = COURSES.data
+    subject_priority = COURSES.priority
+    return COURSES
+
+
+def handle_response(course, div, result):
+    """파싱된 응답에 맞는 알림을 보내고 수강신청 성공 여부를 돌려줌"""
+    if STATE is not None:
+        STATE.record(course, div, result)
+    # 세션 만료 오류
+    if result.outcome == Outcome.SESSION_EXPIRED:
+        send_mobile_alert("경고: 수강신청 서버 세션 만료", kind="session_expired")
+        # 요청 루프는 그대로 두고 백그라운드에서 다시 로그인 (세션 풀은 만료된 세션을 스스로 갱신)
+        if SESSION is not None and SESSIONS is None:
+            SESSION.refresh_in_background()
+    # 제한 인원 초과
+    elif result.outcome == Outcome.OVER_CAPACITY:
+        send_mobile_alert("경고: 수강신청 제한 인원 초과", kind="over_capacity")
+    # 수강신청 기간이 아님
+    elif result.outcome == Outcome.OUT_OF_PERIOD:
+        send_mobile_alert("경고: 수강신청 기간 초과", kind="out_of_period")
+    # 요청 성공 (이미 신청된 과목도 확보한 것으로 처리) - 분반이 여럿이면 div 가 성공한 분반
+    elif result.granted:
+        candidates = divisions(subject_data.get(course, div))
+        event_log.log_event('granted', course=course, div=div, candidates=list(candidates))
+        others = f", 후보 분반 {list(candidates)} 중" if len(candidates) > 1 else ""
+        send_mobile_alert(f"수강신청 성공!! (학수번호: {course}{others}, 분반: {div})", urgent=True)
+        return True
+    # 다시 보내도 소용없는 거절 (시간 중복, 학점 초과 등)
+    elif not result.retry:
+        send_mobile_alert(f"경고: 수강신청 불가 (학수번호: {course}, 분반: {div}) {result.message}",
+                          kind=f"rejected:{course}")
+    return False
+
+
+def restore_state(path, reset=False):
+    """이전 실행에서 성공한 과목을 목록에서 빼고, 더 최신인 세션 토큰을 다시 씀"""
+    global STATE
+    import credentials
+    STATE = StateStore(path)
+    if reset:
+        STATE.reset()
+    for course, div in STATE.granted().items():
+        if course in subject_data and div in divisions(subject_data[course]):
+            print(f"이전 실행에서 이미 신청한 과목 {course} (분반 {div}) 은 건너뜁니다.")
+            subject_data.pop(course, None)
+    # credentials.py 를 저장 이후에 고쳤으면 그쪽 토큰을 우선함
+    tokens = STATE.load_session()
+    if tokens is None:
+        return STATE
+    from sso_login import SESSION_LIFETIME
+    if (tokens["updated"] + SESSION_LIFETIME > time.time()
+            and tokens["updated"] > os.path.getmtime(credentials.__file__)):
+        set_session(tokens["SGJSESSIONID"], tokens.get("WMONID", ""))
+        print("저장된 세션 토큰을 복원했습니다.")
+    return STATE
+
+
+def ordered_courses():
+    # 우선순위(작을수록 먼저)대로, 지정하지 않은 과목은 작성 순서대로
+    order = {course: index for index, course in enumerate(subject_data)}
+    return sorted(subject_data.items(), key=lambda item: subject_priority.get(item[0], order[item[0]]))
+
+
+# 다시 보내도 소용없는 거절을 받은 분반 {학수번호: (분반 항목, 제외한 분반 집합)} - 분반 항목이 바뀌면 무시
+DROPPED = {}
+
+
+def pending_divisions(course):
+    """아직 신청할 분반 (성공했거나 목록에서 빠진 과목이면 빈 튜플)"""
+    entry = subject_data.get(course)
+    if entry is None:
+        return ()
+    dropped_entry, dropped = DROPPED.get(course, (None, ()))
+    if dropped_entry != entry:
+        dropped = ()
+    return tuple(div for div in divisions(entry) if div not in dropped)
+
+
+def drop_division(course, div):
+    """거절된 분반을 빼고, 남은 분반이 없으면 과목을 목록에서 뺌"""
+    entry = subject_data.get(course)
+    if entry is None:
+        return
+    remaining = [d for d in pending_divisions(course) if d != div]
+    if DROPPED.get(course, (None,))[0] != entry:
+        DROPPED[course] = (entry, set())
+    DROPPED[course][1].add(div)
+    if remaining:
+        print(f"{course} 분반 {div} 은 신청할 수 없어 남은 분반 {remaining} 만 신청합니다.")
+    else:
+        print(f"재시도해도 신청할 수 없어 {course} 제외합니다.")
+        subject_data.pop(course, None)
+
+
+def ordered_requests():
+    # 과목 우선순위대로, 과목 안에서는 분반 우선순위대로 (학수번호, 분반)
+    return [(course, div) for course, _ in ordered_courses() for div in pending_divisions(course)]
+
+
+def request_rounds(batch):
+    """이번 바퀴에 보낼 요청 묶음 목록 (묶지 않으면 요청 하나씩)"""
+    if not batch:
+        return [[item] for item in ordered_requests()]
+    # 한 묶음에는 과목마다 분반 하나만 넣음 (같은 과목의 두 분반이 함께 신청 중이지 않도록)
+    pending = [(course, pending_divisions(course)) for course, _ in ordered_courses()]
+    depth = max((len(divs) for _, divs in pending), default=0)
+    return [[(course, divs[k]) for course, divs in pending if k < len(divs)] for k in range(depth)]
+
+
+def run_sequential(scheduler, batch=False):
+    while True:
         # 모든 과목 수강신청 성공 시 종료
         if not subject_data:
             print("모든 학수번호 수강신청 성공! 종료합니다.")
             break
 
-        # 등록된 모든 과목에 대해 수강신청 요청 전송
-        for course, div in list(subject_data.items()):
-            response_text = send_sugang_request(course, div)
-            print(f"수강신청 요청 전송 - 학수번호: {course}, 분반: {div}")
-            print(response_text)
-
-            # 세션 만료 오류
-            if "-3000" in response_text:
-                send_mobile_alert("경고: 수강신청 서버 세션 만료")
-            # 제한 인원 초과
-            elif "초과" in response_text:
-                send_mobile_alert("경고: 수강신청 제한 인원 초과")
-            # 제한 인원 초과
-            elif "기간" in response_text:
-                send_mobile_alert("경고: 수강신청 기간 초과")
-            # 요청 성공 (응답 문자열에 "true" 포함)
-            elif "true" in response_text:
-                send_mobile_alert(f"수강신청 성공!! (학수번호: {course}, 분반: {div})")
-                print(f"수강신청 성공으로 {course} 제거합니다.")
-                del subject_data[course]
-
-            # 과목 간 랜덤 딜레이 (매크로 탐지 회피)
-            time.sleep(random.randint(1, 5))
-
-        # 다음 시도 전 남은 과목이 있다면 추가 대기
-        if subject_data:
-            random_delay = random.randint(10, 60)
-            print(f"\n다음 시도까지 {random_delay}초 대기\n")
-            time.sleep(random_delay)
+        # 등록된 모든 과목의 모든 후보 분반에 수강신청 요청 전송 (전송 간격은 스케줄러가 결정)
+        for items in request_rounds(batch):
+            # 이번 바퀴에 같은 과목의 다른 분반이 먼저 성공했으면 나머지 분반은 보내지 않음
+            items = [(course, div) for course, div in items if div in pending_divisions(course)]
+            if not items:
+                continue
+            scheduler.wait()
+            if RETRY.open:
+                print("서버가 응답하지 않아 전송을 멈추고 복구를 기다립니다.")
+                RETRY.wait()
+                print("서버 복구 확인, 전송을 다시 시작합니다.")
+            # 요청 사이마다 과목 목록 파일이 바뀌었는지 확인하고, 빠지거나 분반이 바뀐 과목은 건너뜀
+            if (COURSES is not None and COURSES.check()
+                    and any(div not in pending_divisions(course) for course, div in items)):
+                break
+            start = time.monotonic()
+            try:
+                if len(items) == 1:
+                    responses = [send_sugang_request(*items[0])]
+                else:
+                    responses = send_sugang_batch(items)
+            except Exception as e:
+                scheduler.observe(time.monotonic() - start, error=True)
+                # 실패 종류(DNS, 연결 끊김, TLS, 시간 초과 등)마다 다른 간격으로 늘려 가며 기다림
+                failure, delay = RETRY.record(error=e)
+                print(f"요청 중 오류 발생 ({failure.value}, {delay:.2f}초 후 재시도):", e)
+                time.sleep(delay)
+                continue
+            if responses is None:
+                # 서버가 묶음 신청을 받지 않으면 이번 바퀴부터 과목마다 따로 보냄
+                print("서버가 여러 과목 묶음 신청을 받지 않아 과목마다 따로 보냅니다.")
+                batch = False
+                break
+            # 묶음 응답의 행들은 상태 코드를 함께 쓰므로 속도와 재시도 판단은 첫 행으로 함
+            scheduler.observe(time.monotonic() - start, responses[0].result)
+            _, delay = RETRY.record(result=responses[0].result)
+            metrics.set_gauge('sugang_send_rate', scheduler.rate)
+            together = f", 묶음 {len(items)}건" if len(items) > 1 else ""
+            for (course, div), response in zip(items, responses):
+                result = response.result
+                print(f"수강신청 요청 전송 - 학수번호: {course}, 분반: {div} "
+                      f"(연결 재사용: {response.reused}, {response.elapsed * 1000:.1f}ms, "
+                      f"현재 속도: {scheduler.rate:.2f}회/초{together})")
+                print(f"응답: {result.outcome.value} (코드: {result.code}) {result.message}")
+
+                if handle_response(course, div, result):
+                    print(f"수강신청 성공으로 {course} 제거합니다. (분반 {div})")
+                    subject_data.pop(course, None)
+                elif not result.retry:
+                    drop_division(course, div)
+            # 5xx 응답이면 다음 요청 전에 기다림
+            if delay:
+                time.sleep(delay)
+
+
+def run_async(scheduler, concurrency, attempts_per_course, retry_delay):
+    import asyncio
+    from async_engine import run_engine
+
+    watch = COURSES.check if COURSES is not None else None
+    asyncio.run(run_engine(subject_data, handle_response, concurrency, scheduler,
+                           attempts_per_course, retry_delay, subject_priority, watch, retry=RETRY,
+                           pending=pending_divisions, on_reject=drop_division))
+    if not subject_data:
+        print("모든 학수번호 수강신청 성공! 종료합니다.")
+
+
+def launch(launch_at, probes, lead_ms):
+    """서버 시계 기준 개시 시각에 모든 과목의 첫 요청을 동시에 보냄"""
+    import statistics
+    import sugang_request
+    from clock_sync import estimate_offset, parse_server_time, sleep_until, fire_batch
+
+    estimate = estimate_offset(sugang_request.POOL, probes)
+    event_log.log_event('clock_sync', offset=estimate.offset, error=estimate.error,
+                        rtt=estimate.rtt, probes=estimate.probes)
+    print(f"서버 시계 오프셋: {estimate.offset * 1000:+.1f}ms "
+          f"(±{estimate.error * 1000:.1f}ms, RTT {estimate.rtt * 1000:.1f}ms, 측정 {estimate.probes}회)")
+
+    target = parse_server_time(launch_at) - lead_ms / 1000
+    local_target = estimate.local_time(target)
+    if local_target < time.time():
+        print("개시 시각이 이미 지났습니다. 바로 신청을 시작합니다.")
+        return
+
+    # 요청은 미리 조립하고, 유휴 연결이 끊기지 않도록 직전에 연결을 다시 준비
+    # 분반이 여럿인 과목은 두 분반이 함께 신청되지 않도록 첫 분반만 보내고 나머지는 이어지는 루프에서 신청
+    jobs = [(course, pending_divisions(course)[0]) for course, _ in ordered_courses() if pending_divisions(course)]
+    prebuild_requests(jobs)
+    sleep_until(local_target - 3)
+    prewarm(len(jobs))
+    print(f"개시 시각 대기 중... ({len(jobs)}개 과목)")
+
+    results = fire_batch([lambda c=c, d=d: send_sugang_request(c, d) for c, d in jobs], local_target)
+    errors = [estimate.server_time(sent) - target for sent, _ in results]
+    event_log.log_event('launch', target=target, send_errors=errors)
+    print(f"전송 시각 오차 (서버 시각 기준): 평균 {statistics.mean(errors) * 1000:+.2f}ms, "
+          f"최대 {max(abs(e) for e in errors) * 1000:.2f}ms")
+
+    for (course, div), (_, response) in zip(jobs, results):
+        if isinstance(response, Exception):
+            print(f"첫 요청 오류 - 학수번호: {course}, 분반: {div}:", response)
+            continue
+        result = response.result
+        print(f"첫 요청 응답 - 학수번호: {course}, 분반: {div}: {result.outcome.value} {result.message}")
+        if handle_response(course, div, result):
+            print(f"수강신청 성공으로 {course} 제거합니다. (분반 {div})")
+            subject_data.pop(course, None)
+        elif not result.retry:
+            drop_division(course, div)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="수강신청 매크로")
+    parser.add_argument("--async", dest="use_async", action="store_true",
+                        help="모든 과목을 동시에 신청하는 asyncio 엔진 사용")
+    parser.add_argument("--concurrency", type=int, default=4, help="동시에 보낼 최대 요청 수")
+    parser.add_argument("--attempts", type=int, default=1, help="과목마다 동시에 진행할 시도 수")
+    parser.add_argument("--retry-delay", type=float, default=1.0, help="같은 과목 재시도 간격(초)")
+    parser.add_argument("--max-rate", type=float, default=2.0, help="서버에 보낼 초당 요청 수 상한")
+    parser.add_argument("--min-rate", type=float, default=0.1, help="초당 요청 수 하한")
+    parser.add_argument("--initial-rate", type=float, default=0.5, help="시작 초당 요청 수")
+    parser.add_argument("--latency-target", type=float, default=1.0, help="이보다 느린 응답은 혼잡으로 판단(초)")
+    parser.add_argument("--fixed-rate", type=float, default=0.0, help="속도 조절 없이 고정 초당 요청 수 사용")
+    parser.add_argument("--jitter", type=float, default=0.3, help="전송 간격 무작위 비율 (0~1)")
+    parser.add_argument("--launch-at", default=None,
+                        help="서버 시계 기준 개시 시각 (한국 시간, 예: '2026-02-10 10:00:00')")
+    parser.add_argument("--sync-probes", type=int, default=8, help="서버 시계 추정에 쓸 측정 횟수")
+    parser.add_argument("--lead-ms", type=float, default=0.0, help="개시 시각보다 이만큼 먼저 전송(ms)")
+    parser.add_argument("--metrics-port", type=int, default=0, help="Prometheus 지표를 내보낼 포트 (/metrics)")
+    parser.add_argument("--metrics-json", default=None, help="지표 스냅샷을 주기적으로 저장할 JSON 경로")
+    parser.add_argument("--metrics-interval", type=float, default=5.0, help="JSON 스냅샷 저장 간격(초)")
+    parser.add_argument("--courses", default=COURSES_PATH,
+                        help="과목 목록 JSON 경로 (실행 중 수정하면 다음 요청부터 반영)")
+    parser.add_argument("--sessions", type=int, default=2,
+                        help="SSO 로그인으로 유지할 세션 수 (만료되면 즉시 다른 세션으로 전환, 0 이면 사용 안 함)")
+    parser.add_argument("--state", default=STATE_PATH,
+                        help="재시작 시 이어서 진행할 상태 파일 (빈 문자열이면 저장하지 않음)")
+    parser.add_argument("--reset-state", action="store_true", help="저장된 상태를 지우고 처음부터 시작")
+    parser.add_argument("--event-log", default=event_log.DEFAULT_PATH,
+                        help="JSONL 이벤트 로그 경로 (빈 문자열이면 기록하지 않음)")
+    parser.add_argument("--event-log-max-mb", type=float, default=20.0, help="로그 파일을 돌려쓸 크기(MB)")
+    parser.add_argument("--timeout", type=float, default=10.0, help="요청별 제한 시간(초, 0 이면 제한 없음)")
+    parser.add_argument("--hedge-percentile", type=float, default=0.0,
+                        help="응답 시간이 이 백분위수를 넘으면 백업 요청을 보냄 (0 이면 사용 안 함)")
+    parser.add_argument("--hedge-max-ratio", type=float, default=0.05, help="전체 요청 대비 백업 요청 비율 상한")
+    parser.add_argument("--hedge-min-delay", type=float, default=0.02, help="백업 요청 전 최소 대기 시간(초)")
+    parser.add_argument("--breaker-threshold", type=int, default=5,
+                        help="연속 장애성 실패(DNS, 연결 끊김, TLS, 시간 초과, 5xx)가 이만큼이면 전송 중단 (0 이면 사용 안 함)")
+    parser.add_argument("--breaker-cooldown", type=float, default=1.0, help="전송 중단 후 복구 확인까지 기다릴 시간(초)")
+    parser.add_argument("--dns-cache", default=DNS_CACHE_PATH,
+                        help="주소 조회 결과를 저장해 재시작 후에도 쓸 경로 (빈 문자열이면 캐시하지 않음)")
+    parser.add_argument("--dns-ttl", type=float, default=DNS_TTL, help="저장한 주소를 다시 조회하기 전까지 쓸 시간(초)")
+    parser.add_argument("--batch", action="store_true",
+                        help="순차 실행에서 여러 과목을 한 요청으로 묶어 보냄 (서버가 받지 않으면 과목마다 따로)")
+    return parser.parse_args(argv)
+
+
+def run(args):
+    if args.event_log:
+        event_log.configure(args.event_log, int(args.event_log_max_mb * 1024 * 1024))
+
+    load_courses(args.courses)
+    if args.state:
+        restore_state(args.state, args.reset_state)
+
+    if args.metrics_port:
+        metrics.start_http_server(args.metrics_port)
+        print(f"지표 제공 중: http://127.0.0.1:{args.metrics_port}/metrics")
+    if args.metrics_json:
+        metrics.start_json_snapshots(args.metrics_json, args.metrics_interval)
+
+    if start_sso() is not None and args.sessions > 0:
+        start_session_pool(args.sessions)
+
+    set_request_timeout(args.timeout or None)
+    if args.dns_cache:
+        set_dns_cache(DnsCache(args.dns_cache, args.dns_ttl))
+    make_retry_policy(args.breaker_threshold, args.breaker_cooldown)
+    if args.hedge_percentile > 0:
+        start_hedging(args.hedge_percentile, args.hedge_max_ratio, args.hedge_min_delay)
+
+    # 첫 요청 전에 연결을 미리 열어 DNS/TLS 핸드셰이크 비용을 줄임 (백업 요청용 연결 하나 더)
+    try:
+        prewarm((args.concurrency if args.use_async else 1) + (1 if args.hedge_percentile > 0 else 0))
     except Exception as e:
-        print("요청 중 오류 발생:", e)
-        time.sleep(1)
+        print("연결 사전 준비 실패:", e)
+
+    # 모든 과목의 요청 바이트열을 시작 시점에 미리 조립
+    prebuild_requests(expand(subject_data))
+
+    if args.launch_at:
+        launch(args.launch_at, args.sync_probes, args.lead_ms)
+
+    scheduler = make_scheduler(args)
+    if args.use_async:
+        if args.batch:
+            print("--batch 는 순차 실행에서만 사용합니다. 과목마다 따로 보냅니다.")
+        run_async(scheduler, args.concurrency, args.attempts, args.retry_delay)
+    else:
+        run_sequential(scheduler, args.batch)
+
+
+def main(argv=None):
+    run(parse_args(argv))
+
+
+if __name__ == "__main__":
+    main()
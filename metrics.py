@@ -0,0 +1,186 @@
+# metrics.py
+
+import bisect
+import json
+import math
+import os
+import threading
+import time
+
+# 요청 단계별 시간에 맞춘 기본 구간 (초)
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    """고정 구간 누적 히스토그램 (Prometheus histogram 과 같은 형식)"""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q):
+        """구간 경계로 근사한 분위수"""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float('inf')
+
+
+def _finite(value):
+    # JSON 에는 Infinity 가 없으므로 마지막 구간을 넘은 분위수는 null 로 씀 (+Inf 는 Prometheus 출력에만)
+    return None if value is not None and math.isinf(value) else value
+
+
+class Registry:
+    """카운터, 게이지, 히스토그램을 이름과 라벨별로 보관"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._gauges = {}
+        self._histograms = {}
+        self._help = {}
+
+    @staticmethod
+    def _key(name, labels):
+        return name, tuple(sorted(labels.items()))
+
+    def describe(self, name, text):
+        self._help[name] = text
+
+    def inc(self, name, value=1, **labels):
+        key = self._key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def set(self, name, value, **labels):
+        with self._lock:
+            self._gauges[self._key(name, labels)] = value
+
+    def observe(self, name, value, buckets=DEFAULT_BUCKETS, **labels):
+        key = self._key(name, labels)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram(buckets)
+            histogram.observe(value)
+
+    @staticmethod
+    def _labels(labels, extra=()):
+        items = list(labels) + list(extra)
+        if not items:
+            return ''
+        return '{' + ','.join(f'{k}="{v}"' for k, v in items) + '}'
+
+    def render_prometheus(self):
+        """Prometheus 텍스트 형식으로 출력"""
+        lines = []
+        typed = set()
+        with self._lock:
+            sections = (('counter', self._counters), ('gauge', self._gauges))
+            for kind, values in sections:
+                for (name, labels), value in sorted(values.items()):
+                    if name not in typed:
+                        typed.add(name)
+                        if name in self._help:
+                            lines.append(f'# HELP {name} {self._help[name]}')
+                        lines.append(f'# TYPE {name} {kind}')
+                    lines.append(f'{name}{self._labels(labels)} {value}')
+            for (name, labels), histogram in sorted(self._histograms.items()):
+                if name not in typed:
+                    typed.add(name)
+                    if name in self._help:
+                        lines.append(f'# HELP {name} {self._help[name]}')
+                    lines.append(f'# TYPE {name} histogram')
+                cumulative = 0
+                for bound, count in zip(histogram.buckets, histogram.counts):
+                    cumulative += count
+                    lines.append(f'{name}_bucket{self._labels(labels, [("le", bound)])} {cumulative}')
+                lines.append(f'{name}_bucket{self._labels(labels, [("le", "+Inf")])} {histogram.count}')
+                lines.append(f'{name}_sum{self._labels(labels)} {histogram.sum}')
+                lines.append(f'{name}_count{self._labels(labels)} {histogram.count}')
+        return '\n'.join(lines) + '\n'
+
+    def snapshot(self):
+        """JSON 으로 저장하기 좋은 형태의 현재 값"""
+        def label_text(labels):
+            return ','.join(f'{k}={v}' for k, v in labels) or '_'
+
+        result = {'time': time.time(), 'counters': {}, 'gauges': {}, 'histograms': {}}
+        with self._lock:
+            for (name, labels), value in self._counters.items():
+                result['counters'].setdefault(name, {})[label_text(labels)] = value
+            for (name, labels), value in self._gauges.items():
+                result['gauges'].setdefault(name, {})[label_text(labels)] = value
+            for (name, labels), histogram in self._histograms.items():
+                result['histograms'].setdefault(name, {})[label_text(labels)] = {
+                    'count': histogram.count,
+                    'sum': histogram.sum,
+                    'p50': _finite(histogram.quantile(0.5)),
+                    'p95': _finite(histogram.quantile(0.95)),
+                    'p99': _finite(histogram.quantile(0.99)),
+                }
+        return result
+
+
+REGISTRY = Registry()
+inc = REGISTRY.inc
+set_gauge = REGISTRY.set
+observe = REGISTRY.observe
+
+
+def start_http_server(port, host='127.0.0.1', registry=REGISTRY):
+    """/metrics 에서 Prometheus 텍스트를 내보내는 서버를 백그라운드로 실행"""
+    # http.server 는 email 패키지까지 불러오므로 서버를 켤 때만 import
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?')[0] != '/metrics':
+                self.send_error(404)
+                return
+            body = registry.render_prometheus().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name='metrics-http', daemon=True).start()
+    return server
+
+
+def start_json_snapshots(path, interval=5.0, registry=REGISTRY):
+    """interval 초마다 현재 값을 path 에 JSON 으로 저장 (임시 파일 후 교체)"""
+
+    def run():
+        while True:
+            time.sleep(interval)
+            try:
+                tmp_path = f'{path}.tmp'
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(registry.snapshot(), f)
+                os.replace(tmp_path, path)
+            except OSError as e:
+                print('지표 저장 실패:', e)
+
+    thread = threading.Thread(target=run, name='metrics-json', daemon=True)
+    thread.start()
+    return thread
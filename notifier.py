@@ -1,15 +1,156 @@
 # notifier.py
 
-import requests
+import atexit
+import heapq
+import itertools
+import threading
+import time
+from connection_pool import ConnectionPool
 from credentials import NTFY_TOPIC
+from event_log import log_event
 
-def send_mobile_alert(message):
-    url = f"https://ntfy.sh/{NTFY_TOPIC}"
-    try:
-        response = requests.post(url, data=message.encode('utf-8'))
-        if response.status_code == 200:
-            print("휴대폰 알림 전송 성공")
-        else:
-            print("휴대폰 알림 전송 실패:", response.text)
-    except Exception as e:
-        print("알림 전송 중 오류 발생:", e)
+NTFY_HOST = 'ntfy.sh'
+
+# 알림 우선순위 (작을수록 먼저 전송, ntfy Priority 헤더 값과 함께 사용)
+PRIORITY_URGENT = 0
+PRIORITY_DEFAULT = 1
+
+QUEUE_SIZE = 64          # 대기 가능한 알림 수 (성공 알림은 항상 들어감)
+COALESCE_INTERVAL = 60.0  # 같은 종류 알림의 최소 전송 간격(초)
+MAX_ATTEMPTS = 3          # 전송 실패 시 최대 시도 횟수
+RETRY_DELAY = 2.0
+
+
+class AlertQueue:
+    """우선순위 순으로 꺼내는 크기 제한 큐 (가득 차면 가장 덜 급한 알림을 버림)"""
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.dropped = 0
+        self._heap = []
+        self._counter = itertools.count()
+        self._cond = threading.Condition()
+
+    def put(self, priority, item):
+        with self._cond:
+            entry = (priority, next(self._counter), item)
+            if len(self._heap) >= self.maxsize:
+                worst = max(self._heap)
+                if worst[0] <= priority:
+                    self.dropped += 1
+                    return False
+                self._heap.remove(worst)
+                heapq.heapify(self._heap)
+                self.dropped += 1
+            heapq.heappush(self._heap, entry)
+            self._cond.notify()
+            return True
+
+    def get(self, timeout=None):
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._heap, timeout):
+                return None
+            return heapq.heappop(self._heap)[2]
+
+    def __len__(self):
+        with self._cond:
+            return len(self._heap)
+
+
+class Notifier:
+    """ntfy 알림을 백그라운드 스레드에서 보내는 전송기"""
+
+    def __init__(self, topic, host=NTFY_HOST, port=443, use_tls=True,
+                 coalesce_interval=COALESCE_INTERVAL, queue_size=QUEUE_SIZE):
+        self.path = f'/{topic}'
+        self.pool = ConnectionPool(host, port, use_tls=use_tls, maxsize=1, timeout=10)
+        self.coalesce_interval = coalesce_interval
+        self.queue = AlertQueue(queue_size)
+        self.sent = 0
+        self.failed = 0
+        self._last_sent = {}      # 종류별 마지막 전송 시각
+        self._suppressed = {}     # 종류별로 생략된 알림 수
+        self._lock = threading.Lock()
+        self._idle = threading.Condition()
+        self._pending = 0
+        self._thread = None
+
+    def _ensure_worker(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name='notifier', daemon=True)
+            self._thread.start()
+
+    def submit(self, message, kind=None, priority=PRIORITY_DEFAULT):
+        """알림을 큐에 넣고 바로 돌아옴 (같은 종류는 coalesce_interval 안에서 한 번만 전송)"""
+        now = time.monotonic()
+        if kind is not None and priority != PRIORITY_URGENT:
+            with self._lock:
+                last = self._last_sent.get(kind)
+                if last is not None and now - last < self.coalesce_interval:
+                    self._suppressed[kind] = self._suppressed.get(kind, 0) + 1
+                    return False
+                self._last_sent[kind] = now
+                suppressed = self._suppressed.pop(kind, 0)
+            if suppressed:
+                message = f"{message} (같은 알림 {suppressed}회 생략)"
+
+        with self._idle:
+            self._pending += 1
+        if not self.queue.put(priority, (message, priority)):
+            self._done()
+            return False
+        self._ensure_worker()
+        return True
+
+    def _done(self):
+        with self._idle:
+            self._pending -= 1
+            self._idle.notify_all()
+
+    def _deliver(self, message, priority):
+        headers = {
+            'Content-Type': 'text/plain; charset=utf-8',
+            'Priority': '5' if priority == PRIORITY_URGENT else '3',
+        }
+        response, body = self.pool.request('POST', self.path, message.encode('utf-8'), headers)
+        if response.status != 200:
+            raise RuntimeError(body.decode('utf-8', 'replace'))
+
+    def _run(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                continue
+            message, priority = item
+            try:
+                for attempt in range(1, MAX_ATTEMPTS + 1):
+                    try:
+                        self._deliver(message, priority)
+                        self.sent += 1
+                        print("휴대폰 알림 전송 성공")
+                        break
+                    except Exception as e:
+                        if attempt == MAX_ATTEMPTS:
+                            self.failed += 1
+                            print("알림 전송 중 오류 발생:", e)
+                        else:
+                            time.sleep(RETRY_DELAY * attempt)
+            finally:
+                self._done()
+
+    def flush(self, timeout=5.0):
+        """대기 중인 알림을 timeout 초까지 기다려 보냄 (종료 직전 성공 알림 유실 방지)"""
+        with self._idle:
+            return self._idle.wait_for(lambda: self._pending == 0, timeout)
+
+
+_notifier = Notifier(NTFY_TOPIC)
+atexit.register(_notifier.flush)
+
+
+def send_mobile_alert(message, kind=None, urgent=False):
+    """알림을 백그라운드 전송 큐에 넣음 (호출한 쪽은 기다리지 않음)"""
+    priority = PRIORITY_URGENT if urgent else PRIORITY_DEFAULT
+    queued = _notifier.submit(message, kind, priority)
+    log_event('alert', alert_kind=kind, message=message, urgent=urgent, queued=queued)
+    return queued
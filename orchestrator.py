@@ -0,0 +1,349 @@
+# orchestrator.py
+"""
+여러 계정을 한 프로세스에서 동시에 돌리는 실행기
+
+계정 파일의 계정마다 asyncio 태스크로 async_engine 을 돌린다. 프로세스를 계정마다 띄우면
+import, 연결 풀, 지표가 계정 수만큼 생기고 서버 전체 전송 속도 상한을 나눠 가질 수 없으므로
+한 프로세스 안에서 돌린다.
+- 계정마다 따로: 과목 목록, 세션 풀 (다른 계정 쿠키로는 절대 보내지 않음)
+- 함께 씀: 알림, 지표, 전송 속도 상한(스케줄러), 서킷 브레이커, 연결 풀, 요청 캐시
+- 진행 상황: report_interval 초마다 계정별 표를 출력하고 --report-json 경로에 저장
+
+계정 파일 형식 (subject_data/subject_priority 는 subjects.json 과 같음):
+{
+  "accounts": [
+    {"name": "학생1", "id": "SSO 아이디", "password": "비밀번호", "sessions": 2,
+     "subject_data": {"HALB0001": [3, 1]}, "subject_priority": {"HALB0001": 0}},
+    {"name": "학생2", "SGJSESSIONID": "...", "WMONID": "...", "subject_data": {"HALB0002": 1}}
+  ]
+}
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+import metrics
+import event_log
+from async_engine import run_engine
+from course_list import divisions, expand, validate
+from notifier import send_mobile_alert
+from response_parser import Outcome
+from retry_policy import make_retry_policy
+from scheduler import make_scheduler
+from session_pool import SessionPool
+from sugang_request import (NoSessionError, send_sugang_request, prewarm, prebuild_requests, set_request_timeout,
+                            probe_server)
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "accounts.json")
+MAX_PREWARM = 8   # 시작할 때 미리 열어 둘 연결 수 상한 (계정이 많아도 서버에 한꺼번에 붙지 않도록)
+
+WAITING = "waiting"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+metrics.REGISTRY.describe('sugang_account_responses_total', '계정별, 응답 종류별 수강신청 응답 수')
+metrics.REGISTRY.describe('sugang_account_courses', '계정별 과목 수 (state: pending, granted, rejected)')
+
+
+@dataclass
+class Account:
+    name: str
+    subject_data: dict
+    subject_priority: dict = field(default_factory=dict)
+    user_id: str = None
+    password: str = None
+    tokens: tuple = None    # (SGJSESSIONID, WMONID) - SSO 계정 대신 직접 넣은 토큰
+    sessions: int = 1       # SSO 로 모아 둘 세션 수
+
+
+def parse_accounts(raw):
+    """계정 파일 내용을 검사해 Account 목록을 돌려줌 (잘못되면 ValueError)"""
+    if not isinstance(raw, dict) or not isinstance(raw.get("accounts"), list) or not raw["accounts"]:
+        raise ValueError('"accounts" 목록이 없거나 비었습니다.')
+    accounts = []
+    for index, entry in enumerate(raw["accounts"], 1):
+        if not isinstance(entry, dict):
+            raise ValueError(f"{index}번째 계정이 객체가 아닙니다.")
+        name = str(entry.get("name") or f"account{index}")
+        if any(account.name == name for account in accounts):
+            raise ValueError(f"계정 이름이 중복되었습니다: {name}")
+        courses = {key: entry[key] for key in ("subject_data", "subject_priority") if key in entry}
+        try:
+            data, priority = validate(courses)
+        except ValueError as e:
+            raise ValueError(f"{name}: {e}") from None
+        tokens = None
+        if entry.get("SGJSESSIONID"):
+            tokens = (entry["SGJSESSIONID"], entry.get("WMONID", ""))
+        user_id, password = entry.get("id"), entry.get("password")
+        if not tokens and not (user_id and password):
+            raise ValueError(f"{name}: id/password 또는 SGJSESSIONID 가 필요합니다.")
+        sessions = entry.get("sessions", 1)
+        if isinstance(sessions, bool) or not isinstance(sessions, int) or sessions < 1:
+            raise ValueError(f"{name}: sessions 는 1 이상의 정수여야 합니다.")
+        accounts.append(Account(name, data, priority, user_id, password, tokens, sessions))
+    return accounts
+
+
+def load_accounts(path=DEFAULT_PATH):
+    with open(path, encoding="utf-8") as f:
+        return parse_accounts(json.load(f))
+
+
+class AccountWorker:
+    """계정 하나의 과목 목록, 세션 풀, 진행 상황"""
+
+    def __init__(self, account):
+        self.account = account
+        self.name = account.name
+        self.subject_data = dict(account.subject_data)
+        self.total = len(self.subject_data)
+        self.sessions = None
+        self.dropped = {}       # 학수번호: 다시 보내도 소용없는 거절을 받은 분반 집합
+        self.granted = {}       # 학수번호: 성공한 분반
+        self.rejected = []      # 모든 분반이 거절되어 뺀 과목
+        self.abandoned = []     # 세션을 잃어 더 신청하지 못한 과목
+        self.responses = 0
+        self.errors = 0
+        self.last_outcome = None
+        self.status = WAITING
+        self.error = None
+        self.started = None
+        self.finished = None
+        self._loop = None
+
+    def start_sessions(self, login=None):
+        """계정 전용 세션 풀을 만듦 (SSO 계정은 sessions 개까지 로그인, 실패하면 FAILED)"""
+        account = self.account
+        relogin = None
+        if login is not None and account.user_id:
+            def relogin():
+                return login(account.user_id, account.password)
+        self.sessions = SessionPool(login=relogin)
+        if account.tokens:
+            self.sessions.add(*account.tokens)
+        self.sessions.fill(account.sessions)
+        if not len(self.sessions):
+            self.status = FAILED
+            self.error = "세션을 받지 못했습니다."
+        return self.sessions
+
+    def pending(self, course):
+        """아직 신청할 분반 (성공했거나 빠진 과목이면 빈 튜플)"""
+        entry = self.subject_data.get(course)
+        if entry is None:
+            return ()
+        dropped = self.dropped.get(course, ())
+        return tuple(div for div in divisions(entry) if div not in dropped)
+
+    def drop(self, course, div):
+        self.dropped.setdefault(course, set()).add(div)
+        if not self.pending(course):
+            print(f"[{self.name}] 재시도해도 신청할 수 없어 {course} 제외합니다.")
+            self.subject_data.pop(course, None)
+            self.rejected.append(course)
+
+    def send(self, course, div):
+        try:
+            return send_sugang_request(course, div, sessions=self.sessions, account=self.name)
+        except NoSessionError:
+            self.errors += 1
+            # 다시 로그인할 수 없는 계정(토큰만 넣은 계정)은 세션이 모두 만료되면 멈춤
+            if self.sessions.login is None:
+                self._loop.call_soon_threadsafe(self.abandon, "세션이 모두 만료되었습니다.")
+            raise
+        except Exception:
+            self.errors += 1
+            raise
+
+    def abandon(self, reason):
+        """남은 과목을 모두 빼서 이 계정의 시도를 멈춤 (이벤트 루프 스레드에서 호출)"""
+        if not self.subject_data:
+            return
+        print(f"[{self.name}] {reason} 남은 과목 {list(self.subject_data)} 신청을 멈춥니다.")
+        self.abandoned.extend(self.subject_data)
+        self.subject_data.clear()
+        self.status = FAILED
+        self.error = reason
+
+    def handle_response(self, course, div, result):
+        """응답을 진행 상황에 반영하고 알림을 보낸 뒤 수강신청 성공 여부를 돌려줌"""
+        self.responses += 1
+        self.last_outcome = result.outcome.value
+        metrics.inc('sugang_account_responses_total', account=self.name, outcome=result.outcome.value)
+        # 알림 종류에 계정 이름을 붙여 계정마다 따로 묶어 보냄
+        if result.outcome == Outcome.SESSION_EXPIRED:
+            # 세션 풀이 만료된 세션을 스스로 다시 로그인함
+            send_mobile_alert(f"[{self.name}] 경고: 수강신청 서버 세션 만료", kind=f"{self.name}:session_expired")
+        elif result.outcome == Outcome.OVER_CAPACITY:
+            send_mobile_alert(f"[{self.name}] 경고: 수강신청 제한 인원 초과", kind=f"{self.name}:over_capacity")
+        elif result.outcome == Outcome.OUT_OF_PERIOD:
+            send_mobile_alert(f"[{self.name}] 경고: 수강신청 기간 초과", kind=f"{self.name}:out_of_period")
+        elif result.granted:
+            self.granted[course] = div
+            event_log.log_event('granted', account=self.name, course=course, div=div)
+            send_mobile_alert(f"[{self.name}] 수강신청 성공!! (학수번호: {course}, 분반: {div})", urgent=True)
+            return True
+        elif not result.retry:
+            send_mobile_alert(f"[{self.name}] 경고: 수강신청 불가 (학수번호: {course}, 분반: {div}) {result.message}",
+                              kind=f"{self.name}:rejected:{course}")
+        return False
+
+    async def run(self, scheduler, retry, concurrency, attempts_per_course, retry_delay):
+        if self.status == FAILED:
+            return False
+        self.status = RUNNING
+        self.started = time.monotonic()
+        self._loop = asyncio.get_running_loop()
+        try:
+            await run_engine(self.subject_data, self.handle_response, concurrency, scheduler,
+                             attempts_per_course, retry_delay, self.account.subject_priority, retry=retry,
+                             pending=self.pending, on_reject=self.drop, send=self.send, label=self.name)
+        except Exception as e:
+            self.status = FAILED
+            self.error = str(e)
+            return False
+        finally:
+            self.finished = time.monotonic()
+        if self.status != FAILED:
+            self.status = DONE
+        return self.status == DONE and not self.subject_data
+
+    def progress(self):
+        end = self.finished or time.monotonic()
+        return {
+            "account": self.name,
+            "status": self.status,
+            "granted": dict(self.granted),
+            "pending": list(self.subject_data) + self.abandoned,
+            "rejected": list(self.rejected),
+            "total": self.total,
+            "responses": self.responses,
+            "errors": self.errors,
+            "last_outcome": self.last_outcome,
+            "sessions": len(self.sessions.healthy()) if self.sessions is not None else 0,
+            "elapsed": round(end - self.started, 1) if self.started else 0.0,
+            "error": self.error,
+        }
+
+
+def format_report(rows):
+    """계정별 진행 상황 표"""
+    lines = [f"{'계정':<12}{'상태':<9}{'성공':>7}{'남음':>6}{'응답':>8}{'오류':>6}{'세션':>6}{'경과(초)':>10}  마지막 응답"]
+    for row in rows:
+        done = f"{len(row['granted'])}/{row['total']}"
+        lines.append(f"{row['account']:<12}{row['status']:<9}{done:>7}{len(row['pending']):>6}"
+                     f"{row['responses']:>8}{row['errors']:>6}{row['sessions']:>6}{row['elapsed']:>10.1f}"
+                     f"  {row['last_outcome'] or '-'}{' (' + row['error'] + ')' if row['error'] else ''}")
+    return "\n".join(lines)
+
+
+def report(workers, path=None):
+    """진행 상황을 출력하고 지표에 반영 (path 를 주면 JSON 으로도 저장)"""
+    rows = [worker.progress() for worker in workers]
+    for row in rows:
+        for state in ("pending", "granted", "rejected"):
+            metrics.set_gauge('sugang_account_courses', len(row[state]), account=row["account"], state=state)
+    print(format_report(rows))
+    if path:
+        # 임시 파일에 쓴 뒤 교체해서, 쓰는 도중 읽어도 깨진 파일이 보이지 않게 함
+        tmp_path = f"{path}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"ts": time.time(), "accounts": rows}, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print("진행 상황 저장 실패:", e)
+    return rows
+
+
+async def run_accounts(workers, scheduler, retry=None, concurrency=2, attempts_per_course=1, retry_delay=1.0,
+                       login=None, report_interval=10.0, report_path=None):
+    """모든 계정의 세션을 준비한 뒤 함께 신청하고, 끝나면 계정별 진행 상황을 돌려줌"""
+    # 계정마다 요청 스레드를 쓰므로 기본 스레드 수(CPU 수 + 4)로는 계정이 많을 때 요청이 밀림
+    loop = asyncio.get_running_loop()
+    loop.set_default_executor(ThreadPoolExecutor(max_workers=max(8, len(workers) * concurrency * attempts_per_course)))
+
+    # SSO 로그인은 계정마다 수백 ms 가 걸리므로 동시에 진행
+    await asyncio.gather(*(asyncio.to_thread(worker.start_sessions, login) for worker in workers))
+    for worker in workers:
+        if worker.status == FAILED:
+            print(f"[{worker.name}] {worker.error} 이 계정은 건너뜁니다.")
+
+    async def report_loop():
+        while True:
+            await asyncio.sleep(report_interval)
+            report(workers, report_path)
+
+    reporter = asyncio.create_task(report_loop()) if report_interval > 0 else None
+    try:
+        await asyncio.gather(*(worker.run(scheduler, retry, concurrency, attempts_per_course, retry_delay)
+                               for worker in workers))
+    finally:
+        if reporter is not None:
+            reporter.cancel()
+    return report(workers, report_path)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="sugang accounts", description="여러 계정 동시 수강신청")
+    parser.add_argument("--accounts", default=DEFAULT_PATH, help="계정 파일 경로")
+    parser.add_argument("--concurrency", type=int, default=2, help="계정마다 동시에 보낼 최대 요청 수")
+    parser.add_argument("--attempts", type=int, default=1, help="과목마다 동시에 진행할 시도 수")
+    parser.add_argument("--retry-delay", type=float, default=1.0, help="같은 과목 재시도 간격(초)")
+    parser.add_argument("--max-rate", type=float, default=2.0, help="모든 계정을 합친 초당 요청 수 상한")
+    parser.add_argument("--min-rate", type=float, default=0.1, help="초당 요청 수 하한")
+    parser.add_argument("--initial-rate", type=float, default=0.5, help="시작 초당 요청 수")
+    parser.add_argument("--latency-target", type=float, default=1.0, help="이보다 느린 응답은 혼잡으로 판단(초)")
+    parser.add_argument("--fixed-rate", type=float, default=0.0, help="속도 조절 없이 고정 초당 요청 수 사용")
+    parser.add_argument("--jitter", type=float, default=0.3, help="전송 간격 무작위 비율 (0~1)")
+    parser.add_argument("--timeout", type=float, default=10.0, help="요청별 제한 시간(초, 0 이면 제한 없음)")
+    parser.add_argument("--breaker-threshold", type=int, default=5,
+                        help="연속 장애성 실패가 이만큼이면 모든 계정의 전송을 멈춤 (0 이면 끄기)")
+    parser.add_argument("--breaker-cooldown", type=float, default=1.0, help="전송 중단 후 복구 확인까지 기다릴 시간(초)")
+    parser.add_argument("--report-interval", type=float, default=10.0, help="진행 상황 출력 간격(초, 0 이면 끝날 때만)")
+    parser.add_argument("--report-json", default=None, help="진행 상황을 저장할 JSON 경로")
+    parser.add_argument("--metrics-port", type=int, default=0, help="Prometheus 지표를 내보낼 포트 (/metrics)")
+    parser.add_argument("--event-log", default=event_log.DEFAULT_PATH,
+                        help="이벤트 로그(JSONL) 경로 (빈 문자열이면 기록하지 않음)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    try:
+        accounts = load_accounts(args.accounts)
+    except (OSError, ValueError) as e:
+        print("계정 파일을 읽지 못했습니다:", e)
+        return 2
+    if args.event_log:
+        event_log.configure(args.event_log)
+    if args.metrics_port:
+        metrics.start_http_server(args.metrics_port)
+        print(f"지표 제공 중: http://127.0.0.1:{args.metrics_port}/metrics")
+
+    # 스케줄러, 재시도 정책은 main 과 같은 방식으로 하나만 만들어 모든 계정이 함께 씀
+    from sso_login import login
+    set_request_timeout(args.timeout or None)
+    retry = make_retry_policy(args.breaker_threshold, args.breaker_cooldown, probe=probe_server)
+    scheduler = make_scheduler(args)
+    try:
+        prewarm(min(len(accounts) * args.concurrency, MAX_PREWARM))
+    except Exception as e:
+        print("연결 사전 준비 실패:", e)
+    prebuild_requests({item for account in accounts for item in expand(account.subject_data)})
+
+    workers = [AccountWorker(account) for account in accounts]
+    print(f"계정 {len(workers)}개 시작 (전체 속도 상한 {args.fixed_rate or args.max_rate}회/초)")
+    rows = asyncio.run(run_accounts(workers, scheduler, retry, args.concurrency, args.attempts,
+                                    args.retry_delay, login, args.report_interval, args.report_json))
+    return 0 if all(not row["pending"] and row["status"] == DONE for row in rows) else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
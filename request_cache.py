@@ -0,0 +1,87 @@
+# request_cache.py
+
+import threading
+
+CRLF = b'\r\n'
+
+
+class PreparedRequest:
+    """쿠키 줄만 빼고 미리 조립해 둔 요청 한 건"""
+
+    __slots__ = ('prefix', 'tail', 'payload')
+
+    def __init__(self, prefix, tail):
+        self.prefix = prefix    # 요청 라인 + 쿠키를 뺀 헤더
+        self.tail = tail        # Content-Length + 빈 줄 + 본문
+        self.payload = b''
+
+
+class RequestCache:
+    """(학수번호, 분반) 별로 전송할 요청 바이트열을 미리 만들어 두는 캐시
+
+    세션이 바뀌면 Cookie 줄만 다시 끼워 넣고 나머지는 그대로 재사용한다.
+    """
+
+    def __init__(self, method, path, headers, encode_body):
+        self.method = method
+        self.path = path
+        self.encode_body = encode_body
+        self._entries = {}
+        self._lock = threading.Lock()
+        self.set_headers(headers)
+
+    def set_headers(self, headers):
+        """고정 헤더가 바뀌면 (대상 서버 변경 등) 모든 요청을 다시 조립"""
+        static = {name: value for name, value in headers.items() if name.lower() != 'cookie'}
+        lines = [f'{self.method} {self.path} HTTP/1.1']
+        lines.extend(f'{name}: {value}' for name, value in static.items())
+        self._head = ('\r\n'.join(lines) + '\r\n').encode('latin-1')
+        cookie = next((value for name, value in headers.items() if name.lower() == 'cookie'), None)
+        with self._lock:
+            keys = list(self._entries)
+            self._entries.clear()
+        self._cookie_line = b''
+        self.set_cookie(cookie)
+        for course, div in keys:
+            self.get(course, div)
+
+    def set_cookie(self, cookie):
+        """세션이 바뀌었을 때 Cookie 줄만 교체"""
+        cookie_line = f'Cookie: {cookie}\r\n'.encode('latin-1') if cookie else b''
+        with self._lock:
+            self._cookie_line = cookie_line
+            for entry in self._entries.values():
+                entry.payload = entry.prefix + self._cookie_line + entry.tail
+
+    def _build(self, course, div):
+        body = self.encode_body(course, div)
+        return PreparedRequest(self._head, b'Content-Length: %d\r\n\r\n' % len(body) + body)
+
+    def get(self, course, div, cookie_line=None):
+        """전송할 요청 바이트열 (없으면 만들어서 저장)
+
+        cookie_line 을 주면 (세션 풀에서 고른 세션) 기본 Cookie 줄 대신 그 줄을 끼워 넣는다.
+        """
+        entry = self._entries.get((course, div))
+        if entry is None:
+            entry = self._build(course, div)
+            with self._lock:
+                entry.payload = entry.prefix + self._cookie_line + entry.tail
+                self._entries[(course, div)] = entry
+        if cookie_line is not None:
+            return entry.prefix + cookie_line + entry.tail
+        return entry.payload
+
+    def payload_for(self, body, cookie_line=None):
+        """캐시에 두지 않는 본문(여러 과목 묶음 등)으로 요청 바이트열을 조립"""
+        tail = b'Content-Length: %d\r\n\r\n' % len(body) + body
+        return self._head + (self._cookie_line if cookie_line is None else cookie_line) + tail
+
+    def prebuild(self, items):
+        """(학수번호, 분반) 목록의 요청을 미리 만들어 둠"""
+        for course, div in items:
+            self.get(course, div)
+        return len(self._entries)
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,160 @@
+# response_parser.py
+
+import json
+import re
+from dataclasses import dataclass
+from enum import Enum
+
+# tlsnAplyDirect.do 응답은 JSON 본문이며 오류 시 ErrorCode/ErrorMsg 를, 처리 결과는
+# 데이터맵(dm...) 안의 결과 필드를 담아 돌려준다. 본문 전체를 디코딩하지 않고
+# 필요한 필드만 바이트 단위 정규식으로 뽑아낸다.
+CODE_RE = re.compile(rb'"(?:ErrorCode|errorCode|strErrCd)"\s*:\s*"?(-?\d+)')
+MESSAGE_RE = re.compile(rb'"(?:ErrorMsg|errorMsg|strRtnMsg|strMsg)"\s*:\s*"((?:[^"\\]|\\.)*)"')
+SUCCESS_RE = re.compile(rb'"(?:strRtnCd|strResult|strRslt|result|success)"\s*:\s*"?(true|Y)"?[,}\s]')
+
+SESSION_EXPIRED_CODE = -3000
+
+
+class Outcome(str, Enum):
+    SUCCESS = "success"
+    ALREADY_REGISTERED = "already_registered"
+    SESSION_EXPIRED = "session_expired"
+    OVER_CAPACITY = "over_capacity"
+    OUT_OF_PERIOD = "out_of_period"
+    REJECTED = "rejected"
+    SERVER_ERROR = "server_error"
+    UNKNOWN = "unknown"
+
+
+@dataclass(frozen=True)
+class ParsedResponse:
+    outcome: Outcome
+    code: int | None      # 서버 ErrorCode (없으면 None)
+    message: str          # 서버 메시지 (없으면 빈 문자열)
+    granted: bool         # 좌석을 확보했는지 여부
+    retry: bool           # 같은 요청을 다시 보낼 가치가 있는지 여부
+
+
+# 메시지 분류 규칙 (위에서부터 먼저 맞는 규칙 적용)
+# "기간 초과" 처럼 두 단어가 함께 나오는 경우를 위해 기간 규칙을 인원 초과보다 먼저 둔다.
+# "신청 가능 학점을 초과" 는 다시 보내도 안 되는 거절이므로 거절 규칙도 인원 초과보다 먼저 둔다.
+MESSAGE_RULES = [
+    (re.compile(r'세션'), Outcome.SESSION_EXPIRED, False, True),
+    (re.compile(r'기간'), Outcome.OUT_OF_PERIOD, False, True),
+    (re.compile(r'이미\s*(?:신청|수강)'), Outcome.ALREADY_REGISTERED, True, False),
+    (re.compile(r'중복|학점|선수|대상'), Outcome.REJECTED, False, False),
+    (re.compile(r'초과|마감|여석'), Outcome.OVER_CAPACITY, False, True),
+    (re.compile(r'성공|완료|신청되었'), Outcome.SUCCESS, True, False),
+]
+
+
+def classify_message(message, code=None):
+    for pattern, outcome, granted, retry in MESSAGE_RULES:
+        if pattern.search(message):
+            return ParsedResponse(outcome, code, message, granted, retry)
+    return None
+
+
+def _decode_message(raw):
+    try:
+        return json.loads(b'"' + raw + b'"')
+    except ValueError:
+        return raw.decode('utf-8', 'replace')
+
+
+class ResponseParser:
+    """청크 단위로 본문을 받아 결과가 정해지는 즉시 ParsedResponse 를 돌려주는 파서"""
+
+    def __init__(self, status=200):
+        self.status = status
+        self.buffer = b''
+        self.code = None
+        self.message = None
+        self.result = None
+
+    def feed(self, chunk):
+        """청크를 추가하고, 결과가 확정되면 ParsedResponse 를, 아니면 None 을 돌려줌"""
+        if self.result is not None:
+            return self.result
+        self.buffer += chunk
+        self.result = self._decide(final=False)
+        return self.result
+
+    def finish(self):
+        """본문을 모두 받은 뒤 최종 결과를 돌려줌"""
+        if self.result is None:
+            self.result = self._decide(final=True)
+        return self.result
+
+    def _decide(self, final):
+        buffer = self.buffer
+
+        if self.code is None:
+            match = CODE_RE.search(buffer)
+            # 숫자가 청크 경계에서 잘렸을 수 있으므로 뒤에 문자가 더 있을 때만 확정
+            if match and (final or match.end() < len(buffer)):
+                self.code = int(match.group(1))
+        if self.message is None:
+            match = MESSAGE_RE.search(buffer)
+            if match:
+                self.message = _decode_message(match.group(1))
+
+        if self.code == SESSION_EXPIRED_CODE:
+            return ParsedResponse(Outcome.SESSION_EXPIRED, self.code, self.message or '', False, True)
+        if self.message:
+            result = classify_message(self.message, self.code)
+            if result is not None:
+                return result
+        if SUCCESS_RE.search(buffer):
+            return ParsedResponse(Outcome.SUCCESS, self.code, self.message or '', True, False)
+        if not final:
+            return None
+
+        # 본문을 끝까지 읽었는데도 규칙에 맞지 않는 경우
+        if self.status >= 500:
+            return ParsedResponse(Outcome.SERVER_ERROR, self.code, self.message or '', False, True)
+        if self.code is None and b'-3000' in buffer:
+            # JSON 이 아닌 오류 페이지로 세션 만료를 알리는 경우
+            return ParsedResponse(Outcome.SESSION_EXPIRED, SESSION_EXPIRED_CODE, self.message or '', False, True)
+        return ParsedResponse(Outcome.UNKNOWN, self.code, self.message or '', False, True)
+
+
+def parse_response(body, status=200):
+    """본문 전체(bytes 또는 str)를 한 번에 파싱"""
+    if isinstance(body, str):
+        body = body.encode('utf-8')
+    parser = ResponseParser(status)
+    return parser.feed(body) or parser.finish()
+
+
+# 여러 행을 한 요청으로 보냈을 때 행별 결과가 담기는 데이터셋 이름
+BATCH_RESULT_KEY = 'dsResult'
+
+# 요청 전체에 대한 응답 (세션 만료 등) 이면 묶음 지원 여부와 관계없이 모든 행에 같은 결과를 씀
+BATCH_WIDE_OUTCOMES = {Outcome.SESSION_EXPIRED, Outcome.OUT_OF_PERIOD, Outcome.SERVER_ERROR}
+
+
+def parse_batch_response(body, status, count):
+    """여러 과목을 한 요청으로 보낸 응답을 행별 ParsedResponse 목록으로
+
+    묶음 응답은 행마다 결과가 달라 본문 전체를 디코딩한다. 최상위 ErrorCode/ErrorMsg 가
+    세션 만료, 기간 오류, 서버 오류면 모든 행을 그 결과로 채운다. 그 밖에 서버가 묶음 요청을
+    받지 않은 응답(행별 결과가 없거나 행 수가 다름)이면 None 을 돌려준다.
+    """
+    try:
+        data = json.loads(body)
+    except ValueError:
+        data = None
+    if isinstance(data, dict):
+        # 행 안의 메시지가 섞이지 않도록 최상위 항목만 분류
+        top = parse_response(json.dumps({k: v for k, v in data.items() if k != BATCH_RESULT_KEY},
+                                        ensure_ascii=False), status)
+    else:
+        # JSON 이 아닌 오류 페이지 (세션 만료 안내, 서버 장애 등)
+        top = parse_response(body, status)
+    if top.outcome in BATCH_WIDE_OUTCOMES:
+        return [top] * count
+    rows = data.get(BATCH_RESULT_KEY) if isinstance(data, dict) else None
+    if status >= 400 or not isinstance(rows, list) or len(rows) != count:
+        return None
+    return [parse_response(json.dumps(row, ensure_ascii=False), status) for row in rows]
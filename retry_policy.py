@@ -0,0 +1,235 @@
+# retry_policy.py
+
+import http.client
+import random
+import socket
+import ssl
+import threading
+import time
+from dataclasses import dataclass
+from enum import Enum
+from response_parser import Outcome
+import metrics
+from event_log import log_event
+
+metrics.REGISTRY.describe('sugang_failures_total', '종류별 요청 실패 수')
+metrics.REGISTRY.describe('sugang_retry_backoff_seconds', '실패 후 다음 요청까지 기다린 시간')
+metrics.REGISTRY.describe('sugang_circuit_state', '서킷 브레이커 상태 (현재 상태만 1)')
+metrics.REGISTRY.describe('sugang_circuit_transitions_total', '서킷 브레이커 상태 전환 수')
+metrics.REGISTRY.describe('sugang_circuit_probes_total', '서버 복구 확인 요청 수 (결과별)')
+
+
+class Failure(str, Enum):
+    DNS = "dns"
+    RESET = "reset"
+    TLS = "tls"
+    TIMEOUT = "timeout"
+    SERVER_ERROR = "server_error"
+    OTHER = "other"
+
+
+# 서버나 네트워크가 내려갔다고 볼 수 있는 실패 (서킷 브레이커가 세는 실패)
+OUTAGE_FAILURES = {Failure.DNS, Failure.RESET, Failure.TLS, Failure.TIMEOUT, Failure.SERVER_ERROR}
+
+
+def classify(error=None, result=None):
+    """예외나 응답 결과를 실패 종류로 나눔 (실패가 아니면 None)"""
+    if error is None:
+        if result is not None and result.outcome == Outcome.SERVER_ERROR:
+            return Failure.SERVER_ERROR
+        return None
+    # 순서 중요: SSLError, timeout 모두 OSError 의 하위 클래스
+    if isinstance(error, socket.gaierror):
+        return Failure.DNS
+    if isinstance(error, (ssl.SSLError, ssl.CertificateError)):
+        return Failure.TLS
+    if isinstance(error, TimeoutError):
+        return Failure.TIMEOUT
+    if isinstance(error, (ConnectionError, http.client.RemoteDisconnected, http.client.BadStatusLine)):
+        return Failure.RESET
+    return Failure.OTHER
+
+
+@dataclass(frozen=True)
+class Backoff:
+    """연속 실패 횟수에 따라 지수적으로 늘어나는 대기 시간 (jitter 비율만큼 무작위로 줄임)"""
+    base: float
+    maximum: float
+    factor: float = 2.0
+    jitter: float = 0.5
+
+    def delay(self, failures, rng=random):
+        delay = min(self.maximum, self.base * self.factor ** max(failures - 1, 0))
+        return delay * (1.0 - self.jitter * rng.random())
+
+
+# 실패 종류별 기본 정책
+# - 연결 끊김은 새 연결로 바로 다시 보내면 되는 경우가 많아 짧게 시작
+# - DNS 실패는 금방 풀리지 않으므로 길게 기다림
+# - 오래 이어지는 장애는 서킷 브레이커가 맡으므로, 복구 직후 늦게 깨어나지 않도록 상한은 짧게 둠
+DEFAULT_POLICIES = {
+    Failure.DNS: Backoff(base=1.0, maximum=10.0),
+    Failure.RESET: Backoff(base=0.05, maximum=1.0),
+    Failure.TLS: Backoff(base=0.5, maximum=5.0),
+    Failure.TIMEOUT: Backoff(base=0.2, maximum=2.0),
+    Failure.SERVER_ERROR: Backoff(base=0.2, maximum=2.0),
+    Failure.OTHER: Backoff(base=1.0, maximum=5.0),
+}
+
+
+class CircuitBreaker:
+    """서버가 내려간 동안 전송을 멈추고 /index.do 같은 가벼운 요청으로 복구를 확인
+
+    OUTAGE_FAILURES 가 threshold 번 연달아 나오면 열림(open) 상태가 되어 전송을 멈춘다.
+    cooldown 이 지나면 probe() 를 한 번 보내 보고(half_open), 성공하면 닫히고(closed)
+    실패하면 cooldown 을 두 배로 늘려(최대 max_cooldown) 다시 기다린다.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, probe=None, threshold=5, cooldown=1.0, max_cooldown=30.0, clock=time.monotonic):
+        self.probe = probe
+        self.threshold = threshold
+        self.base_cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.clock = clock
+        self.state = self.CLOSED
+        self.failures = 0
+        self.cooldown = cooldown
+        self.opened_at = None
+        self._lock = threading.Lock()
+        self._report()
+
+    def _transition(self, state, reason):
+        # 잠금을 잡은 상태에서 호출
+        previous, self.state = self.state, state
+        if state == self.OPEN:
+            self.opened_at = self.clock()
+        elif state == self.CLOSED:
+            self.failures = 0
+            self.cooldown = self.base_cooldown
+        metrics.inc('sugang_circuit_transitions_total', to=state)
+        log_event('circuit', state=state, previous=previous, reason=reason,
+                  failures=self.failures, cooldown=round(self.cooldown, 3))
+        self._report()
+
+    def _report(self):
+        for state in (self.CLOSED, self.OPEN, self.HALF_OPEN):
+            metrics.set_gauge('sugang_circuit_state', 1 if state == self.state else 0, state=state)
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            if self.state == self.OPEN:
+                # 열리기 전에 보낸 요청이 늦게 성공한 경우 - 서버가 살아 있으므로 닫음
+                self._transition(self.CLOSED, 'success')
+
+    def record_failure(self, failure):
+        if failure not in OUTAGE_FAILURES:
+            return
+        with self._lock:
+            self.failures += 1
+            if self.state == self.CLOSED and self.failures >= self.threshold:
+                self._transition(self.OPEN, failure.value)
+
+    def remaining(self):
+        """전송을 다시 시도하기까지 남은 시간(초), 닫혀 있으면 0"""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return 0.0
+            if self.state == self.HALF_OPEN:
+                return None
+            return max(0.0, self.opened_at + self.cooldown - self.clock())
+
+    def try_probe(self):
+        """열린 상태에서 cooldown 이 지났으면 복구 확인 요청을 보내고 닫혔는지 돌려줌"""
+        with self._lock:
+            if self.state != self.OPEN or self.clock() < self.opened_at + self.cooldown:
+                return self.state == self.CLOSED
+            self._transition(self.HALF_OPEN, 'cooldown')
+        try:
+            ok = self.probe() if self.probe is not None else True
+        except Exception:
+            ok = False
+        metrics.inc('sugang_circuit_probes_total', result='ok' if ok else 'fail')
+        with self._lock:
+            if ok:
+                self._transition(self.CLOSED, 'probe')
+            else:
+                self.cooldown = min(self.max_cooldown, self.cooldown * 2)
+                self._transition(self.OPEN, 'probe_failed')
+            return ok
+
+    def wait(self, sleep=time.sleep, poll=0.05):
+        """닫힐 때까지 기다림 (한 스레드만 복구 확인 요청을 보내고 나머지는 결과를 기다림)"""
+        while True:
+            remaining = self.remaining()
+            if remaining == 0.0:
+                if self.try_probe() or self.state == self.CLOSED:
+                    return
+                continue
+            sleep(poll if remaining is None else min(remaining, 1.0))
+
+    async def wait_async(self, poll=0.05):
+        """비동기 루프용: 복구 확인 요청만 스레드에서 보내고 나머지는 이벤트 루프에서 기다림"""
+        import asyncio
+        while self.state != self.CLOSED:
+            remaining = self.remaining()
+            if remaining == 0.0:
+                await asyncio.to_thread(self.try_probe)
+            else:
+                await asyncio.sleep(poll if remaining is None else min(remaining, 1.0))
+
+
+class RetryPolicy:
+    """실패 종류별 백오프와 서킷 브레이커를 묶은 재시도 정책
+
+    record() 로 요청 결과를 알리면 다음 요청 전에 기다릴 시간을 돌려준다.
+    연속 실패 횟수는 종류별로 세고, 한 번이라도 성공하면 모두 0 으로 돌아간다.
+    """
+
+    def __init__(self, policies=None, breaker=None, rng=random):
+        self.policies = dict(DEFAULT_POLICIES, **(policies or {}))
+        self.breaker = breaker
+        self.rng = rng
+        self.streaks = {}
+        self._lock = threading.Lock()
+
+    def record(self, error=None, result=None):
+        """(실패 종류, 대기 시간) 을 돌려줌 - 실패가 아니면 (None, 0.0)"""
+        failure = classify(error, result)
+        if failure is None:
+            with self._lock:
+                self.streaks.clear()
+            if self.breaker is not None:
+                self.breaker.record_success()
+            return None, 0.0
+        with self._lock:
+            streak = self.streaks[failure] = self.streaks.get(failure, 0) + 1
+        delay = self.policies[failure].delay(streak, self.rng)
+        metrics.inc('sugang_failures_total', kind=failure.value)
+        metrics.observe('sugang_retry_backoff_seconds', delay)
+        if self.breaker is not None:
+            self.breaker.record_failure(failure)
+        return failure, delay
+
+    @property
+    def open(self):
+        """서킷 브레이커가 전송을 막고 있는지"""
+        return self.breaker is not None and self.breaker.state != CircuitBreaker.CLOSED
+
+    def wait(self):
+        if self.breaker is not None:
+            self.breaker.wait()
+
+    async def wait_async(self):
+        if self.breaker is not None:
+            await self.breaker.wait_async()
+
+
+def make_retry_policy(threshold, cooldown, probe=None):
+    """threshold 번 연속 장애성 실패면 전송을 멈추고 cooldown 초마다 probe 로 복구 확인 (0 이면 끄기)"""
+    breaker = CircuitBreaker(probe=probe, threshold=threshold, cooldown=cooldown) if threshold > 0 else None
+    return RetryPolicy(breaker=breaker)
@@ -0,0 +1,143 @@
+# scheduler.py
+
+import heapq
+import itertools
+import random
+import threading
+import time
+from response_parser import Outcome
+
+# 서버가 힘들어한다고 보는 응답 종류
+OVERLOAD_OUTCOMES = {Outcome.SERVER_ERROR}
+
+
+class FixedRateScheduler:
+    """고정된 초당 요청 수로 전송 시각을 배정하는 스케줄러"""
+
+    def __init__(self, rate, jitter=0.0, clock=time.monotonic, rng=random):
+        self._rate = rate
+        self.jitter = jitter
+        self.clock = clock
+        self.rng = rng
+        self._next = 0.0
+        self._lock = threading.Lock()
+        self._waiters = []
+        self._counter = itertools.count()
+        self._dispatcher = None
+
+    @property
+    def rate(self):
+        """현재 초당 요청 수 (0 이면 제한 없음)"""
+        return self._rate
+
+    @property
+    def ceiling(self):
+        """jitter 를 넣어도 넘지 않는 초당 요청 수 (고정 속도는 rate 자체)"""
+        return self._rate
+
+    def _interval(self):
+        rate = self.rate
+        if not rate:
+            return 0.0
+        interval = 1.0 / rate
+        if self.jitter:
+            # 일정한 간격이 드러나지 않도록 간격을 조금씩 흔들되, 상한 속도보다 촘촘해지지는 않게 함
+            interval *= self.rng.uniform(1.0 - self.jitter, 1.0 + self.jitter)
+            interval = max(interval, 1.0 / self.ceiling)
+        return interval
+
+    def reserve(self):
+        """다음 전송 슬롯을 예약하고 그때까지 남은 시간(초)을 돌려줌"""
+        with self._lock:
+            now = self.clock()
+            start = max(now, self._next)
+            self._next = start + self._interval()
+            return start - now
+
+    def wait(self):
+        """동기 루프용: 다음 슬롯까지 잠듦"""
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire(self, priority=0):
+        """비동기 루프용: 우선순위(작을수록 먼저) 순으로 슬롯을 받을 때까지 기다림"""
+        # 순차 실행에서는 asyncio 가 필요 없으므로 여기서 불러옴
+        import asyncio
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._counter), future))
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.create_task(self._dispatch())
+        await future
+
+    async def _dispatch(self):
+        import asyncio
+        while self._waiters:
+            delay = self.reserve()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            # 기다리다 취소된 시도는 건너뜀
+            while self._waiters and self._waiters[0][2].done():
+                heapq.heappop(self._waiters)
+            if self._waiters:
+                heapq.heappop(self._waiters)[2].set_result(None)
+
+    def observe(self, latency, result=None, error=False):
+        """응답 결과를 알려줌 (고정 속도 스케줄러는 무시)"""
+
+
+class AdaptiveScheduler(FixedRateScheduler):
+    """응답 지연과 오류에 따라 AIMD 로 전송 속도를 조절하는 스케줄러
+
+    정상 응답이 increase_interval 초 동안 이어지면 속도를 increase 만큼 올리고,
+    지연이 latency_target 을 넘거나 오류가 나면 decrease 배로 줄인다.
+    속도는 항상 [min_rate, max_rate] 안에 있으며 max_rate 가 호스트별 상한이다.
+    """
+
+    def __init__(self, initial_rate=0.5, min_rate=0.1, max_rate=2.0, increase=0.1,
+                 increase_interval=1.0, decrease=0.5, decrease_cooldown=2.0,
+                 latency_target=1.0, jitter=0.0, clock=time.monotonic, rng=random):
+        super().__init__(min(max(initial_rate, min_rate), max_rate), jitter, clock, rng)
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.increase_interval = increase_interval
+        self.decrease = decrease
+        self.decrease_cooldown = decrease_cooldown
+        self.latency_target = latency_target
+        self.increases = 0
+        self.decreases = 0
+        now = clock()
+        self._last_increase = now
+        self._last_decrease = now - decrease_cooldown
+
+    @property
+    def ceiling(self):
+        return self.max_rate
+
+    def observe(self, latency, result=None, error=False):
+        overloaded = (error or latency > self.latency_target
+                      or (result is not None and result.outcome in OVERLOAD_OUTCOMES))
+        with self._lock:
+            now = self.clock()
+            if overloaded:
+                # 한 번의 혼잡에 여러 응답이 몰려와도 한 번만 줄임
+                if now - self._last_decrease >= self.decrease_cooldown:
+                    self._rate = max(self.min_rate, self._rate * self.decrease)
+                    self._last_decrease = now
+                    self._last_increase = now
+                    self.decreases += 1
+            elif now - self._last_increase >= self.increase_interval:
+                self._rate = min(self.max_rate, self._rate + self.increase)
+                self._last_increase = now
+                self.increases += 1
+
+
+def make_scheduler(args):
+    """명령행 옵션(fixed_rate, jitter, initial_rate, min_rate, max_rate, latency_target)으로 스케줄러 생성"""
+    # 매크로 탐지 회피를 위해 전송 간격에 jitter 만큼 무작위성을 줌
+    if args.fixed_rate:
+        return FixedRateScheduler(args.fixed_rate, jitter=args.jitter)
+    return AdaptiveScheduler(initial_rate=args.initial_rate, min_rate=args.min_rate,
+                             max_rate=args.max_rate, latency_target=args.latency_target,
+                             jitter=args.jitter)
@@ -0,0 +1,156 @@
+# session_pool.py
+
+import itertools
+import threading
+import time
+import metrics
+from event_log import log_event
+
+HEALTHY = 'healthy'
+EXPIRED = 'expired'
+REFRESHING = 'refreshing'
+
+REFRESH_RETRY_DELAY = 2.0   # 재로그인 실패 후 다시 시도하기까지 기다리는 시간(초)
+REFRESH_ATTEMPTS = 3        # 세션 하나를 살리기 위해 재로그인을 시도하는 최대 횟수
+WAIT_FOR_HEALTHY = 2.0      # 살아 있는 세션이 하나도 없을 때 갱신을 기다리는 최대 시간(초)
+
+metrics.REGISTRY.describe('sugang_sessions', '상태별 세션 수')
+metrics.REGISTRY.describe('sugang_session_expired_total', '만료(-3000)로 교체된 세션 수')
+metrics.REGISTRY.describe('sugang_session_refreshes_total', '결과별 세션 재로그인 수')
+
+
+class Session:
+    """세션 쿠키 한 벌 (요청에 넣을 Cookie 줄을 미리 만들어 둠)"""
+
+    __slots__ = ('id', 'sgjsessionid', 'wmonid', 'cookie_line', 'state', 'uses', 'since')
+
+    def __init__(self, session_id, sgjsessionid, wmonid):
+        self.id = session_id
+        self.state = HEALTHY
+        self.uses = 0
+        self.update(sgjsessionid, wmonid)
+
+    def update(self, sgjsessionid, wmonid):
+        self.sgjsessionid = sgjsessionid
+        self.wmonid = wmonid
+        self.cookie_line = f'Cookie: WMONID={wmonid}; SGJSESSIONID={sgjsessionid}\r\n'.encode('latin-1')
+        self.since = time.time()
+
+    def __repr__(self):
+        return f'<Session {self.id} {self.state} {self.sgjsessionid[:8]}>'
+
+
+class SessionPool:
+    """같은 계정의 세션 여러 개를 돌려 쓰고, 만료된 세션은 백그라운드에서 다시 로그인
+
+    login 은 {'SGJSESSIONID', 'WMONID', ...} 를 돌려주는 함수이며, None 이면 (수동 토큰만 있는 경우)
+    만료된 세션을 되살리지 않는다.
+    """
+
+    def __init__(self, login=None, on_refresh=None):
+        self.login = login
+        self.on_refresh = on_refresh
+        self.sessions = []
+        self._cursor = itertools.count()
+        self._cond = threading.Condition()
+
+    def add(self, sgjsessionid, wmonid):
+        with self._cond:
+            session = Session(len(self.sessions) + 1, sgjsessionid, wmonid)
+            self.sessions.append(session)
+            self._cond.notify_all()
+        self._report()
+        return session
+
+    def fill(self, size):
+        """세션이 size 개가 될 때까지 로그인해서 채움 (실패한 수만큼 적게 채워짐)"""
+        while self.login is not None and len(self.sessions) < size:
+            try:
+                tokens = self.login()
+            except Exception as e:
+                print("추가 세션 로그인 실패:", e)
+                log_event('session_refresh', session=None, ok=False, error=str(e))
+                metrics.inc('sugang_session_refreshes_total', result='failed')
+                break
+            self.add(tokens['SGJSESSIONID'], tokens['WMONID'])
+        return len(self.sessions)
+
+    def fill_in_background(self, size):
+        thread = threading.Thread(target=self.fill, args=(size,), name='session-fill', daemon=True)
+        thread.start()
+        return thread
+
+    def healthy(self):
+        return [session for session in self.sessions if session.state == HEALTHY]
+
+    def next(self, wait=WAIT_FOR_HEALTHY):
+        """살아 있는 세션을 돌아가며 하나 고름 (모두 만료면 wait 초까지 갱신을 기다리고, 그래도 없으면 None)"""
+        deadline = time.monotonic() + wait
+        with self._cond:
+            while True:
+                healthy = self.healthy()
+                if healthy:
+                    session = healthy[next(self._cursor) % len(healthy)]
+                    session.uses += 1
+                    return session
+                remaining = deadline - time.monotonic()
+                refreshing = any(session.state == REFRESHING for session in self.sessions)
+                if remaining <= 0 or not refreshing:
+                    return None
+                self._cond.wait(remaining)
+
+    def mark_expired(self, session):
+        """-3000 을 받은 세션을 빼고 백그라운드 재로그인을 시작 (이미 처리 중이면 False)"""
+        with self._cond:
+            if session.state != HEALTHY:
+                return False
+            refresh = self.login is not None
+            session.state = REFRESHING if refresh else EXPIRED
+        metrics.inc('sugang_session_expired_total')
+        log_event('session_expired', session=session.id, healthy=len(self.healthy()))
+        self._report()
+        if refresh:
+            threading.Thread(target=self._refresh, args=(session,),
+                             name=f'session-refresh-{session.id}', daemon=True).start()
+        return True
+
+    def _refresh(self, session):
+        for attempt in range(1, REFRESH_ATTEMPTS + 1):
+            try:
+                tokens = self.login()
+            except Exception as e:
+                metrics.inc('sugang_session_refreshes_total', result='failed')
+                log_event('session_refresh', session=session.id, ok=False, attempt=attempt, error=str(e))
+                print(f"세션 {session.id} 갱신 실패:", e)
+                time.sleep(REFRESH_RETRY_DELAY * attempt)
+                continue
+            with self._cond:
+                session.update(tokens['SGJSESSIONID'], tokens['WMONID'])
+                session.state = HEALTHY
+                self._cond.notify_all()
+            metrics.inc('sugang_session_refreshes_total', result='ok')
+            log_event('session_refresh', session=session.id, ok=True, attempt=attempt)
+            print(f"세션 {session.id} 갱신 완료")
+            if self.on_refresh is not None:
+                self.on_refresh(tokens)
+            self._report()
+            return True
+        with self._cond:
+            session.state = EXPIRED
+            self._cond.notify_all()
+        self._report()
+        return False
+
+    def health(self):
+        """상태별 세션 수"""
+        counts = {HEALTHY: 0, EXPIRED: 0, REFRESHING: 0}
+        for session in self.sessions:
+            counts[session.state] += 1
+        return counts
+
+    def _report(self):
+        for state, count in self.health().items():
+            metrics.set_gauge('sugang_sessions', count, state=state)
+
+    def __len__(self):
+        return len(self.sessions)
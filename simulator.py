@@ -0,0 +1,516 @@
+# simulator.py
+"""
+수강신청 구간 시뮬레이터
+
+가상 시계 위에서 수강신청 구간을 실제보다 훨씬 빠르게 재현해 전송 속도/재시도 정책을 비교합니다.
+실제 실행과 같은 스케줄러(scheduler), 재시도 정책과 서킷 브레이커(retry_policy), 응답 파서
+(response_parser) 를 그대로 쓰고, 서버만 모형으로 바꿉니다. 모든 정책은 같은 난수로 만든
+같은 구간들을 재현하므로 정책 사이의 차이만 비교됩니다.
+
+요청 루프는 실제 코드를 부르지 않고 SimClient 가 따로 흉내 내며, 과목마다 분반 하나만 둡니다.
+그래서 분반 우선순위 목록, 거절된 분반만 빼고 다음 분반을 신청하는 동작
+(main.pending_divisions / drop_division), 한 과목의 분반을 한 번에 하나씩만 보내는 잠금은
+재현하지 않고, 다시 보내도 소용없는 거절을 받으면 과목 전체를 뺍니다 (분반이 하나일 때의
+실제 동작과 같음). 묶음 신청, 세션 풀, 헤징, 과목 목록 다시 읽기도 재현하지 않습니다.
+
+python simulator.py --policies fixed:0.5,fixed:2,aimd:0.5:2 --runs 1000 --duration 300 \\
+    --seat-releases 2 --grab-time 3 --random-slowdowns 2 --session-ttl 120
+python simulator.py --from-log logs/sugang_events.jsonl --policies aimd:0.5:2,aimd:0.5:2+nobreaker
+"""
+
+import argparse
+import heapq
+import itertools
+import json
+import math
+import random
+import sys
+from collections import deque
+from dataclasses import dataclass, field
+
+from response_parser import parse_response
+from retry_policy import CircuitBreaker, RetryPolicy
+from scheduler import AdaptiveScheduler, FixedRateScheduler
+
+# 모의 서버(test/mock_sugang_server.py)와 같은 응답 본문
+BODIES = {
+    'success': (200, b'{"ErrorCode": 0, "ErrorMsg": "", "dmResult": {"strRtnCd": "true"}}'),
+    'over_capacity': (200, '{"ErrorCode": -1, "ErrorMsg": "수강 제한 인원을 초과하였습니다."}'.encode()),
+    'already_registered': (200, '{"ErrorCode": -1, "ErrorMsg": "이미 신청한 과목입니다."}'.encode()),
+    'session_expired': (200, '{"ErrorCode": -3000, "ErrorMsg": "세션이 만료되었습니다. 다시 로그인하세요."}'.encode()),
+    'out_of_period': (200, '{"ErrorCode": -1, "ErrorMsg": "수강신청 기간이 아닙니다."}'.encode()),
+    'server_error': (503, b'service unavailable'),
+}
+
+
+def parse_latency(spec):
+    """모의 서버와 같은 지연 분포 문자열(밀리초)을 rng 를 받는 초 단위 샘플 함수로 변환"""
+    kind, *args = spec.split(':')
+    args = [float(a) / 1000 if i == 0 or kind == 'uniform' else float(a) for i, a in enumerate(args)]
+    if kind == 'const':
+        return lambda rng: args[0]
+    if kind == 'uniform':
+        return lambda rng: rng.uniform(args[0], args[1])
+    if kind == 'exp':
+        return lambda rng: rng.expovariate(1.0 / args[0])
+    if kind == 'lognormal':
+        return lambda rng: rng.lognormvariate(math.log(args[0]), args[1])
+    raise ValueError(f'알 수 없는 지연 분포: {spec}')
+
+
+def parse_windows(values):
+    """'시작-끝' 또는 '시작-끝:배율' 목록을 [(시작, 끝, 배율)] 로 변환"""
+    windows = []
+    for value in values or []:
+        span, _, factor = value.partition(':')
+        start, end = span.split('-')
+        windows.append((float(start), float(end), float(factor or 1.0)))
+    return windows
+
+
+@dataclass
+class Scenario:
+    """수강신청 구간 하나를 만드는 규칙 (모형으로 정하거나 이벤트 로그에서 읽음)"""
+    duration: float = 300.0
+    courses: list = field(default_factory=lambda: ['SIM0001'])
+    latency: object = parse_latency('lognormal:80:0.5')
+    seat_releases: int = 1           # 과목마다 구간 안에서 무작위로 나는 여석 수
+    seat_times: dict = None          # 과목별 고정 여석 발생 시각 (있으면 seat_releases 대신 사용)
+    grab_time: float = 2.0           # 다른 학생이 빈 자리를 가져가기까지 평균 시간(초, 0 이면 경쟁 없음)
+    slowdowns: list = field(default_factory=list)   # [(시작, 끝, 지연 배율)]
+    random_slowdowns: int = 0        # 구간마다 무작위로 넣을 지연 구간 수
+    slowdown_length: float = 15.0
+    slowdown_factor: float = 10.0
+    outages: list = field(default_factory=list)     # [(시작, 끝, _)] 모든 요청에 503
+    session_ttl: float = None        # 세션 유효 시간(초)
+    expiries: list = field(default_factory=list)    # 세션이 강제로 끊기는 시각
+    relogin: float = 1.5             # 세션 만료 후 다시 로그인하는 데 걸리는 시간(초)
+    reset_rate: float = 0.0          # 요청마다 연결이 끊길 확률
+
+    @classmethod
+    def from_events(cls, events, grab_time=2.0):
+        """이벤트 로그(attempt 이벤트)에서 응답 시간 분포, 여석 시각, 장애 구간, 세션 만료 시각을 뽑음"""
+        latencies, seat_times, courses = [], {}, []
+        error_seconds, expiries = set(), []
+        start = end = None
+        for event in events:
+            if event.get('kind') not in ('attempt', 'attempt_error'):
+                continue
+            ts = event['ts']
+            start = ts if start is None else start
+            end = ts
+            t = ts - start
+            course = event.get('course')
+            if course not in courses:
+                courses.append(course)
+            if event['kind'] == 'attempt_error':
+                error_seconds.add(int(t))
+                continue
+            latencies.append(event.get('elapsed', 0.0))
+            outcome = event.get('outcome')
+            if event.get('granted'):
+                seat_times.setdefault(course, [t])
+            elif outcome == 'server_error':
+                error_seconds.add(int(t))
+            elif outcome == 'session_expired' and (not expiries or t - expiries[-1] > 5.0):
+                expiries.append(t)
+        if start is None:
+            raise ValueError('이벤트 로그에 attempt 이벤트가 없습니다.')
+        # 오류가 난 초를 이어 붙여 장애 구간으로 만듦
+        outages = []
+        for second in sorted(error_seconds):
+            if outages and outages[-1][1] == second:
+                outages[-1] = (outages[-1][0], second + 1, 1.0)
+            else:
+                outages.append((second, second + 1, 1.0))
+        samples = latencies or [0.1]
+        return cls(duration=end - start + 1.0, courses=courses, latency=lambda rng: rng.choice(samples),
+                   seat_times={c: seat_times.get(c, []) for c in courses}, grab_time=grab_time,
+                   outages=outages, expiries=expiries)
+
+
+class SimServer:
+    """구간 하나 동안의 서버 모형 (여석, 다른 학생과의 경쟁, 세션, 지연, 장애)"""
+
+    def __init__(self, scenario, rng):
+        self.scenario = scenario
+        self.rng = rng
+        duration = scenario.duration
+        # 여석마다 (발생 시각, 다른 학생이 가져가는 시각)
+        self.seats = {}
+        for course in scenario.courses:
+            if scenario.seat_times is not None:
+                times = scenario.seat_times.get(course, [])
+            else:
+                times = sorted(rng.uniform(0, duration) for _ in range(scenario.seat_releases))
+            self.seats[course] = [[t, t + rng.expovariate(1.0 / scenario.grab_time) if scenario.grab_time else math.inf]
+                                  for t in times]
+        self.slowdowns = list(scenario.slowdowns)
+        for _ in range(scenario.random_slowdowns):
+            start = rng.uniform(0, duration)
+            self.slowdowns.append((start, start + scenario.slowdown_length, scenario.slowdown_factor))
+        self.registered = set()
+        self.won = {}   # 과목별로 내가 가져간 여석의 발생 시각
+        self.session_start = 0.0
+        self.refresh_at = None
+
+    def latency(self, t):
+        latency = self.scenario.latency(self.rng)
+        for start, end, factor in self.slowdowns:
+            if start <= t < end:
+                latency *= factor
+        return latency
+
+    def in_outage(self, t):
+        return any(start <= t < end for start, end, _ in self.scenario.outages)
+
+    def session_valid(self, t):
+        if self.refresh_at is not None:
+            if t < self.refresh_at:
+                return False
+            self.session_start, self.refresh_at = self.refresh_at, None
+        ttl = self.scenario.session_ttl
+        if ttl is not None and t >= self.session_start + ttl:
+            return False
+        return not any(self.session_start < e <= t for e in self.scenario.expiries)
+
+    def relogin(self, t):
+        # 실제 실행에서 세션 만료 응답을 받으면 백그라운드로 다시 로그인하는 것과 같음
+        if self.refresh_at is None:
+            self.refresh_at = t + self.scenario.relogin
+
+    def apply(self, t, course):
+        if self.in_outage(t):
+            return BODIES['server_error']
+        if not self.session_valid(t):
+            return BODIES['session_expired']
+        if t > self.scenario.duration:
+            return BODIES['out_of_period']
+        if course in self.registered:
+            return BODIES['already_registered']
+        for seat in self.seats.get(course, ()):
+            if seat[0] <= t < seat[1]:
+                seat[1] = t   # 내가 가져감
+                self.registered.add(course)
+                self.won[course] = seat[0]
+                return BODIES['success']
+        return BODIES['over_capacity']
+
+
+class VirtualClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class SimSemaphore:
+    """동시 요청 수 제한 (프로세스가 이 객체를 yield 하면 자리가 날 때까지 멈춤)"""
+
+    def __init__(self, value):
+        self.value = value
+        self.waiters = deque()
+
+
+class Simulation:
+    """프로세스(제너레이터)가 yield 한 시간만큼 가상 시계를 건너뛰며 실행하는 이산 사건 시뮬레이션"""
+
+    def __init__(self):
+        self.clock = VirtualClock()
+        self._queue = []
+        self._counter = itertools.count()
+
+    def spawn(self, process, delay=0.0):
+        heapq.heappush(self._queue, (self.clock.now + delay, next(self._counter), process))
+
+    def release(self, semaphore):
+        if semaphore.waiters:
+            self.spawn(semaphore.waiters.popleft())
+        else:
+            semaphore.value += 1
+
+    def run(self, until):
+        while self._queue:
+            t, _, process = heapq.heappop(self._queue)
+            if t > until:
+                break
+            self.clock.now = t
+            try:
+                step = next(process)
+            except StopIteration:
+                continue
+            if isinstance(step, SimSemaphore):
+                if step.value > 0:
+                    step.value -= 1
+                    self.spawn(process)
+                else:
+                    step.waiters.append(process)
+            else:
+                self.spawn(process, step)
+        self.clock.now = min(self.clock.now, until)
+
+
+@dataclass(frozen=True)
+class Policy:
+    """비교할 전송/재시도 정책
+
+    fixed:초당요청수 또는 aimd:시작속도:최대속도, 뒤에 +nobreaker(서킷 브레이커 끔),
+    +noretry(실패해도 바로 다음 슬롯에 다시 보냄, 예전 동작) 를 붙일 수 있다.
+    """
+    name: str
+    kind: str
+    rate: float
+    max_rate: float
+    retry: bool = True
+    breaker: bool = True
+
+    @classmethod
+    def parse(cls, spec):
+        base, *options = spec.split('+')
+        kind, *numbers = base.split(':')
+        numbers = [float(n) for n in numbers]
+        if kind == 'fixed':
+            rate, max_rate = (numbers or [1.0])[0], 0.0
+        elif kind == 'aimd':
+            rate, max_rate = (numbers + [0.5, 2.0][len(numbers):])[:2]
+        else:
+            raise ValueError(f'알 수 없는 정책: {spec}')
+        unknown = set(options) - {'nobreaker', 'noretry'}
+        if unknown:
+            raise ValueError(f'알 수 없는 정책 옵션: {sorted(unknown)}')
+        return cls(spec, kind, rate, max_rate, 'noretry' not in options, 'nobreaker' not in options)
+
+    def make_scheduler(self, clock, jitter, rng):
+        # scheduler.make_scheduler 와 같은 스케줄러를 가상 시계와 구간별 난수로 만듦
+        if self.kind == 'fixed':
+            return FixedRateScheduler(self.rate, jitter=jitter, clock=clock, rng=rng)
+        return AdaptiveScheduler(initial_rate=self.rate, max_rate=self.max_rate, jitter=jitter, clock=clock,
+                                 rng=rng)
+
+
+class SimClient:
+    """main.run_sequential, async_engine.run_engine 의 전송 순서(스케줄러 대기, 서킷 브레이커, 전송,
+    재시도 대기)를 가상 시계로 흉내 냄 - 분반 하나짜리 과목만 다룸 (모듈 설명의 한계 참고)"""
+
+    def __init__(self, sim, server, policy, rng, jitter=0.3, timeout=10.0, retry_delay=0.0, jitter_rng=None):
+        self.sim = sim
+        self.server = server
+        self.scheduler = policy.make_scheduler(sim.clock, jitter, jitter_rng or rng)
+        breaker = (CircuitBreaker(probe=lambda: not server.in_outage(sim.clock.now), clock=sim.clock)
+                   if policy.breaker else None)
+        self.retry = RetryPolicy(breaker=breaker, rng=rng) if policy.retry else None
+        self.rng = rng
+        self.timeout = timeout
+        self.retry_delay = retry_delay
+        self.pending = {course: 1 for course in server.scenario.courses}
+        self.granted_at = {}
+        self.requests = 0
+        self.probes = 0
+        self.errors = 0
+
+    def send(self, course):
+        """요청 하나를 보내고 (예외, 파싱 결과) 를 돌려줌"""
+        self.requests += 1
+        server, clock = self.server, self.sim.clock
+        latency = max(server.latency(clock.now), 1e-4)
+        if latency > self.timeout:
+            yield self.timeout
+            return TimeoutError('timed out'), None
+        yield latency / 2
+        if server.scenario.reset_rate and self.rng.random() < server.scenario.reset_rate:
+            return ConnectionResetError('connection reset'), None
+        status, body = server.apply(clock.now, course)
+        yield latency / 2
+        return None, parse_response(body, status)
+
+    def wait_breaker(self):
+        # CircuitBreaker.wait 와 같은 순서: cooldown 이 지나면 한 번 확인 요청, 아니면 기다림
+        breaker = self.retry.breaker
+        while breaker.state != CircuitBreaker.CLOSED:
+            remaining = breaker.remaining()
+            if remaining == 0.0:
+                self.probes += 1
+                yield self.server.latency(self.sim.clock.now)
+                breaker.try_probe()
+            else:
+                yield 0.05 if remaining is None else remaining
+
+    def attempt(self, course):
+        """요청 하나를 보내고 결과를 처리한 뒤 다음 요청 전에 기다릴 시간을 돌려줌"""
+        started = self.sim.clock.now
+        error, result = yield from self.send(course)
+        self.scheduler.observe(self.sim.clock.now - started, result, error=error is not None)
+        delay = 0.0
+        if self.retry is not None:
+            _, delay = self.retry.record(error=error, result=result)
+        if error is not None:
+            self.errors += 1
+            return delay
+        if result.outcome.value == 'session_expired':
+            self.server.relogin(self.sim.clock.now)
+        if result.granted:
+            self.granted_at.setdefault(course, self.sim.clock.now)
+            self.pending.pop(course, None)
+        elif not result.retry:
+            self.pending.pop(course, None)
+        return delay
+
+    def sequential(self):
+        while self.pending:
+            for course in list(self.pending):
+                if course not in self.pending:
+                    continue
+                delay = self.scheduler.reserve()
+                if delay > 0:
+                    yield delay
+                if self.retry is not None and self.retry.open:
+                    yield from self.wait_breaker()
+                delay = yield from self.attempt(course)
+                if delay:
+                    yield delay
+
+    def attempt_loop(self, course, semaphore):
+        while course in self.pending:
+            if self.retry is not None and self.retry.open:
+                yield from self.wait_breaker()
+            yield semaphore
+            delay = self.scheduler.reserve()
+            if delay > 0:
+                yield delay
+            try:
+                if course not in self.pending:
+                    return
+                backoff = yield from self.attempt(course)
+            finally:
+                self.sim.release(semaphore)
+            yield self.retry_delay + backoff
+
+
+def run_window(scenario, policy, seed, mode='sequential', concurrency=4, attempts=1, jitter=0.3,
+               timeout=10.0, retry_delay=0.0):
+    """구간 하나를 재현하고 (과목별 성공 시각, 과목별 여석 발생 시각, 요청 수, 확인 요청 수, 오류 수) 를 돌려줌"""
+    # 서버 쪽 난수는 정책과 무관하게 seed 로만 정해져 정책끼리 같은 구간을 비교함
+    server = SimServer(scenario, random.Random(seed))
+    client_rng = random.Random(seed + 1)
+    # 스케줄러 jitter 도 구간별 난수를 따로 써서 전역 random 상태는 건드리지 않음
+    sim = Simulation()
+    client = SimClient(sim, server, policy, client_rng, jitter, timeout, retry_delay,
+                       jitter_rng=random.Random(seed + 2))
+    if mode == 'sequential':
+        sim.spawn(client.sequential())
+    else:
+        semaphore = SimSemaphore(concurrency)
+        for course in scenario.courses:
+            for _ in range(attempts):
+                sim.spawn(client.attempt_loop(course, semaphore))
+    sim.run(scenario.duration)
+    return client.granted_at, server.won, client.requests, client.probes, client.errors
+
+
+def quantile(sorted_values, q):
+    if not sorted_values:
+        return None
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+def evaluate(scenario, policy, runs, seed=0, **options):
+    """정책 하나로 runs 개 구간을 재현하고 성공률, 성공까지 걸린 시간, 요청 수를 요약
+
+    time_to_seat_s 는 구간 시작부터, reaction_s 는 여석이 난 뒤부터 자리를 잡기까지의 시간이다.
+    """
+    times, reactions, requests, probes, errors, complete = [], [], [], 0, 0, 0
+    for run in range(runs):
+        granted_at, won, count, probe_count, error_count = run_window(
+            scenario, policy, seed * 1000003 + run * 7919, **options)
+        times.extend(granted_at.values())
+        reactions.extend(granted_at[c] - won[c] for c in granted_at if c in won)
+        requests.append(count)
+        probes += probe_count
+        errors += error_count
+        complete += len(granted_at) == len(scenario.courses)
+    times.sort()
+    reactions.sort()
+    requests.sort()
+    total_courses = runs * len(scenario.courses)
+    round3 = lambda v: round(v, 3) if v is not None else None
+    return {
+        'policy': policy.name,
+        'runs': runs,
+        'seat_rate': round(len(times) / total_courses, 4) if total_courses else None,
+        'all_seats_rate': round(complete / runs, 4) if runs else None,
+        'time_to_seat_s': {'p50': round3(quantile(times, 0.5)), 'p90': round3(quantile(times, 0.9)),
+                           'p99': round3(quantile(times, 0.99))},
+        'reaction_s': {'p50': round3(quantile(reactions, 0.5)), 'p90': round3(quantile(reactions, 0.9))},
+        'requests_per_window': {'mean': round(sum(requests) / runs, 1) if runs else None,
+                                'p50': quantile(requests, 0.5), 'max': requests[-1] if requests else None},
+        'requests_per_seat': round(sum(requests) / len(times), 1) if times else None,
+        'probes': probes,
+        'errors': errors,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='수강신청 구간 시뮬레이터 (가상 시계로 정책 비교)')
+    parser.add_argument('--policies', default='fixed:0.5,fixed:2,aimd:0.5:2',
+                        help='쉼표 구분 정책 목록 (fixed:속도, aimd:시작:최대, +nobreaker, +noretry)')
+    parser.add_argument('--runs', type=int, default=200, help='정책마다 재현할 구간 수')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--mode', choices=['sequential', 'async'], default='sequential')
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument('--attempts', type=int, default=1, help='async 에서 과목마다 동시에 진행할 시도 수')
+    parser.add_argument('--retry-delay', type=float, default=0.0, help='async 에서 같은 과목 재시도 간격(초)')
+    parser.add_argument('--jitter', type=float, default=0.3)
+    parser.add_argument('--timeout', type=float, default=10.0, help='요청별 제한 시간(초)')
+    parser.add_argument('--from-log', nargs='+', default=None, help='이 이벤트 로그에서 구간을 재현')
+    parser.add_argument('--duration', type=float, default=300.0, help='수강신청 구간 길이(초)')
+    parser.add_argument('--courses', type=int, default=3)
+    parser.add_argument('--latency', default='lognormal:80:0.5', help='응답 지연 분포 (밀리초, 모의 서버와 같은 형식)')
+    parser.add_argument('--seat-releases', type=int, default=1, help='과목마다 구간 안에서 나는 여석 수')
+    parser.add_argument('--grab-time', type=float, default=2.0, help='다른 학생이 빈 자리를 가져가는 평균 시간(초)')
+    parser.add_argument('--slowdown', action='append', metavar='시작-끝:배율', help='응답이 느려지는 구간')
+    parser.add_argument('--random-slowdowns', type=int, default=0, help='구간마다 무작위로 넣을 지연 구간 수')
+    parser.add_argument('--slowdown-length', type=float, default=15.0)
+    parser.add_argument('--slowdown-factor', type=float, default=10.0)
+    parser.add_argument('--outage', action='append', metavar='시작-끝', help='모든 요청에 503 을 돌려줄 구간(초)')
+    parser.add_argument('--session-ttl', type=float, default=None, help='세션 유효 시간(초)')
+    parser.add_argument('--relogin', type=float, default=1.5, help='세션 만료 후 다시 로그인하는 시간(초)')
+    parser.add_argument('--reset-rate', type=float, default=0.0, help='요청마다 연결이 끊길 확률')
+    parser.add_argument('--json', action='store_true', help='결과를 JSON 으로 출력')
+    args = parser.parse_args(argv)
+
+    if args.from_log:
+        from log_analyzer import log_files, read_events
+        scenario = Scenario.from_events(read_events(log_files(args.from_log)), grab_time=args.grab_time)
+    else:
+        scenario = Scenario(
+            duration=args.duration, courses=[f'SIM{i:04d}' for i in range(args.courses)],
+            latency=parse_latency(args.latency), seat_releases=args.seat_releases, grab_time=args.grab_time,
+            slowdowns=parse_windows(args.slowdown), random_slowdowns=args.random_slowdowns,
+            slowdown_length=args.slowdown_length, slowdown_factor=args.slowdown_factor,
+            outages=parse_windows(args.outage), session_ttl=args.session_ttl, relogin=args.relogin,
+            reset_rate=args.reset_rate)
+    options = dict(mode=args.mode, concurrency=args.concurrency, attempts=args.attempts, jitter=args.jitter,
+                   timeout=args.timeout, retry_delay=args.retry_delay)
+
+    results = [evaluate(scenario, Policy.parse(spec), args.runs, args.seed, **options)
+               for spec in args.policies.split(',')]
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+        return 0
+    print(f"구간 {args.runs}개 x {len(scenario.courses)}과목, 구간 길이 {scenario.duration:.0f}초 ({args.mode})\n")
+    print("성공 시각: 구간 시작부터, 반응: 여석이 난 뒤부터 자리를 잡기까지 (초)")
+    print(f"{'정책':<28}{'성공률':>8}{'전체성공':>9}{'성공p50':>9}{'성공p90':>9}{'반응p50':>9}{'반응p90':>9}"
+          f"{'요청/구간':>10}{'요청/성공':>10}{'확인':>7}{'오류':>7}")
+    for r in results:
+        t, reaction = r['time_to_seat_s'], r['reaction_s']
+        fmt = lambda v: f"{v:>9.2f}" if v is not None else f"{'-':>9}"
+        per_seat = f"{r['requests_per_seat']:>10.1f}" if r['requests_per_seat'] is not None else f"{'-':>10}"
+        print(f"{r['policy']:<28}{r['seat_rate']:>8.1%}{r['all_seats_rate']:>9.1%}{fmt(t['p50'])}{fmt(t['p90'])}"
+              f"{fmt(reaction['p50'])}{fmt(reaction['p90'])}{r['requests_per_window']['mean']:>10.1f}{per_seat}"
+              f"{r['probes']:>7}{r['errors']:>7}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
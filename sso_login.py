@@ -0,0 +1,198 @@
+# sso_login.py
+
+import json
+import os
+import threading
+import time
+import http.cookiejar
+import urllib.parse
+import urllib.request
+from html.parser import HTMLParser
+from event_log import log_event
+
+SSO_URL = "https://smsso.smu.ac.kr/svc/tk/Auth.do?ac=Y&RelayState=https%3A%2F%2Fsmsso.smu.ac.kr%2Fagree%2Fmain.jsp&ifa=N&id=sugang&"
+SUGANG_INDEX_URL = "https://sugang.smu.ac.kr/index.do"
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:134.0) Gecko/20100101 Firefox/134.0'
+
+CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".sugang_session.json")
+SESSION_LIFETIME = 30 * 60   # 서버 세션 유지 시간 추정치(초)
+MAX_FORM_HOPS = 5            # SSO 가 자동 제출시키는 중계 폼을 따라가는 최대 횟수
+TIMEOUT = 10
+
+
+class LoginError(Exception):
+    pass
+
+
+class _FormParser(HTMLParser):
+    """페이지 안의 form 과 input 값을 모음"""
+
+    def __init__(self):
+        super().__init__()
+        self.forms = []
+        self.auto_submit = False
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == "form":
+            self.forms.append({
+                "action": attrs.get("action") or "",
+                "method": (attrs.get("method") or "get").lower(),
+                "name": attrs.get("name") or attrs.get("id") or "",
+                "inputs": {},
+            })
+        elif tag == "input" and self.forms and attrs.get("name"):
+            self.forms[-1]["inputs"][attrs["name"]] = attrs.get("value") or ""
+        elif tag == "body" and "submit()" in (attrs.get("onload") or ""):
+            self.auto_submit = True
+
+    def handle_data(self, data):
+        if ".submit()" in data:
+            self.auto_submit = True
+
+
+def _parse_forms(html):
+    parser = _FormParser()
+    parser.feed(html)
+    return parser
+
+
+def _open(opener, url, fields=None, method="get"):
+    data = None
+    if fields is not None and method == "post":
+        data = urllib.parse.urlencode(fields).encode("utf-8")
+    elif fields is not None:
+        url = f"{url}{'&' if '?' in url else '?'}{urllib.parse.urlencode(fields)}"
+    request = urllib.request.Request(url, data=data, headers={"User-Agent": USER_AGENT})
+    with opener.open(request, timeout=TIMEOUT) as response:
+        charset = response.headers.get_content_charset() or "utf-8"
+        return response.read().decode(charset, "replace"), response.geturl()
+
+
+def _tokens(jar):
+    tokens = {"SGJSESSIONID": "", "WMONID": ""}
+    for cookie in jar:
+        if cookie.name in tokens:
+            tokens[cookie.name] = cookie.value
+    return tokens
+
+
+def login(user_id, password, sso_url=SSO_URL, sugang_index_url=SUGANG_INDEX_URL):
+    """브라우저 없이 SSO 로그인 후 {'SGJSESSIONID', 'WMONID', 'obtained', 'expires'} 를 돌려줌"""
+    jar = http.cookiejar.CookieJar()
+    opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(jar))
+
+    # 로그인 폼 (user_id / user_password 입력란이 있는 폼)
+    html, url = _open(opener, sso_url)
+    page = _parse_forms(html)
+    form = next((f for f in page.forms if "user_id" in f["inputs"] or f["name"] == "form"), None)
+    if form is None:
+        raise LoginError("로그인 폼을 찾지 못했습니다.")
+    fields = dict(form["inputs"])
+    fields["user_id"] = user_id
+    fields["user_password"] = password
+    html, url = _open(opener, urllib.parse.urljoin(url, form["action"] or url), fields, "post")
+
+    # SSO 가 돌려주는 자동 제출 폼(인증 토큰 중계)을 브라우저 대신 제출
+    for _ in range(MAX_FORM_HOPS):
+        if _tokens(jar)["SGJSESSIONID"]:
+            break
+        page = _parse_forms(html)
+        if any("user_password" in f["inputs"] for f in page.forms):
+            # 로그인 폼이 다시 나오면 인증 실패
+            raise LoginError("SSO 로그인에 실패했습니다. 아이디/비밀번호를 확인하세요.")
+        if not (page.auto_submit and page.forms):
+            break
+        relay = page.forms[0]
+        html, url = _open(opener, urllib.parse.urljoin(url, relay["action"] or url),
+                          relay["inputs"], relay["method"])
+
+    # 수강신청 서버 세션 쿠키가 아직 없으면 SSO 쿠키로 첫 페이지에 접속해 발급받음
+    if not _tokens(jar)["SGJSESSIONID"] or not _tokens(jar)["WMONID"]:
+        _open(opener, sugang_index_url)
+
+    tokens = _tokens(jar)
+    if not tokens["SGJSESSIONID"]:
+        raise LoginError("세션 쿠키(SGJSESSIONID)를 받지 못했습니다. 아이디/비밀번호를 확인하세요.")
+    now = time.time()
+    tokens["obtained"] = now
+    tokens["expires"] = now + SESSION_LIFETIME
+    return tokens
+
+
+def load_cached_tokens(path=CACHE_PATH):
+    """만료되지 않은 캐시 토큰을 돌려주고, 없으면 None"""
+    try:
+        with open(path, encoding="utf-8") as f:
+            tokens = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not tokens.get("SGJSESSIONID") or tokens.get("expires", 0) <= time.time():
+        return None
+    return tokens
+
+
+def save_tokens(tokens, path=CACHE_PATH):
+    # 임시 파일에 쓴 뒤 교체해서, 쓰는 도중 종료돼도 캐시가 깨지지 않게 함
+    tmp_path = f"{path}.tmp"
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(tokens, f)
+    os.replace(tmp_path, path)
+
+
+class SessionManager:
+    """SSO 토큰을 캐시하고, 세션 만료 시 백그라운드에서 다시 로그인함"""
+
+    def __init__(self, user_id, password, on_update=None, cache_path=CACHE_PATH,
+                 sso_url=SSO_URL, sugang_index_url=SUGANG_INDEX_URL):
+        self.user_id = user_id
+        self.password = password
+        self.on_update = on_update
+        self.cache_path = cache_path
+        self.sso_url = sso_url
+        self.sugang_index_url = sugang_index_url
+        self.tokens = None
+        self.refreshes = 0
+        self._lock = threading.Lock()
+        self._refreshing = None
+
+    def _apply(self, tokens):
+        self.tokens = tokens
+        if self.on_update is not None:
+            self.on_update(tokens["SGJSESSIONID"], tokens["WMONID"])
+
+    def start(self):
+        """캐시가 유효하면 그대로 쓰고, 아니면 로그인해서 토큰을 준비함"""
+        tokens = load_cached_tokens(self.cache_path)
+        if tokens is None:
+            return self.refresh()
+        self._apply(tokens)
+        return tokens
+
+    def refresh(self):
+        """다시 로그인해 새 토큰을 받고 캐시에 저장"""
+        with self._lock:
+            tokens = login(self.user_id, self.password, self.sso_url, self.sugang_index_url)
+            save_tokens(tokens, self.cache_path)
+            self.refreshes += 1
+            self._apply(tokens)
+            return tokens
+
+    def refresh_in_background(self):
+        """요청 루프를 멈추지 않고 재로그인 (이미 진행 중이면 새로 시작하지 않음)"""
+        if self._refreshing is not None and self._refreshing.is_alive():
+            return False
+
+        def run():
+            try:
+                self.refresh()
+                log_event('session_refresh', ok=True)
+                print("세션 갱신 완료")
+            except Exception as e:
+                log_event('session_refresh', ok=False, error=str(e))
+                print("세션 갱신 실패:", e)
+
+        self._refreshing = threading.Thread(target=run, name="session-refresh", daemon=True)
+        self._refreshing.start()
+        return True
@@ -0,0 +1,106 @@
+# state_store.py
+
+import os
+import sqlite3
+import threading
+import time
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".sugang_state.db")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS courses (
+    course  TEXT PRIMARY KEY,
+    div     INTEGER NOT NULL,
+    outcome TEXT NOT NULL,
+    code    INTEGER,
+    granted INTEGER NOT NULL,
+    updated REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS session (
+    key     TEXT PRIMARY KEY,
+    value   TEXT NOT NULL,
+    updated REAL NOT NULL
+);
+"""
+
+
+class StateStore:
+    """재시작해도 남아야 하는 상태 (성공한 과목, 과목별 마지막 응답 종류, 세션 토큰)
+
+    SQLite WAL 모드로 저장한다. 평소 기록은 synchronous=NORMAL (프로세스가 죽어도 유지),
+    성공 기록만 synchronous=FULL 로 디스크까지 내려 보내 정전에도 남게 한다.
+    응답 종류가 바뀔 때만 쓰므로 같은 응답이 반복되는 동안에는 디스크를 건드리지 않는다.
+    """
+
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = path
+        self.writes = 0
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(SCHEMA)
+        self._last = {
+            course: (div, outcome)
+            for course, div, outcome in self._db.execute("SELECT course, div, outcome FROM courses")
+        }
+
+    def record(self, course, div, result):
+        """과목의 마지막 응답을 기록 (이전과 같은 응답 종류면 쓰지 않음)"""
+        outcome = result.outcome.value
+        last = self._last.get(course)
+        # 후보 분반을 번갈아 보내는 동안 같은 거절이 이어지면 분반이 달라도 다시 쓰지 않음
+        if last == (div, outcome) or (last is not None and not result.granted and last[1] == outcome):
+            return False
+        with self._lock:
+            if result.granted:
+                self._db.execute("PRAGMA synchronous=FULL")
+            try:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO courses VALUES (?, ?, ?, ?, ?, ?)",
+                    (course, div, outcome, result.code, int(result.granted), time.time()))
+            finally:
+                if result.granted:
+                    self._db.execute("PRAGMA synchronous=NORMAL")
+            self._last[course] = (div, outcome)
+            self.writes += 1
+        return True
+
+    def granted(self):
+        """이미 신청에 성공한 과목 {학수번호: 분반}"""
+        with self._lock:
+            rows = self._db.execute("SELECT course, div FROM courses WHERE granted = 1").fetchall()
+        return dict(rows)
+
+    def last_outcomes(self):
+        """과목별 마지막 응답 {학수번호: (분반, 응답 종류, 기록 시각)}"""
+        with self._lock:
+            rows = self._db.execute("SELECT course, div, outcome, updated FROM courses").fetchall()
+        return {course: (div, outcome, updated) for course, div, outcome, updated in rows}
+
+    def save_session(self, sgjsessionid, wmonid):
+        now = time.time()
+        with self._lock:
+            self._db.executemany("INSERT OR REPLACE INTO session VALUES (?, ?, ?)",
+                                 [("SGJSESSIONID", sgjsessionid, now), ("WMONID", wmonid, now)])
+            self.writes += 1
+
+    def load_session(self):
+        """저장된 세션 토큰 {'SGJSESSIONID', 'WMONID', 'updated'} (없으면 None)"""
+        with self._lock:
+            rows = self._db.execute("SELECT key, value, updated FROM session").fetchall()
+        tokens = {key: value for key, value, _ in rows}
+        if not tokens.get("SGJSESSIONID"):
+            return None
+        tokens["updated"] = min(updated for _, _, updated in rows)
+        return tokens
+
+    def reset(self):
+        with self._lock:
+            self._db.execute("DELETE FROM courses")
+            self._db.execute("DELETE FROM session")
+            self._last.clear()
+
+    def close(self):
+        with self._lock:
+            self._db.close()
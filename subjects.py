@@ -1,5 +1,14 @@
 # subjects.py
 
+# 같은 폴더에 subjects.json 이 있으면 이 파일 대신 그 내용을 사용 (실행 중 수정해도 반영됨)
+# {"subject_data": {"HALB0001": 1, "HALB0002": [3, 1]}, "subject_priority": {"HALB0001": 0}}
+
 # "학수번호": 분반 형식으로 작성
+# 어느 분반이든 괜찮으면 "학수번호": [분반, 분반, ...] 처럼 원하는 순서대로 나열
+# (같은 바퀴에 모두 신청하고, 한 분반이 성공하면 나머지 분반 신청은 바로 멈춤)
 subject_data = {
 }
+
+# "학수번호": 우선순위 형식으로 작성 (작을수록 먼저 신청, 없으면 작성 순서)
+subject_priority = {
+}
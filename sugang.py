@@ -0,0 +1,112 @@
+# sugang.py
+"""
+수강신청 매크로 통합 실행기
+
+python -m sugang run [main.py 옵션]        수강신청 실행
+python -m sugang login [--id ID]           SSO 로그인 후 세션 토큰 캐시 저장
+python -m sugang bench <이름> [옵션]        벤치마크 실행 (methods, e2e, login, parser, cache, compression, batch, tls)
+python -m sugang analyze [로그 경로]        이벤트 로그 분석
+python -m sugang simulate [옵션]            가상 시계로 전송/재시도 정책 비교
+python -m sugang accounts [옵션]            계정 파일의 여러 계정을 한 프로세스에서 동시 실행
+
+하위 명령에 필요한 모듈은 그 명령을 실행할 때만 불러옵니다.
+"""
+
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# 벤치마크 이름: test 폴더의 스크립트
+BENCHMARKS = {
+    "methods": "server_request_method_test.py",
+    "e2e": "e2e_benchmark.py",
+    "login": "compare_moudule.py",
+    "parser": "response_parser_bench.py",
+    "cache": "request_cache_bench.py",
+    "compression": "compression_bench.py",
+    "batch": "batch_bench.py",
+    "tls": "tls_resume_bench.py",
+}
+
+
+def run_command(argv):
+    import main
+    return main.main(argv)
+
+
+def login_command(argv):
+    import argparse
+    import time
+    from credentials import SMU_ID, SMU_PW
+    from sso_login import CACHE_PATH, login, save_tokens
+
+    parser = argparse.ArgumentParser(prog="sugang login", description="SSO 로그인 후 세션 토큰을 캐시에 저장")
+    parser.add_argument("--id", default=SMU_ID, help="SSO 아이디 (기본값: credentials.py)")
+    parser.add_argument("--password", default=SMU_PW, help="SSO 비밀번호 (기본값: credentials.py)")
+    parser.add_argument("--cache", default=CACHE_PATH, help="토큰 캐시 경로 (빈 문자열이면 저장하지 않음)")
+    args = parser.parse_args(argv)
+    if not args.id or not args.password:
+        parser.error("credentials.py 의 SMU_ID/SMU_PW 를 채우거나 --id/--password 를 지정하세요.")
+
+    start = time.perf_counter()
+    tokens = login(args.id, args.password)
+    elapsed = time.perf_counter() - start
+    if args.cache:
+        save_tokens(tokens, args.cache)
+    print(f"로그인 성공 ({elapsed:.2f}초) - SGJSESSIONID: {tokens['SGJSESSIONID'][:10]}..., "
+          f"만료 예상: {time.strftime('%H:%M:%S', time.localtime(tokens['expires']))}")
+    return 0
+
+
+def bench_command(argv):
+    import runpy
+    if not argv or argv[0] not in BENCHMARKS:
+        print("사용법: python -m sugang bench <이름> [옵션]")
+        for name, script in BENCHMARKS.items():
+            print(f"  {name:<8} test/{script}")
+        return 2
+    path = os.path.join(ROOT, "test", BENCHMARKS[argv[0]])
+    sys.argv = [path] + argv[1:]
+    runpy.run_path(path, run_name="__main__")
+    return 0
+
+
+def analyze_command(argv):
+    import log_analyzer
+    return log_analyzer.main(argv)
+
+
+def simulate_command(argv):
+    import simulator
+    return simulator.main(argv)
+
+
+def accounts_command(argv):
+    import orchestrator
+    return orchestrator.main(argv)
+
+
+COMMANDS = {
+    "run": (run_command, "수강신청 실행"),
+    "login": (login_command, "SSO 로그인 후 세션 토큰 캐시 저장"),
+    "bench": (bench_command, "벤치마크 실행"),
+    "analyze": (analyze_command, "이벤트 로그 분석"),
+    "simulate": (simulate_command, "가상 시계로 전송/재시도 정책 비교"),
+    "accounts": (accounts_command, "여러 계정 동시 실행"),
+}
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] not in COMMANDS:
+        print("사용법: python -m sugang <명령> [옵션]\n")
+        for name, (_, description) in COMMANDS.items():
+            print(f"  {name:<8} {description}")
+        return 0 if argv[:1] in ([], ["-h"], ["--help"]) else 2
+    command, _ = COMMANDS[argv[0]]
+    return command(argv[1:]) or 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
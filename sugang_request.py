@@ -1,37 +1,341 @@
 # sugang_request.py
-import urllib.request
-import urllib.parse
+import time
+from dataclasses import dataclass, replace
+from connection_pool import ConnectionPool
 from credentials import SGJSESSIONID, WMONID
+from response_parser import ResponseParser, ParsedResponse, Outcome, parse_batch_response, BATCH_WIDE_OUTCOMES
+from request_cache import RequestCache
+from content_encoding import ACCEPT_ENCODING, make_decoder
+from dataset_codec import Dataset, encode
+import metrics
+from event_log import log_event
+
+SUGANG_HOST = 'sugang.smu.ac.kr'
+APLY_PATH = '/UcrTlsn/tlsnAplyDirect.do'
+APLY_DATASET = 'dmParamTlsnAplyDirect'         # 과목 하나 (dm)
+APLY_BATCH_DATASET = 'dsParamTlsnAplyDirect'   # 여러 과목 묶음 (ds)
+READ_CHUNK = 1024
 
 HEADERS = {
-    'Host': 'sugang.smu.ac.kr',
+    'Host': SUGANG_HOST,
     'Cookie': f'WMONID={WMONID}; SGJSESSIONID={SGJSESSIONID}',
     'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:134.0) Gecko/20100101 Firefox/134.0',
     'Accept': '*/*',
     'Accept-Language': 'ko-KR,ko;q=0.8,en-US;q=0.5,en;q=0.3',
-    'Accept-Encoding': 'gzip, deflate, br',
+    'Accept-Encoding': ACCEPT_ENCODING,   # br 은 brotli 가 설치된 경우에만
     'Referer': 'https://sugang.smu.ac.kr/index.do',
     'X-Requested-With': 'XMLHttpRequest',
     'Content-Type': 'application/x-www-form-urlencoded; charset=utf-8',
     'Origin': 'https://sugang.smu.ac.kr'
 }
 
-def send_sugang_request(course, div):
-    data = {
-        '_AUTH_MENU_KEY': '',
-        '@d1#strCampusRcd': 'CMN001.0001',
-        '@d1#strSbjNo': course,          # 학수번호
-        '@d1#strDivcls': str(div),        # 분반
-        '@d#': '@d1#',
-        '@d1#': 'dmParamTlsnAplyDirect',
-        '@d1#tp': 'dm'
+# 요청 하나가 응답 없이 기다릴 수 있는 최대 시간(초) - 연결, 전송, 읽기 각각에 적용
+REQUEST_TIMEOUT = 10.0
+
+# 반복문 전체에서 공유하는 keep-alive 연결 풀
+POOL = ConnectionPool(SUGANG_HOST, 443, use_tls=True, timeout=REQUEST_TIMEOUT)
+
+
+@dataclass
+class SugangResponse:
+    status: int
+    body: bytes
+    result: ParsedResponse
+    reused: bool      # keep-alive 연결을 재사용했는지 여부
+    elapsed: float    # 요청 전송부터 결과 확정까지 걸린 시간(초)
+    timings: dict     # 단계별 시간(초): dns, connect, tls, ttfb, body
+    attempt: int      # 이 과목에 보낸 몇 번째 요청인지 (1부터)
+    session: int = None   # 세션 풀을 쓸 때 요청에 사용한 세션 번호
+    hedge: str = None     # 백업 요청을 보냈으면 먼저 응답한 쪽 ('primary' 또는 'backup')
+
+    @property
+    def text(self):
+        return self.body.decode('utf-8', 'replace')
+
+
+def set_target(host, port=443, use_tls=True, ssl_context=None):
+    """요청 대상 서버를 바꿈 (로컬 모의 서버 벤치마크용, 자체 서명 인증서는 ssl_context 로)"""
+    global POOL
+    POOL.close()
+    POOL = ConnectionPool(host, port, use_tls=use_tls, maxsize=POOL.maxsize, timeout=REQUEST_TIMEOUT,
+                          ssl_context=ssl_context)
+    CACHE.set_headers(request_headers())
+    return POOL
+
+
+def set_request_timeout(seconds):
+    """요청별 제한 시간을 바꿈 (None 이면 제한 없음)"""
+    global REQUEST_TIMEOUT
+    REQUEST_TIMEOUT = POOL.timeout = seconds
+
+
+def set_session(sgjsessionid, wmonid):
+    """요청에 실어 보낼 세션 쿠키를 바꿈"""
+    HEADERS['Cookie'] = f'WMONID={wmonid}; SGJSESSIONID={sgjsessionid}'
+    CACHE.set_cookie(HEADERS['Cookie'])
+
+
+def prewarm(count=2):
+    """수강신청 서버에 연결을 미리 열어 둠 (동시 요청 수만큼 풀 크기를 늘림)"""
+    POOL.maxsize = max(POOL.maxsize, count)
+    return POOL.prewarm(count)
+
+
+def probe_server():
+    """서버가 다시 응답하는지 /index.do 에 HEAD 요청으로 가볍게 확인 (5xx 면 False)"""
+    response, _ = POOL.request('HEAD', '/index.do')
+    return response.status < 500
+
+
+def aply_row(course, div):
+    return {
+        'strCampusRcd': 'CMN001.0001',
+        'strSbjNo': course,          # 학수번호
+        'strDivcls': str(div),        # 분반
     }
-    data_encoded = urllib.parse.urlencode(data).encode('utf-8')
-    req = urllib.request.Request(
-        url='https://sugang.smu.ac.kr/UcrTlsn/tlsnAplyDirect.do',
-        data=data_encoded,
-        headers=HEADERS,
-        method='POST'
+
+
+def encode_form(course, div):
+    """신청 요청 본문을 만들어 둠 (미리 만들어 두면 전송 시점 비용이 줄어듦)"""
+    return encode([Dataset(APLY_DATASET, [aply_row(course, div)])], {'_AUTH_MENU_KEY': ''})
+
+
+def encode_batch_form(items):
+    """(학수번호, 분반) 여러 개를 한 요청에 담는 본문 (행마다 과목 하나인 ds)"""
+    rows = [aply_row(course, div) for course, div in items]
+    return encode([Dataset(APLY_BATCH_DATASET, rows, 'ds')], {'_AUTH_MENU_KEY': ''})
+
+
+def request_headers():
+    headers = POOL.base_headers()
+    headers.update(HEADERS)
+    return headers
+
+
+# 과목/분반별 요청 바이트열 캐시 (세션이 바뀌면 Cookie 줄만 다시 만듦)
+CACHE = RequestCache('POST', APLY_PATH, request_headers(), encode_form)
+
+# 과목별 전송 횟수 (재시도 횟수 = 전송 횟수 - 1)
+ATTEMPTS = {}
+
+# 여러 세션을 돌려 쓸 때의 세션 풀 (없으면 HEADERS 의 쿠키 하나만 사용)
+SESSIONS = None
+
+
+def set_session_pool(pool):
+    global SESSIONS
+    SESSIONS = pool
+
+
+# 늦은 요청에 백업 요청을 보내는 헤저 (없으면 요청마다 한 번만 보냄)
+HEDGER = None
+
+
+def set_hedging(hedger):
+    global HEDGER
+    HEDGER = hedger
+
+metrics.REGISTRY.describe('sugang_request_phase_seconds', '수강신청 요청 단계별 소요 시간')
+metrics.REGISTRY.describe('sugang_request_seconds', '수강신청 요청 전체 소요 시간')
+metrics.REGISTRY.describe('sugang_responses_total', '응답 종류별 수강신청 응답 수')
+metrics.REGISTRY.describe('sugang_request_errors_total', '예외 종류별 수강신청 요청 실패 수')
+metrics.REGISTRY.describe('sugang_attempts_until_success', '성공까지 보낸 요청 수')
+metrics.REGISTRY.describe('sugang_session_failovers_total', '세션 만료 직후 다른 세션으로 다시 보낸 요청 수')
+metrics.REGISTRY.describe('sugang_batch_requests_total', '여러 과목을 한 번에 보낸 묶음 요청 수')
+
+# 서버가 여러 과목 묶음 요청을 받는지 (None: 아직 모름, 첫 묶음 응답으로 정해짐)
+BATCH_SUPPORTED = None
+
+
+def prebuild_requests(items):
+    """(학수번호, 분반) 목록의 요청을 시작 시점에 미리 조립해 둠"""
+    return CACHE.prebuild(items)
+
+
+def record_metrics(response):
+    for phase, seconds in response.timings.items():
+        metrics.observe('sugang_request_phase_seconds', seconds, phase=phase)
+    metrics.observe('sugang_request_seconds', response.elapsed)
+    metrics.inc('sugang_responses_total', outcome=response.result.outcome.value,
+                reused=str(response.reused).lower())
+    if response.result.granted:
+        metrics.observe('sugang_attempts_until_success', response.attempt,
+                        buckets=(1, 2, 5, 10, 20, 50, 100, 200, 500, 1000))
+
+
+class NoSessionError(RuntimeError):
+    """계정 전용 세션 풀에 살아 있는 세션이 없음 (다른 계정 쿠키로 보내지 않도록 전송하지 않음)"""
+
+
+def send_sugang_request(course, div, sessions=None, account=None):
+    """sessions 를 주면 (여러 계정 동시 실행) 공용 세션 대신 그 계정의 세션 풀만 쓴다"""
+    key = course if account is None else (account, course)
+    attempt = ATTEMPTS[key] = ATTEMPTS.get(key, 0) + 1
+    start = time.perf_counter()
+    extra = {} if account is None else {'account': account}
+    try:
+        if HEDGER is None:
+            response = _send_with_session(course, div, start, attempt, sessions=sessions)
+        else:
+            response, winner = HEDGER.run(
+                lambda cancel: _send_with_session(course, div, start, attempt, cancel, sessions))
+            response.hedge = winner
+    except Exception as e:
+        metrics.inc('sugang_request_errors_total', error=type(e).__name__)
+        log_event('attempt_error', course=course, div=div, attempt=attempt,
+                  error=type(e).__name__, message=str(e), **extra)
+        raise
+    record_metrics(response)
+    result = response.result
+    log_event('attempt', course=course, div=div, attempt=attempt, status=response.status,
+              outcome=result.outcome.value, code=result.code, granted=result.granted,
+              reused=response.reused, elapsed=round(response.elapsed, 6),
+              timings={k: round(v, 6) for k, v in response.timings.items()},
+              session=response.session, hedge=response.hedge, **extra)
+    return response
+
+
+def send_sugang_batch(items):
+    """(학수번호, 분반) 여러 개를 한 요청으로 보내고 항목 순서대로 SugangResponse 목록을 돌려줌
+
+    서버가 묶음 요청을 받지 않으면 BATCH_SUPPORTED 를 False 로 두고 None 을 돌려준다.
+    이때는 호출한 쪽에서 과목마다 하나씩 다시 보내야 한다.
+    """
+    global BATCH_SUPPORTED
+    attempts = []
+    for course, _ in items:
+        attempts.append(ATTEMPTS.get(course, 0) + 1)
+        ATTEMPTS[course] = attempts[-1]
+    start = time.perf_counter()
+    body = encode_batch_form(items)
+    try:
+        response, results = _send_batch_with_session(body, len(items), start)
+    except Exception as e:
+        metrics.inc('sugang_request_errors_total', error=type(e).__name__)
+        for (course, div), attempt in zip(items, attempts):
+            log_event('attempt_error', course=course, div=div, attempt=attempt,
+                      error=type(e).__name__, message=str(e), batch=len(items))
+        raise
+    if results is None:
+        # 묶음 요청은 신청으로 처리되지 않았으므로 시도 횟수에서 뺌
+        for course, _ in items:
+            ATTEMPTS[course] -= 1
+            if not ATTEMPTS[course]:
+                del ATTEMPTS[course]
+        BATCH_SUPPORTED = False
+        metrics.inc('sugang_batch_requests_total', supported='false')
+        log_event('batch_unsupported', status=response.status, rows=len(items))
+        return None
+    if any(result.outcome not in BATCH_WIDE_OUTCOMES for result in results):
+        BATCH_SUPPORTED = True
+    # 세션 만료 등 요청 전체에 대한 응답이면 묶음 지원 여부는 아직 모르는 그대로 둠
+    metrics.inc('sugang_batch_requests_total',
+                supported='unknown' if BATCH_SUPPORTED is None else str(BATCH_SUPPORTED).lower())
+    responses = []
+    for (course, div), attempt, result in zip(items, attempts, results):
+        row = replace(response, result=result, attempt=attempt)
+        record_metrics(row)
+        log_event('attempt', course=course, div=div, attempt=attempt, status=row.status,
+                  outcome=result.outcome.value, code=result.code, granted=result.granted,
+                  reused=row.reused, elapsed=round(row.elapsed, 6),
+                  timings={k: round(v, 6) for k, v in row.timings.items()},
+                  session=row.session, batch=len(items))
+        responses.append(row)
+    return responses
+
+
+def _send_batch_with_session(body, count, start):
+    pool = SESSIONS
+    if pool is None:
+        response = _send_full(CACHE.payload_for(body), start)
+        return response, parse_batch_response(response.body, response.status, count)
+    # 모든 행이 세션 만료면 그 세션을 빼고 다른 세션으로 한 번 더 보냄
+    for _ in range(len(pool) + 1):
+        session = pool.next()
+        response = _send_full(CACHE.payload_for(body, session and session.cookie_line), start)
+        results = parse_batch_response(response.body, response.status, count)
+        if session is None:
+            return response, results
+        response.session = session.id
+        if results is None or any(r.outcome != Outcome.SESSION_EXPIRED for r in results):
+            return response, results
+        pool.mark_expired(session)
+        metrics.inc('sugang_session_failovers_total')
+    return response, results
+
+
+def _send_full(payload, start):
+    """응답 본문을 끝까지 읽음 (행별 결과가 모두 필요한 묶음 요청용, result 는 비워 둠)"""
+    with POOL.open_raw('POST', payload) as response:
+        headers_at = time.perf_counter()
+        decoder = make_decoder(response.getheader('Content-Encoding'))
+        body = response.read()
+        if decoder is not None:
+            body = decoder.decompress(body) + decoder.flush()
+        done = time.perf_counter()
+    return SugangResponse(
+        status=response.status,
+        body=body,
+        result=None,
+        reused=response.reused,
+        elapsed=done - start,
+        timings=dict(response.timings, body=done - headers_at),
+        attempt=0
+    )
+
+
+def _send_with_session(course, div, start, attempt, cancel=None, sessions=None):
+    pool = SESSIONS if sessions is None else sessions
+    if pool is None:
+        return _send(CACHE.get(course, div), start, attempt, cancel)
+    # 세션 만료(-3000)가 오면 그 세션을 빼고 바로 다른 세션으로 다시 보냄
+    # (모두 만료되면 마지막 한 번은 pool.next() 가 갱신을 기다림)
+    for _ in range(len(pool) + 1):
+        session = pool.next()
+        if session is None:
+            if sessions is not None:
+                raise NoSessionError(f'{course}: 이 계정에 살아 있는 세션이 없습니다.')
+            return _send(CACHE.get(course, div), start, attempt, cancel)
+        response = _send(CACHE.get(course, div, session.cookie_line), start, attempt, cancel)
+        response.session = session.id
+        if response.result.outcome != Outcome.SESSION_EXPIRED:
+            return response
+        pool.mark_expired(session)
+        metrics.inc('sugang_session_failovers_total')
+    return response
+
+
+def _send(payload, start, attempt, cancel=None):
+    with POOL.open_raw('POST', payload, cancel) as response:
+        headers_at = time.perf_counter()
+        parser = ResponseParser(response.status)
+        # 압축된 응답은 도착한 조각마다 풀어서 파서에 넘김
+        decoder = make_decoder(response.getheader('Content-Encoding'))
+        # 결과가 정해지면 파싱을 멈추고, 연결 재사용을 위해 남은 본문만 비워둠
+        while True:
+            chunk = response.read1(READ_CHUNK)
+            if not chunk:
+                if decoder is not None:
+                    parser.feed(decoder.flush())
+                result = parser.finish()
+                break
+            if decoder is not None:
+                chunk = decoder.decompress(chunk)
+            result = parser.feed(chunk)
+            if result is not None:
+                break
+        done = time.perf_counter()
+        rest = response.read()
+        # 본문을 다 받은 뒤 파서가 멈췄어도 해제기에 남은 꼬리가 있으므로 항상 flush
+        if decoder is not None:
+            rest = (decoder.decompress(rest) if rest else b'') + decoder.flush()
+    timings = dict(response.timings, body=done - headers_at)
+    return SugangResponse(
+        status=response.status,
+        body=parser.buffer + rest,
+        result=result,
+        reused=response.reused,
+        elapsed=done - start,
+        timings=timings,
+        attempt=attempt
     )
-    with urllib.request.urlopen(req) as response:
-        return response.read().decode('utf-8')
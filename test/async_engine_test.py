@@ -0,0 +1,56 @@
+"""
+비동기 신청 엔진 테스트
+
+한 과목에 시도를 여러 개 두었을 때 한 시도가 성공하면, 스레드 풀에서 차례를 기다리던
+나머지 시도의 요청이 서버로 나가지 않는지 가짜 전송 함수로 확인합니다.
+pytest 로 실행하거나 직접 실행할 수 있습니다:
+python test/async_engine_test.py
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from async_engine import run_engine
+from response_parser import parse_response
+from scheduler import FixedRateScheduler
+
+GRANTED = parse_response('{"ErrorCode":0,"ErrorMsg":"","dmResult":{"strRtnCd":"true"}}')
+OVER = parse_response('{"ErrorCode":-1,"ErrorMsg":"수강 제한 인원을 초과하였습니다."}')
+
+
+def test_no_sends_after_success():
+    sent = []
+    lock = threading.Lock()
+
+    def send(course, div):
+        with lock:
+            sent.append((course, div))
+            result = GRANTED if course == "HALB0001" else OVER
+        time.sleep(0.02)
+        return SimpleNamespace(result=result, reused=True, elapsed=0.02)
+
+    async def main():
+        # 작업 스레드를 하나만 두어 나머지 시도의 전송이 스레드 풀 대기열에 쌓이게 함
+        executor = ThreadPoolExecutor(1)
+        asyncio.get_running_loop().set_default_executor(executor)
+        subject_data = {"HALB0001": 1}
+        await run_engine(subject_data, lambda c, d, r: r.granted, concurrency=4,
+                         scheduler=FixedRateScheduler(0), attempts_per_course=4, retry_delay=0.0, send=send)
+        executor.shutdown(wait=True)
+        return subject_data
+
+    assert asyncio.run(asyncio.wait_for(main(), 5)) == {}
+    # 성공한 뒤 대기열에 있던 세 시도는 보내지 않음
+    assert sent == [("HALB0001", 1)], sent
+
+
+if __name__ == "__main__":
+    test_no_sends_after_success()
+    print("통과")
@@ -0,0 +1,113 @@
+"""
+묶음 신청 왕복 횟수 벤치마크
+
+과목 여러 개를 한 바퀴 신청할 때 과목마다 한 요청씩 보내는 방식과, 데이터셋(ds) 한 개에
+모든 과목을 담아 한 요청으로 보내는 방식의 바퀴당 왕복 횟수와 바퀴 시간을 비교합니다.
+모의 서버가 묶음 신청을 받지 않는 경우(--batch 없이 실행)에 과목마다 따로 보내는 쪽으로
+돌아가는 비용도 함께 잽니다.
+
+python test/batch_bench.py --courses 6 --passes 50 --latency lognormal:20:0.3
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import sugang_request
+from dataset_codec import decode
+from mock_sugang_server import MockSugangServer
+
+
+def percentile(sorted_values, q):
+    # 최근접 순위 방식 백분위수
+    index = max(0, min(len(sorted_values) - 1, int(round(q / 100.0 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+def one_pass(items, batch):
+    """한 바퀴 신청 (묶음을 받지 않는 서버면 과목마다 따로)"""
+    if batch and sugang_request.BATCH_SUPPORTED is not False:
+        responses = sugang_request.send_sugang_batch(items)
+        if responses is not None:
+            return responses
+    return [sugang_request.send_sugang_request(course, div) for course, div in items]
+
+
+def run_case(name, items, passes, latency, server_batch, client_batch):
+    with MockSugangServer(latency=latency, batch=server_batch) as server:
+        host, port = server.address
+        sugang_request.set_target(host, port, use_tls=False)
+        sugang_request.set_session("bench", "bench")
+        sugang_request.BATCH_SUPPORTED = None
+        samples = []
+        for _ in range(passes):
+            start = time.perf_counter()
+            responses = one_pass(items, client_batch)
+            samples.append((time.perf_counter() - start) * 1000)
+            # 좌석이 없으므로 모든 과목이 인원 초과로 와야 함 (행이 섞이면 결과가 달라짐)
+            assert [r.result.outcome.value for r in responses] == ["over_capacity"] * len(items), name
+        round_trips, applied = server.state.round_trips, server.state.requests
+    samples.sort()
+    return {
+        "case": name,
+        "round_trips_per_pass": round_trips / passes,
+        "applied_per_pass": applied / passes,
+        "pass_p50_ms": percentile(samples, 50),
+        "pass_p99_ms": percentile(samples, 99),
+    }
+
+
+def codec_cost(items, iterations):
+    """본문 인코딩/디코딩에 드는 시간 (요청 하나당 마이크로초)"""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        body = sugang_request.encode_batch_form(items)
+    encode_us = (time.perf_counter() - start) / iterations * 1e6
+    start = time.perf_counter()
+    for _ in range(iterations):
+        decode(body)
+    decode_us = (time.perf_counter() - start) / iterations * 1e6
+    return {"rows": len(items), "body_bytes": len(body), "encode_us": encode_us, "decode_us": decode_us}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="묶음 신청 왕복 횟수 벤치마크")
+    parser.add_argument("--courses", type=int, default=6, help="한 바퀴에 신청할 과목 수")
+    parser.add_argument("--passes", type=int, default=50)
+    parser.add_argument("--latency", default="lognormal:20:0.3", help="모의 서버 응답 지연 분포 (밀리초)")
+    parser.add_argument("--output", default=None, help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    items = [(f"BENCH{i:04d}", 1) for i in range(args.courses)]
+    cases = [
+        ("과목마다 따로", True, False),
+        ("묶음", True, True),
+        ("묶음 거절 -> 따로", False, True),
+    ]
+    results = []
+    print(f"과목 {args.courses}개, {args.passes}바퀴, 지연 {args.latency}")
+    print(f"{'방식':<16}{'왕복/바퀴':>10}{'신청/바퀴':>10}{'p50ms':>10}{'p99ms':>10}")
+    for name, server_batch, client_batch in cases:
+        row = run_case(name, items, args.passes, args.latency, server_batch, client_batch)
+        results.append(row)
+        print(f"{name:<16}{row['round_trips_per_pass']:>10.2f}{row['applied_per_pass']:>10.2f}"
+              f"{row['pass_p50_ms']:>10.1f}{row['pass_p99_ms']:>10.1f}")
+
+    codec = codec_cost(items, 2000)
+    print(f"\n본문 {codec['body_bytes']}바이트 ({codec['rows']}행): "
+          f"인코딩 {codec['encode_us']:.1f}us, 디코딩 {codec['decode_us']:.1f}us")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"python": platform.python_version(), "config": vars(args), "results": results,
+                       "codec": codec}, f, ensure_ascii=False, indent=2)
+        print(f"결과 저장: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+서버 시각 동기화 테스트
+
+모의 서버 시계를 알려진 만큼 어긋나게 두고 estimate_offset 이 돌려준 오차 범위 안에서
+그 차이를 맞히는지, Date 헤더와 수강신청 시작 시각 문자열을 올바로 읽고 잘못된 값은 거부하는지
+확인합니다.
+pytest 로 실행하거나 직접 실행할 수 있습니다:
+python test/clock_sync_test.py
+"""
+
+import os
+import sys
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from clock_sync import estimate_offset, parse_server_time, probe_date
+from mock_sugang_server import MockSugangServer, use_target
+
+
+def test_offset_within_error_bound():
+    clock_offset = 42.3
+    with MockSugangServer(clock_offset=clock_offset) as server, use_target(server) as pool:
+        estimate = estimate_offset(pool, probes=3)
+    # Date 헤더는 초 단위라 첫 측정의 오차는 0.5초 남짓이고, 이후 측정으로 좁혀짐
+    assert estimate.probes == 3 and 0 < estimate.error < 0.6
+    assert abs(estimate.offset - clock_offset) <= estimate.error + 0.005
+
+
+class FakeResponse:
+    def __init__(self, date):
+        self.date = date
+
+    def getheader(self, name):
+        return self.date if name == "Date" else None
+
+
+class FakePool:
+    def __init__(self, date):
+        self.date = date
+
+    def request(self, method, path, headers=None):
+        return FakeResponse(self.date), None
+
+
+def test_probe_date_header():
+    t0, t1, date = probe_date(FakePool("Mon, 10 Feb 2025 01:00:00 GMT"))
+    assert t0 <= t1 and date == datetime(2025, 2, 10, 1, 0, tzinfo=timezone.utc).timestamp()
+    for header, error in (("not a date", ValueError), (None, RuntimeError)):
+        try:
+            probe_date(FakePool(header))
+        except error:
+            continue
+        raise AssertionError(f"잘못된 Date 헤더를 받아들였습니다: {header!r}")
+
+
+def test_parse_server_time():
+    expected = datetime(2025, 2, 10, 1, 0, tzinfo=timezone.utc).timestamp()
+    # 시간대가 없으면 한국 시간
+    assert parse_server_time("2025-02-10 10:00:00") == expected
+    assert parse_server_time("2025-02-10 10:00:00.250000") == expected + 0.25
+    assert parse_server_time("2025-02-10T01:00:00+00:00") == expected
+    for text in ("2025-02-10 25:00:00", "10:00:00", ""):
+        try:
+            parse_server_time(text)
+        except ValueError:
+            continue
+        raise AssertionError(f"잘못된 시각을 받아들였습니다: {text!r}")
+
+
+if __name__ == "__main__":
+    test_offset_within_error_bound()
+    test_probe_date_header()
+    test_parse_server_time()
+    print("통과")
@@ -7,20 +7,28 @@
 3. Requests-HTML 방식
 4. HTTPX + PyPpeteer 방식
 5. MechanicalSoup 방식
+6. 브라우저 없는 HTTP SSO 방식 (sso_login.py)
 
 먼저 필요한 패키지를 설치하세요:
 pip install selenium webdriver-manager playwright requests-html pyppeteer httpx mechanicalsoup async-timeout
 
+방식마다 새 파이썬 프로세스에서 cold 실행(모듈 import, 브라우저 기동 포함) 1회와
+warm 실행 여러 회를 따로 재고, 평균/중앙값/표준편차/95% 신뢰구간과 최대 RSS 를 보여줍니다.
+python test/compare_moudule.py --local --runs 10 --warm 3 --output login_bench.json
+python test/compare_moudule.py --methods http_sso,mechanicalsoup --runs 5
 """
 
 import time
 import asyncio
 import urllib.request
 import urllib.parse
-import requests
 import json
+import os
+import sys
 from datetime import datetime
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
 # 기본 설정
 CONFIG = {
     "ID": "202010861",
@@ -28,6 +36,10 @@ CONFIG = {
     "DEBUG": True,
 }
 
+# 로그인 대상 (--local 로 실행하면 자식 프로세스에 모의 서버 주소가 환경 변수로 전달됨)
+SSO_URL = os.environ.get("SUGANG_SSO_URL", "https://smsso.smu.ac.kr/svc/tk/Auth.do?ac=Y&RelayState=https%3A%2F%2Fsmsso.smu.ac.kr%2Fagree%2Fmain.jsp&ifa=N&id=sugang&")
+SUGANG_INDEX_URL = os.environ.get("SUGANG_INDEX_URL", "https://sugang.smu.ac.kr/index.do")
+
 # 세션 상태 관리
 SESSION = {
     "SGJSESSIONID": "",
@@ -90,8 +102,7 @@ def selenium_login():
         tokens = {"SGJSESSIONID": "", "WMONID": ""}
 
         # 로그인 시도
-        sso_url = "https://smsso.smu.ac.kr/svc/tk/Auth.do?ac=Y&RelayState=https%3A%2F%2Fsmsso.smu.ac.kr%2Fagree%2Fmain.jsp&ifa=N&id=sugang&"
-        driver.get(sso_url)
+        driver.get(SSO_URL)
 
         # 로그인 폼 채우기
         wait = WebDriverWait(driver, 5)
@@ -154,7 +165,7 @@ async def playwright_login():
             page = await context.new_page()
 
             # 로그인 페이지 접속
-            await page.goto("https://smsso.smu.ac.kr/svc/tk/Auth.do?ac=Y&RelayState=https%3A%2F%2Fsmsso.smu.ac.kr%2Fagree%2Fmain.jsp&ifa=N&id=sugang&")
+            await page.goto(SSO_URL)
 
             # 로그인 폼 채우기
             await page.fill('#user_id', CONFIG["ID"])
@@ -205,7 +216,7 @@ async def requests_html_login():
         session = AsyncHTMLSession()
 
         # 로그인 페이지 접속
-        r = await session.get("https://smsso.smu.ac.kr/svc/tk/Auth.do?ac=Y&RelayState=https%3A%2F%2Fsmsso.smu.ac.kr%2Fagree%2Fmain.jsp&ifa=N&id=sugang&")
+        r = await session.get(SSO_URL)
 
         # 자바스크립트 렌더링 - 비동기 버전
         await r.html.arender(sleep=1)
@@ -257,7 +268,7 @@ async def httpx_pyppeteer_login():
         page = await browser.newPage()
 
         # 로그인 페이지 접속
-        await page.goto("https://smsso.smu.ac.kr/svc/tk/Auth.do?ac=Y&RelayState=https%3A%2F%2Fsmsso.smu.ac.kr%2Fagree%2Fmain.jsp&ifa=N&id=sugang&")
+        await page.goto(SSO_URL)
 
         # 로그인 폼 채우기
         await page.type('#user_id', CONFIG["ID"])
@@ -285,13 +296,12 @@ async def httpx_pyppeteer_login():
         if tokens["SGJSESSIONID"] and tokens["WMONID"]:
             async with httpx.AsyncClient() as client:
                 headers = {
-                    'Host': 'sugang.smu.ac.kr',
                     'Cookie': f'WMONID={tokens["WMONID"]}; SGJSESSIONID={tokens["SGJSESSIONID"]}',
                     'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
                 }
 
                 response = await client.head(
-                    'https://sugang.smu.ac.kr/index.do',
+                    SUGANG_INDEX_URL,
                     headers=headers,
                     timeout=2
                 )
@@ -325,7 +335,7 @@ def mechanicalsoup_login():
         browser = mechanicalsoup.StatefulBrowser()
 
         # 로그인 페이지 접속
-        browser.open("https://smsso.smu.ac.kr/svc/tk/Auth.do?ac=Y&RelayState=https%3A%2F%2Fsmsso.smu.ac.kr%2Fagree%2Fmain.jsp&ifa=N&id=sugang&")
+        browser.open(SSO_URL)
 
         # 자바스크립트 로그인 폼 제출 시도 (직접적인 JS 실행은 지원하지 않음)
         # 대신 HTML 폼 제출 시도
@@ -359,58 +369,195 @@ def mechanicalsoup_login():
         log(f"MechanicalSoup 오류: {str(e)}")
         return save_result("MechanicalSoup", elapsed_time, False)
 
-# =============== 성능 비교 메인 함수 ===============
-async def compare_login_methods():
-    print("\n" + "="*50)
-    print("상명대학교 로그인 세션 획득 성능 비교")
-    print("="*50)
+# =============== 6. HTTP SSO 방식 ===============
+def http_sso_login():
+    from sso_login import login
+
+    log("HTTP SSO 방식 세션 획득 시작...")
+    start_time = time.time()
+
+    try:
+        # 브라우저 없이 로그인 폼 제출과 중계 폼 제출만 HTTP 로 수행
+        tokens = login(CONFIG["ID"], CONFIG["PW"], SSO_URL, SUGANG_INDEX_URL)
+        tokens = {"SGJSESSIONID": tokens["SGJSESSIONID"], "WMONID": tokens["WMONID"]}
+
+        success = bool(tokens["SGJSESSIONID"] and tokens["WMONID"])
+        elapsed_time = time.time() - start_time
+
+        if success:
+            log(f"HTTP SSO 세션 획득 완료! ({elapsed_time:.3f}초)")
+        else:
+            log(f"HTTP SSO 세션 획득 실패! ({elapsed_time:.3f}초)")
+
+        return save_result("HTTP SSO", elapsed_time, success, tokens if success else None)
 
-    results = []
+    except Exception as e:
+        elapsed_time = time.time() - start_time
+        log(f"HTTP SSO 오류: {str(e)}")
+        return save_result("HTTP SSO", elapsed_time, False)
 
-    # 1. 셀레니움 방식
-    results.append(selenium_login())
+# =============== 성능 비교 메인 함수 ===============
+# 방식 이름: (로그인 함수, 비동기 여부)
+METHODS = {
+    "selenium": (selenium_login, False),
+    "playwright": (playwright_login, True),
+    "requests_html": (requests_html_login, True),
+    "httpx_pyppeteer": (httpx_pyppeteer_login, True),
+    "mechanicalsoup": (mechanicalsoup_login, False),
+    "http_sso": (http_sso_login, False),
+}
 
-    # 2. Playwright 방식 (비동기)
-    results.append(await playwright_login())
+# 95% 신뢰구간용 t 분포 임계값 (자유도 1~30, 그 이상은 정규 근사)
+T_95 = [12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+        2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+        2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042]
+
+
+def run_child(method, warm_runs):
+    """자식 프로세스 안에서 한 방식을 cold 1회 + warm warm_runs 회 실행하고 결과를 JSON 한 줄로 출력"""
+    import contextlib
+    func, is_async = METHODS[method]
+    timings = []
+    success = True
+    # 각 방식이 찍는 로그는 stderr 로 돌리고 stdout 에는 결과만 남김
+    with contextlib.redirect_stdout(sys.stderr):
+        for _ in range(1 + warm_runs):
+            start = time.perf_counter()
+            result = asyncio.run(func()) if is_async else func()
+            timings.append(time.perf_counter() - start)
+            success = success and bool(result and result["success"])
+    print(json.dumps({"method": method, "cold": timings[0], "warm": timings[1:], "success": success}))
+
+
+def spawn_child(method, warm_runs, env):
+    """격리된 새 인터프리터에서 한 방식을 실행 (프로세스 트리의 최대 RSS 포함)"""
+    import subprocess
+    command = [sys.executable, os.path.abspath(__file__), "--child", method, "--warm", str(warm_runs)]
+    start = time.perf_counter()
+    proc = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, env=env)
+    output = proc.stdout.read()
+    peak_rss_kb = None
+    if hasattr(os, "wait4"):
+        # wait4 의 ru_maxrss 는 이 프로세스와 기다려진 자손(브라우저 등) 중 최대 RSS (Linux 는 KB)
+        _, status, usage = os.wait4(proc.pid, 0)
+        proc.returncode = os.waitstatus_to_exitcode(status)
+        peak_rss_kb = usage.ru_maxrss // 1024 if sys.platform == "darwin" else usage.ru_maxrss
+    else:
+        proc.wait()
+    wall = time.perf_counter() - start
+    proc.stdout.close()
+    try:
+        result = json.loads(output.decode("utf-8").strip().splitlines()[-1])
+    except (ValueError, IndexError):
+        result = {"method": method, "cold": None, "warm": [], "success": False}
+    result["process_wall"] = wall
+    result["peak_rss_kb"] = peak_rss_kb
+    return result
 
-    # 3. Requests-HTML 방식 (비동기로 변경)
-    results.append(await requests_html_login())
 
-    # 4. HTTPX + PyPpeteer 방식 (비동기)
-    results.append(await httpx_pyppeteer_login())
+def describe(values):
+    """평균, 중앙값, 표준편차, 평균의 95% 신뢰구간"""
+    import statistics
+    if not values:
+        return None
+    mean = statistics.mean(values)
+    stdev = statistics.stdev(values) if len(values) > 1 else 0.0
+    df = len(values) - 1
+    t = T_95[df - 1] if 0 < df <= len(T_95) else 1.96
+    half = t * stdev / len(values) ** 0.5 if df else float("nan")
+    return {"n": len(values), "mean": mean, "median": statistics.median(values), "stdev": stdev,
+            "ci95": [mean - half, mean + half], "min": min(values), "max": max(values)}
 
-    # 5. MechanicalSoup 방식
-    results.append(mechanicalsoup_login())
 
-    # 결과 정렬 및 출력
+def compare_login_methods(methods, runs, warm_runs, env):
     print("\n" + "="*50)
-    print("결과 요약 (성능순 정렬)")
+    print("상명대학교 로그인 세션 획득 성능 비교")
+    print(f"방식마다 새 프로세스 {runs}회 (cold 1회 + warm {warm_runs}회) - 대상: {env.get('SUGANG_SSO_URL', SSO_URL)}")
     print("="*50)
 
-    # 성공한 방식만 추출하고 시간순 정렬
-    successful_results = [r for r in results if r["success"]]
-    successful_results.sort(key=lambda x: x["elapsed_time"])
+    summary = {}
+    # 순서 효과를 줄이기 위해 방식을 번갈아 실행
+    samples = {method: [] for method in methods}
+    for run in range(runs):
+        for method in methods:
+            log(f"{method} {run + 1}/{runs} 실행 중...")
+            samples[method].append(spawn_child(method, warm_runs, env))
+
+    for method, results in samples.items():
+        ok = [r for r in results if r["success"]]
+        rss = [r["peak_rss_kb"] / 1024 for r in results if r["peak_rss_kb"] is not None]
+        summary[method] = {
+            "runs": len(results),
+            "success": len(ok),
+            "cold": describe([r["cold"] for r in ok]),
+            "warm": describe([t for r in ok for t in r["warm"]]),
+            "process_wall": describe([r["process_wall"] for r in ok]),
+            "peak_rss_mb": max(rss) if rss else None,
+        }
 
-    # 실패한 방식 추출
-    failed_results = [r for r in results if not r["success"]]
+    print("\n" + "="*50)
+    print("결과 요약 (cold 평균순 정렬, 단위: 초)")
+    print("="*50)
+    print(f"{'방식':<18}{'성공':>6}{'cold 평균':>11}{'중앙값':>9}{'표준편차':>9}{'95% CI':>20}"
+          f"{'warm 평균':>11}{'95% CI':>20}{'최대 RSS(MB)':>14}")
 
-    # 성공한 방식 결과 출력
-    for i, result in enumerate(successful_results, 1):
-        print(f"{i}. {result['method']}: {result['elapsed_time']:.3f}초")
+    def fmt_ci(stats):
+        return f"{stats['ci95'][0]:.3f}~{stats['ci95'][1]:.3f}" if stats and stats["n"] > 1 else "-"
 
-    # 실패한 방식 출력
-    if failed_results:
-        print("\n실패한 방식:")
-        for result in failed_results:
-            print(f"- {result['method']}")
+    ranked = sorted(summary.items(), key=lambda item: item[1]["cold"]["mean"] if item[1]["cold"] else float("inf"))
+    for method, stats in ranked:
+        cold, warm = stats["cold"], stats["warm"]
+        print(f"{method:<18}{stats['success']:>3}/{stats['runs']:<2}"
+              f"{cold['mean'] if cold else float('nan'):>11.3f}{cold['median'] if cold else float('nan'):>9.3f}"
+              f"{cold['stdev'] if cold else float('nan'):>9.3f}{fmt_ci(cold):>20}"
+              f"{warm['mean'] if warm else float('nan'):>11.3f}{fmt_ci(warm):>20}"
+              f"{stats['peak_rss_mb'] if stats['peak_rss_mb'] is not None else float('nan'):>14.1f}")
 
-    print("\n가장 빠른 방식:", successful_results[0]["method"] if successful_results else "없음")
+    fastest = ranked[0][0] if ranked and ranked[0][1]["cold"] else None
+    print("\n가장 빠른 방식 (cold):", fastest or "없음")
+    return summary
 
-    return successful_results[0] if successful_results else None
 
 # 실행 함수
 def main():
-    asyncio.run(compare_login_methods())
+    import argparse
+    parser = argparse.ArgumentParser(description="로그인 방식 성능 비교")
+    parser.add_argument("--methods", default=",".join(METHODS), help="비교할 방식 (쉼표 구분)")
+    parser.add_argument("--runs", type=int, default=5, help="방식마다 새 프로세스로 실행할 횟수")
+    parser.add_argument("--warm", type=int, default=2, help="프로세스마다 cold 실행 뒤 이어서 잴 warm 횟수")
+    parser.add_argument("--local", action="store_true", help="로컬 모의 SSO/수강신청 서버를 대상으로 실행")
+    parser.add_argument("--output", default=None, help="결과 JSON 저장 경로")
+    parser.add_argument("--child", default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child, args.warm)
+        return
+
+    methods = [m for m in args.methods.split(",") if m]
+    unknown = [m for m in methods if m not in METHODS]
+    if unknown:
+        parser.error(f"알 수 없는 방식: {', '.join(unknown)}")
+
+    env = dict(os.environ)
+    server = None
+    if args.local:
+        sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+        from mock_sugang_server import MockSugangServer, SSO_AUTH_PATH, INDEX_PATH
+        server = MockSugangServer().start()
+        host, port = server.address
+        env["SUGANG_SSO_URL"] = f"http://{host}:{port}{SSO_AUTH_PATH}?id=sugang"
+        env["SUGANG_INDEX_URL"] = f"http://{host}:{port}{INDEX_PATH}"
+    try:
+        summary = compare_login_methods(methods, args.runs, args.warm, env)
+    finally:
+        if server is not None:
+            server.stop()
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"config": vars(args), "results": summary}, f, ensure_ascii=False, indent=2)
+        print(f"결과 저장: {args.output}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
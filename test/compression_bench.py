@@ -0,0 +1,93 @@
+"""
+응답 압축 방식별 종단간 지연 벤치마크
+
+모의 서버가 신청 응답을 identity / gzip / deflate / br(brotli 설치 시) 로 보내게 하고
+send_sugang_request 의 전송~결과 확정 시간을 비교합니다. 응답 뒤에 붙는 목록 데이터 길이와
+전송 대역폭 제한을 바꿔 가며 재므로, 작은 XHR 응답에서 압축이 이득인지 확인할 수 있습니다.
+
+python test/compression_bench.py --iterations 300 --padding 0,200 --bandwidth 0,250000
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import sugang_request
+from content_encoding import SUPPORTED
+from mock_sugang_server import MockSugangServer, compress
+from response_parser import Outcome
+
+
+def percentile(sorted_values, q):
+    # 최근접 순위 방식 백분위수
+    index = max(0, min(len(sorted_values) - 1, int(round(q / 100.0 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+def run_case(encoding, padding_rows, bandwidth, iterations, warmup):
+    with MockSugangServer(encoding=encoding, padding_rows=padding_rows, bandwidth=bandwidth) as server:
+        host, port = server.address
+        sugang_request.set_target(host, port, use_tls=False)
+        sugang_request.set_session("bench", "bench")
+        samples = []
+        wire = None
+        for i in range(warmup + iterations):
+            start = time.perf_counter_ns()
+            response = sugang_request.send_sugang_request("BENCH0001", 1)
+            elapsed = time.perf_counter_ns() - start
+            # 압축을 잘못 풀면 UNKNOWN 이 나오므로 결과도 함께 확인
+            assert response.result.outcome == Outcome.OVER_CAPACITY, (encoding, response.result)
+            if i >= warmup:
+                samples.append(elapsed / 1e6)
+        body = json.dumps({"ErrorCode": -1, "ErrorMsg": "수강 제한 인원을 초과하였습니다.",
+                           **({"dsTlsnList": server.state.padding} if padding_rows else {})},
+                          ensure_ascii=False).encode("utf-8")
+        wire = len(body) if encoding == "identity" else len(compress(body, encoding))
+    samples.sort()
+    return {
+        "encoding": encoding,
+        "padding_rows": padding_rows,
+        "bandwidth": bandwidth,
+        "wire_bytes": wire,
+        "mean_ms": statistics.mean(samples),
+        "p50_ms": percentile(samples, 50),
+        "p99_ms": percentile(samples, 99),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="응답 압축 방식별 종단간 지연 벤치마크")
+    parser.add_argument("--iterations", type=int, default=300)
+    parser.add_argument("--warmup", type=int, default=30)
+    parser.add_argument("--padding", default="0,200", help="응답 뒤 목록 데이터 행 수 (쉼표 구분)")
+    parser.add_argument("--bandwidth", default="0,250000", help="전송 대역폭 바이트/초 (쉼표 구분, 0 은 제한 없음)")
+    parser.add_argument("--output", default=None, help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    encodings = ["identity"] + list(SUPPORTED)
+    results = []
+    print(f"{'압축':<10}{'행 수':>7}{'대역폭(B/s)':>13}{'전송 바이트':>12}{'평균ms':>9}{'p50':>9}{'p99':>9}")
+    for bandwidth in [float(b) for b in args.bandwidth.split(",")]:
+        for padding_rows in [int(p) for p in args.padding.split(",")]:
+            for encoding in encodings:
+                row = run_case(encoding, padding_rows, bandwidth, args.iterations, args.warmup)
+                results.append(row)
+                print(f"{encoding:<10}{padding_rows:>7}{bandwidth:>13.0f}{row['wire_bytes']:>12}"
+                      f"{row['mean_ms']:>9.3f}{row['p50_ms']:>9.3f}{row['p99_ms']:>9.3f}")
+            print()
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"python": platform.python_version(), "config": vars(args), "results": results},
+                      f, ensure_ascii=False, indent=2)
+        print(f"결과 저장: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
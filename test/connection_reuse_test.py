@@ -0,0 +1,121 @@
+"""
+유휴 연결 재사용 테스트
+
+TLS 1.3 서버는 핸드셰이크 뒤에 세션 티켓을 보내므로 쓰지 않은 연결도 읽을 데이터가 있는 상태가 됩니다.
+이런 연결을 끊긴 연결로 보고 버리지 않는지, 서버가 실제로 닫은 연결은 여전히 버리는지
+로컬 HTTPS 서버로 확인합니다.
+개시 직전에 준비한 연결로 첫 요청들이 새 핸드셰이크 없이 나가는지도 확인합니다 (openssl 명령이 없으면 건너뜀).
+pytest 로 실행하거나 직접 실행할 수 있습니다:
+python test/connection_reuse_test.py
+"""
+
+import os
+import socket
+import ssl
+import sys
+import tempfile
+import threading
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import connection_pool
+from connection_pool import ConnectionPool
+import sugang_request
+from clock_sync import fire_batch
+from mock_sugang_server import INDEX_PATH, MockSugangServer, use_target
+from tls_resume_bench import make_self_signed
+
+
+def tls13_context(cafile):
+    context = ssl.create_default_context(cafile=cafile)
+    context.minimum_version = ssl.TLSVersion.TLSv1_3
+    return context
+
+
+def test_tls13_idle_connection_reused():
+    with tempfile.TemporaryDirectory() as directory:
+        files = make_self_signed(directory)
+        if files is None:
+            pytest.skip("openssl 이 없어 건너뜁니다")
+        with MockSugangServer(certfile=files[0], keyfile=files[1]) as server:
+            connection_pool.TLS_SESSIONS.clear()
+            pool = ConnectionPool("localhost", server.address[1], maxsize=2, ssl_context=tls13_context(files[0]))
+            pool.prewarm(2)
+            # 세션 티켓이 도착해 유휴 소켓이 읽을 수 있는 상태가 될 때까지 기다림
+            time.sleep(0.2)
+            for conn in pool._idle:
+                assert conn.sock.version() == "TLSv1.3"
+            for _ in range(3):
+                with pool.open("HEAD", INDEX_PATH) as response:
+                    response.read()
+                assert response.status == 200 and response.reused
+            assert pool.connects == 2
+            # 티켓을 읽어 낸 뒤에는 다음 연결이 세션을 재개할 수 있음
+            assert ("localhost", server.address[1]) in connection_pool.TLS_SESSIONS
+            pool.close()
+
+
+def test_closed_tls_connection_discarded():
+    with tempfile.TemporaryDirectory() as directory:
+        files = make_self_signed(directory)
+        if files is None:
+            pytest.skip("openssl 이 없어 건너뜁니다")
+        server_context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        server_context.load_cert_chain(*files)
+        listener = socket.create_server(("127.0.0.1", 0))
+        close_now = threading.Event()
+
+        def serve():
+            # 연결 하나를 받아 핸드셰이크만 하고, 신호가 오면 닫음
+            sock, _ = listener.accept()
+            with server_context.wrap_socket(sock, server_side=True):
+                close_now.wait(5)
+
+        thread = threading.Thread(target=serve, daemon=True)
+        thread.start()
+        pool = ConnectionPool("localhost", listener.getsockname()[1], maxsize=1,
+                              ssl_context=tls13_context(files[0]))
+        try:
+            pool.prewarm(1)
+            time.sleep(0.1)
+            conn = pool._idle[0]
+            assert conn.is_alive()
+            close_now.set()
+            thread.join(5)
+            time.sleep(0.1)
+            assert not conn.is_alive()
+        finally:
+            close_now.set()
+            pool.close()
+            listener.close()
+
+
+def test_launch_burst_uses_prewarmed_connections():
+    # main.launch 처럼 개시 직전에 연결을 준비한 뒤 모든 과목의 첫 요청을 동시에 보냄
+    jobs = [("HALB0001", 1), ("HALB0002", 1), ("HALB0003", 2)]
+    with tempfile.TemporaryDirectory() as directory:
+        files = make_self_signed(directory)
+        if files is None:
+            pytest.skip("openssl 이 없어 건너뜁니다")
+        with MockSugangServer(certfile=files[0], keyfile=files[1]) as server, \
+                use_target(server, tls13_context(files[0])) as pool:
+            sugang_request.set_session("test", "test")
+            sugang_request.prebuild_requests(jobs)
+            sugang_request.prewarm(len(jobs))
+            time.sleep(0.2)
+            results = fire_batch([lambda c=c, d=d: sugang_request.send_sugang_request(c, d) for c, d in jobs],
+                                 time.time() + 0.05)
+            responses = [response for _, response in results]
+            assert all(not isinstance(r, Exception) for r in responses), responses
+            assert all(r.reused for r in responses)
+            assert pool.connects == len(jobs)
+
+
+if __name__ == "__main__":
+    test_tls13_idle_connection_reused()
+    test_closed_tls_connection_discarded()
+    test_launch_burst_uses_prewarmed_connections()
+    print("통과")
@@ -0,0 +1,74 @@
+"""
+조각 단위 압축 해제 테스트
+
+압축된 응답을 한 바이트씩 나눠 넣어도 원문과 파서 결과가 같은지 확인합니다.
+pytest 로 실행하거나 직접 실행할 수 있습니다:
+python test/content_encoding_test.py
+"""
+
+import os
+import sys
+import zlib
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from content_encoding import SUPPORTED, make_decoder
+from response_parser import Outcome, ResponseParser
+
+BODY = ('{"ErrorCode":-1,"ErrorMsg":"수강 제한 인원을 초과하였습니다.","dsTlsnList":['
+        + ','.join('{"strSbjNo":"HALB%04d"}' % i for i in range(100)) + ']}').encode("utf-8")
+
+
+def encode(body, encoding):
+    if encoding == "gzip":
+        obj = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        return obj.compress(body) + obj.flush()
+    if encoding == "deflate":
+        return zlib.compress(body)
+    if encoding == "raw-deflate":
+        obj = zlib.compressobj(6, zlib.DEFLATED, -zlib.MAX_WBITS)
+        return obj.compress(body) + obj.flush()
+    import brotli
+    return brotli.compress(body)
+
+
+def decode_bytewise(data, content_encoding):
+    decoder = make_decoder(content_encoding)
+    out = b"".join(decoder.decompress(data[i:i + 1]) for i in range(len(data)))
+    return out + decoder.flush()
+
+
+def test_identity_has_no_decoder():
+    assert make_decoder(None) is None
+    assert make_decoder("identity") is None
+
+
+def test_bytewise_round_trip():
+    cases = [(e, e) for e in SUPPORTED] + [("raw-deflate", "deflate")]
+    for encoding, header in cases:
+        assert decode_bytewise(encode(BODY, encoding), header) == BODY, encoding
+
+
+def test_stacked_encodings():
+    data = encode(encode(BODY, "deflate"), "gzip")
+    assert decode_bytewise(data, "deflate, gzip") == BODY
+
+
+def test_parser_decides_before_body_ends():
+    data = encode(BODY, "gzip")
+    decoder = make_decoder("gzip")
+    parser = ResponseParser()
+    for i in range(0, len(data), 16):
+        result = parser.feed(decoder.decompress(data[i:i + 16]))
+        if result is not None:
+            break
+    assert result.outcome == Outcome.OVER_CAPACITY
+    assert i + 16 < len(data)
+
+
+if __name__ == "__main__":
+    test_identity_has_no_decoder()
+    test_bytewise_round_trip()
+    test_stacked_encodings()
+    test_parser_decides_before_body_ends()
+    print("통과")
@@ -0,0 +1,90 @@
+"""
+과목 목록 다시 읽기 테스트
+
+실행 중에 과목 목록 파일을 바꾸면 같은 dict 에 반영되는지, 잘못된 파일은 거부하고 이전 목록을
+유지하는지, 처음부터 잘못된 파일이면 subjects.py 목록으로 시작하는지, 이미 성공해 빠진 과목은 다시 신청하지 않고 분반을 바꾸면 다시 신청하는지 확인합니다.
+pytest 로 실행하거나 직접 실행할 수 있습니다:
+python test/course_list_test.py
+"""
+
+import json
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from course_list import CourseList
+
+
+def write(path, content, stamp):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(content if isinstance(content, str) else json.dumps(content))
+    # 같은 초 안에 여러 번 써도 바뀐 것으로 보이도록 수정 시각을 직접 정함
+    os.utime(path, ns=(stamp * 10 ** 9, stamp * 10 ** 9))
+
+
+def test_reload_keeps_same_dict():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "subjects.json")
+        courses = CourseList(path, fallback=({"HALB0001": 1}, {}), check_interval=0)
+        data = courses.data
+        assert data == {"HALB0001": 1}
+
+        write(path, {"subject_data": {"HALB0001": 1, "HALB0002": [2, 1]},
+                     "subject_priority": {"HALB0002": 0}}, 1)
+        assert courses.check()
+        assert courses.data is data and data == {"HALB0001": 1, "HALB0002": (2, 1)}
+        assert courses.priority == {"HALB0002": 0}
+        # 바뀌지 않았으면 다시 읽지 않음
+        assert not courses.check()
+
+        write(path, '{"subject_data": {"bad": 1}}', 2)
+        assert not courses.check()
+        assert courses.rejected == 1 and data == {"HALB0001": 1, "HALB0002": (2, 1)}
+
+
+def test_finished_course_not_readded():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "subjects.json")
+        write(path, {"subject_data": {"HALB0001": 1, "HALB0002": 2}}, 1)
+        courses = CourseList(path, check_interval=0)
+        # 요청 루프가 성공한 과목을 목록에서 뺌
+        courses.data.pop("HALB0001")
+
+        write(path, {"subject_data": {"HALB0001": 1, "HALB0002": 2, "HALB0003": 1}}, 2)
+        assert courses.check()
+        assert courses.data == {"HALB0002": 2, "HALB0003": 1}
+
+        write(path, {"subject_data": {"HALB0001": 3, "HALB0002": 2, "HALB0003": 1}}, 3)
+        assert courses.check()
+        assert courses.data == {"HALB0001": 3, "HALB0002": 2, "HALB0003": 1}
+
+
+def test_invalid_initial_file():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "subjects.json")
+        write(path, '{"subject_data": {"HALB0001": 0}}', 1)
+        # 처음부터 잘못된 파일이면 빈 목록이 아니라 subjects.py 목록으로 시작
+        courses = CourseList(path, fallback=({"HALB0002": 1}, {}), check_interval=0)
+        assert courses.rejected == 1 and courses.data == {"HALB0002": 1}
+
+        # 대신할 목록이 없으면 오류로 중단
+        try:
+            CourseList(path, check_interval=0)
+        except ValueError as e:
+            assert "HALB0001" in str(e)
+        else:
+            raise AssertionError("잘못된 파일로 시작했는데 오류가 나지 않았습니다")
+
+        # 파일을 고치면 그 내용으로 바뀜
+        write(path, {"subject_data": {"HALB0001": 1}}, 2)
+        assert courses.check()
+        assert courses.data == {"HALB0001": 1}
+
+
+if __name__ == "__main__":
+    test_reload_keeps_same_dict()
+    test_finished_course_not_readded()
+    test_invalid_initial_file()
+    print("통과")
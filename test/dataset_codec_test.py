@@ -0,0 +1,109 @@
+"""
+데이터셋 폼 인코더/디코더와 묶음 신청 테스트
+
+한 과목 요청 본문이 기존 형식과 같은지, 여러 행/여러 데이터셋이 그대로 되돌아오는지,
+모의 서버가 묶음 신청을 받을 때와 받지 않을 때 각각 맞게 처리되는지 확인합니다.
+pytest 로 실행하거나 직접 실행할 수 있습니다:
+python test/dataset_codec_test.py
+"""
+
+import os
+import sys
+import urllib.parse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import sugang_request
+from dataset_codec import Dataset, decode, encode
+from mock_sugang_server import MockSugangServer, use_target
+from response_parser import Outcome, parse_batch_response
+
+
+def test_single_row_matches_legacy_form():
+    legacy = urllib.parse.urlencode({
+        '_AUTH_MENU_KEY': '',
+        '@d1#strCampusRcd': 'CMN001.0001',
+        '@d1#strSbjNo': 'HALB0001',
+        '@d1#strDivcls': '3',
+        '@d#': '@d1#',
+        '@d1#': 'dmParamTlsnAplyDirect',
+        '@d1#tp': 'dm'
+    }).encode('utf-8')
+    assert sugang_request.encode_form('HALB0001', 3) == legacy
+
+
+def test_round_trip_rows_and_datasets():
+    body = encode([Dataset('dsParam', [{'a': 1, 'b': '가&='}, {'a': 2}], 'ds'),
+                   Dataset('dmParam', [{'k': 'v'}])], {'_AUTH_MENU_KEY': ''})
+    datasets, fields = decode(body)
+    assert fields == {'_AUTH_MENU_KEY': ''}
+    assert datasets['dsParam'] == Dataset('dsParam', [{'a': '1', 'b': '가&='}, {'a': '2', 'b': ''}], 'ds')
+    assert datasets['dmParam'].row == {'k': 'v'}
+    for bad in ('@d1#a=1&@d1#a=2&@d1#b=1&@d#=@d1#&@d1#=x&@d1#tp=ds', '@d1#a=1&@d#=@d1#'):
+        try:
+            decode(bad)
+        except ValueError:
+            continue
+        raise AssertionError(bad)
+
+
+def test_parse_batch_response():
+    body = ('{"ErrorCode":0,"dsResult":[{"ErrorCode":0,"ErrorMsg":"","strRtnCd":"true"},'
+            '{"ErrorCode":-1,"ErrorMsg":"수강 제한 인원을 초과하였습니다.","strRtnCd":"false"}]}').encode()
+    results = parse_batch_response(body, 200, 2)
+    assert [r.outcome for r in results] == [Outcome.SUCCESS, Outcome.OVER_CAPACITY]
+    assert parse_batch_response(body, 200, 3) is None
+    assert parse_batch_response('{"ErrorCode":-1,"ErrorMsg":"요청 형식 오류"}'.encode(), 200, 2) is None
+    assert [r.outcome for r in parse_batch_response(b"", 503, 2)] == [Outcome.SERVER_ERROR] * 2
+    # 최상위 세션 만료/기간 오류는 묶음 미지원이 아니라 모든 행의 결과
+    expired = parse_batch_response('{"ErrorCode":-3000,"ErrorMsg":"세션이 만료되었습니다."}'.encode(), 200, 2)
+    assert [r.outcome for r in expired] == [Outcome.SESSION_EXPIRED] * 2
+    closed = parse_batch_response('{"ErrorCode":-1,"ErrorMsg":"수강신청 기간이 아닙니다."}'.encode(), 200, 3)
+    assert [r.outcome for r in closed] == [Outcome.OUT_OF_PERIOD] * 3
+    # 행 안의 메시지는 최상위 결과로 보지 않음
+    body = ('{"ErrorCode":0,"dsResult":[{"ErrorCode":-1,"ErrorMsg":"수강신청 기간이 아닙니다."},'
+            '{"ErrorCode":0,"ErrorMsg":"","strRtnCd":"true"}]}').encode()
+    assert [r.outcome for r in parse_batch_response(body, 200, 2)] == [Outcome.OUT_OF_PERIOD, Outcome.SUCCESS]
+
+
+def send_batch(items, server_batch, seats, **state):
+    """모의 서버에 묶음 요청을 보내고 (응답 목록, 왕복 수, 보낸 뒤의 BATCH_SUPPORTED) 를 돌려줌"""
+    with MockSugangServer(batch=server_batch, seat_schedule=seats, **state) as server, use_target(server):
+        sugang_request.set_session("test", "test")
+        sugang_request.BATCH_SUPPORTED = None
+        responses = sugang_request.send_sugang_batch(items)
+        return responses, server.state.round_trips, sugang_request.BATCH_SUPPORTED
+
+
+def test_batch_against_mock():
+    items = [("HALB0001", 1), ("HALB0002", 2), ("HALB0003", 1)]
+    responses, round_trips, supported = send_batch(items, True, {"HALB0002": [0]})
+    assert round_trips == 1 and supported is True
+    assert [r.result.outcome for r in responses] == [Outcome.OVER_CAPACITY, Outcome.SUCCESS, Outcome.OVER_CAPACITY]
+
+
+def test_unsupported_batch_falls_back():
+    attempts = dict(sugang_request.ATTEMPTS)
+    responses, round_trips, supported = send_batch([("HALB0001", 1), ("HALB0002", 2)], False, {})
+    assert responses is None and round_trips == 1
+    assert supported is False
+    # 처리되지 않은 묶음 요청은 시도 횟수에 넣지 않음
+    assert sugang_request.ATTEMPTS == attempts
+
+
+def test_expired_session_batch_is_not_unsupported():
+    items = [("HALB0001", 1), ("HALB0002", 2)]
+    responses, round_trips, supported = send_batch(items, True, {}, session_expiry_rate=1.0)
+    assert round_trips == 1 and [r.result.outcome for r in responses] == [Outcome.SESSION_EXPIRED] * 2
+    # 세션 만료 응답만으로는 묶음 지원 여부를 정하지 않음 (다시 로그인한 뒤 묶음으로 계속 보냄)
+    assert supported is None
+
+
+if __name__ == "__main__":
+    test_single_row_matches_legacy_form()
+    test_round_trip_rows_and_datasets()
+    test_parse_batch_response()
+    test_batch_against_mock()
+    test_unsupported_batch_falls_back()
+    test_expired_session_batch_is_not_unsupported()
+    print("통과")
@@ -0,0 +1,109 @@
+"""
+여러 분반 신청 테스트
+
+후보 분반을 모두 신청하되 두 분반이 함께 요청 중인 적이 없는지, 한 분반이 성공하면
+나머지 분반 신청이 멈추는지, 거절된 분반만 빠지는지 가짜 전송 함수로 확인합니다.
+pytest 로 실행하거나 직접 실행할 수 있습니다:
+python test/division_race_test.py
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import async_engine
+from course_list import expand, validate
+from response_parser import parse_response
+from scheduler import FixedRateScheduler
+
+OVER = parse_response('{"ErrorCode":-1,"ErrorMsg":"수강 제한 인원을 초과하였습니다."}')
+GRANTED = parse_response('{"ErrorCode":0,"ErrorMsg":"","dmResult":{"strRtnCd":"true"}}')
+CONFLICT = parse_response('{"ErrorCode":-1,"ErrorMsg":"시간표가 중복되었습니다."}')
+
+
+class FakeServer:
+    """분반별로 정해진 순서의 응답을 주고, 같은 과목 요청이 겹치는지 기록"""
+
+    def __init__(self, answers):
+        self.answers = answers
+        self.sent = []
+        self.in_flight = {}
+        self.overlaps = 0
+        self.lock = threading.Lock()
+
+    def send(self, course, div):
+        with self.lock:
+            self.in_flight[course] = self.in_flight.get(course, 0) + 1
+            self.overlaps += self.in_flight[course] > 1
+            self.sent.append((course, div))
+            answers = self.answers.get((course, div), [])
+            result = answers.pop(0) if answers else OVER
+        time.sleep(0.005)
+        with self.lock:
+            self.in_flight[course] -= 1
+        return SimpleNamespace(result=result, reused=True, elapsed=0.005)
+
+
+def run(subject_data, answers, attempts=2):
+    server = FakeServer(answers)
+    handled = []
+
+    def handle_response(course, div, result):
+        handled.append((course, div, result.outcome.value))
+        return result.granted
+
+    asyncio.run(asyncio.wait_for(async_engine.run_engine(
+        subject_data, handle_response, concurrency=8, scheduler=FixedRateScheduler(0),
+        attempts_per_course=attempts, retry_delay=0.0, send=server.send), 5))
+    return server, handled
+
+
+def test_validate_division_lists():
+    data, _ = validate({"subject_data": {"HALB0001": [3, "1"], "HALB0002": [2], "HALB0003": 4}})
+    assert data == {"HALB0001": (3, 1), "HALB0002": 2, "HALB0003": 4}
+    assert expand(data) == [("HALB0001", 3), ("HALB0001", 1), ("HALB0002", 2), ("HALB0003", 4)]
+    for bad in ([], [1, 1], [0]):
+        try:
+            validate({"subject_data": {"HALB0001": bad}})
+        except ValueError:
+            continue
+        raise AssertionError(bad)
+
+
+def test_one_division_wins_and_others_stop():
+    subject_data = {"HALB0001": (2, 1, 3)}
+    server, handled = run(subject_data, {("HALB0001", 1): [OVER, OVER, GRANTED]})
+    assert not subject_data
+    assert server.overlaps == 0
+    granted = [h for h in handled if h[2] == "success"]
+    assert granted == [("HALB0001", 1, "success")]
+    # 성공 뒤에는 어떤 분반도 더 보내지 않음
+    assert server.sent[-1] == ("HALB0001", 1)
+    # 같은 바퀴에 모든 분반을 시도함
+    assert {div for _, div in server.sent[:3]} == {1, 2, 3}
+
+
+def test_rejected_division_is_dropped_alone():
+    subject_data = {"HALB0001": (1, 2)}
+    rejected = set()
+
+    server = FakeServer({("HALB0001", 1): [CONFLICT], ("HALB0001", 2): [OVER, GRANTED]})
+    asyncio.run(asyncio.wait_for(async_engine.run_engine(
+        subject_data, lambda c, d, r: r.granted, scheduler=FixedRateScheduler(0), retry_delay=0.0,
+        pending=lambda c: tuple(d for d in subject_data.get(c, ()) if d not in rejected),
+        on_reject=lambda c, d: rejected.add(d), send=server.send), 5))
+    assert rejected == {1}
+    assert server.sent.count(("HALB0001", 1)) == 1
+    assert not subject_data
+
+
+if __name__ == "__main__":
+    test_validate_division_lists()
+    test_one_division_wins_and_others_stop()
+    test_rejected_division_is_dropped_alone()
+    print("통과")
@@ -0,0 +1,98 @@
+"""
+DNS 캐시와 TLS 세션 재개 테스트
+
+TTL 이 지나면 다시 조회하는지, 파일에 저장한 주소를 재시작한 캐시가 그대로 쓰는지,
+조회가 실패하면 만료된 주소를 쓰는지 가짜 시계와 가짜 조회 함수로 확인합니다.
+openssl 명령이 있으면 로컬 HTTPS 모의 서버로 재연결 때 TLS 세션이 재개되는지도 확인합니다.
+pytest 로 실행하거나 직접 실행할 수 있습니다:
+python test/dns_tls_cache_test.py
+"""
+
+import os
+import socket
+import ssl
+import sys
+import tempfile
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import connection_pool
+from connection_pool import ConnectionPool
+from dns_cache import DnsCache
+from mock_sugang_server import INDEX_PATH, MockSugangServer
+from tls_resume_bench import make_self_signed
+
+ADDRESS = [(socket.AF_INET, socket.SOCK_STREAM, 6, "", ("10.0.0.1", 443))]
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeResolver:
+    def __init__(self):
+        self.calls = 0
+        self.fail = False
+
+    def __call__(self, host, port, family, type_):
+        self.calls += 1
+        if self.fail:
+            raise socket.gaierror(-3, "Temporary failure in name resolution")
+        return ADDRESS
+
+
+def test_ttl_persistence_and_stale():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "dns.json")
+        clock, resolver = FakeClock(), FakeResolver()
+        cache = DnsCache(path, ttl=60, stale_grace=600, resolver=resolver, clock=clock)
+        assert cache.resolve("example", 443) == ADDRESS
+        assert cache.resolve("example", 443) == ADDRESS and resolver.calls == 1
+
+        # 재시작한 캐시는 파일에서 읽은 주소를 조회 없이 씀 (주소 형식도 같아야 함)
+        restarted = DnsCache(path, ttl=60, resolver=resolver, clock=clock)
+        assert restarted.resolve("example", 443) == ADDRESS and resolver.calls == 1
+
+        clock.now += 61
+        assert cache.resolve("example", 443) == ADDRESS and resolver.calls == 2
+        clock.now += 61
+        resolver.fail = True
+        assert cache.resolve("example", 443) == ADDRESS and cache.stale == 1
+        clock.now += 601
+        try:
+            cache.resolve("example", 443)
+        except socket.gaierror:
+            pass
+        else:
+            raise AssertionError("stale_grace 가 지나면 조회 실패가 그대로 나와야 함")
+
+        cache.forget("example", 443)
+        assert DnsCache(path, resolver=resolver, clock=clock).entries == {}
+
+
+def test_tls_session_resumed_on_reconnect():
+    with tempfile.TemporaryDirectory() as directory:
+        files = make_self_signed(directory)
+        if files is None:
+            pytest.skip("openssl 이 없어 건너뜁니다")
+        context = ssl.create_default_context(cafile=files[0])
+        with MockSugangServer(certfile=files[0], keyfile=files[1]) as server:
+            connection_pool.TLS_SESSIONS.clear()
+            pool = ConnectionPool("localhost", server.address[1], maxsize=1, ssl_context=context)
+            for _ in range(3):
+                response, _ = pool.request("HEAD", INDEX_PATH)
+                assert response.status == 200
+                pool.close()
+            assert (pool.tls_full, pool.tls_resumed) == (1, 2)
+
+
+if __name__ == "__main__":
+    test_ttl_persistence_and_stale()
+    test_tls_session_resumed_on_reconnect()
+    print("통과")
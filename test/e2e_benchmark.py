@@ -0,0 +1,255 @@
+"""
+수강신청 루프 종단간 벤치마크
+
+로컬 모의 서버(mock_sugang_server.py)를 띄우고 main.run_sequential 또는
+async_engine.run_engine 을 그대로 돌려 수강신청을 반복한 뒤 초당 요청 수, p50/p95/p99 지연,
+과목별 성공까지 걸린 시간을 JSON 으로 저장합니다. 실제 sugang.smu.ac.kr 과 ntfy 에는 요청을 보내지 않습니다.
+--batch 를 주면 모의 서버가 묶음 신청을 받고 순차 모드는 main 과 같이 과목을 묶어 보냅니다.
+
+python test/e2e_benchmark.py --mode async --courses 8 --latency lognormal:30:0.4 \\
+    --default-release 1.5 --output bench_async.json
+
+--hedge-percentile 를 주면 백업 요청 없이 한 번, 백업 요청을 켜고 한 번 돌려 p99 변화를 함께 보여줍니다.
+python test/e2e_benchmark.py --mode sequential --latency lognormal:5:1.0 --duration 20 --hedge-percentile 90
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import sys
+import time
+from collections import Counter
+from http.cookies import SimpleCookie
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main
+import async_engine
+import sugang_request
+from hedging import Hedger
+from scheduler import AdaptiveScheduler, FixedRateScheduler
+from mock_sugang_server import MockSugangServer, add_server_arguments, server_options
+
+
+def percentile(sorted_values, q):
+    # 최근접 순위 방식 백분위수
+    if not sorted_values:
+        return None
+    index = max(0, min(len(sorted_values) - 1, int(round(q / 100.0 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+class Deadline(BaseException):
+    """제한 시간이 지나 순차 루프를 멈춤 (main.run_sequential 의 except Exception 에 잡히지 않도록)"""
+
+
+class Recorder:
+    """요청별 지연과 결과, 과목별 성공 시각을 모음"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.latencies = []
+        self.outcomes = Counter()
+        self.reused = 0
+        self.hedges = Counter()
+        self.errors = 0
+        self.success_at = {}
+
+    def record(self, course, response, latency):
+        self.latencies.append(latency)
+        self.outcomes[response.result.outcome.value] += 1
+        self.reused += response.reused
+        if response.hedge:
+            self.hedges[response.hedge] += 1
+        if response.result.granted:
+            self.success_at.setdefault(course, time.perf_counter() - self.started)
+
+    def check_deadline(self, deadline):
+        if deadline is not None and time.perf_counter() >= deadline:
+            raise Deadline()
+
+    def wrap(self, send, deadline=None):
+        def timed_send(course, div):
+            self.check_deadline(deadline)
+            start = time.perf_counter()
+            try:
+                response = send(course, div)
+            except Exception:
+                self.errors += 1
+                raise
+            self.record(course, response, time.perf_counter() - start)
+            return response
+        return timed_send
+
+    def wrap_batch(self, send_batch, deadline=None):
+        # 묶음 응답의 행마다 요청 하나로 셈 (지연은 묶음 전체 왕복 시간)
+        def timed_send_batch(items):
+            self.check_deadline(deadline)
+            start = time.perf_counter()
+            try:
+                responses = send_batch(items)
+            except Exception:
+                self.errors += 1
+                raise
+            if responses is not None:
+                latency = time.perf_counter() - start
+                for (course, _), response in zip(items, responses):
+                    self.record(course, response, latency)
+            return responses
+        return timed_send_batch
+
+    def summary(self, courses):
+        duration = time.perf_counter() - self.started
+        latencies = sorted(self.latencies)
+        ms = lambda v: round(v * 1000, 3) if v is not None else None
+        return {
+            "requests": len(latencies),
+            "errors": self.errors,
+            "duration_s": round(duration, 3),
+            "requests_per_s": round(len(latencies) / duration, 2) if duration else None,
+            "connection_reuse_ratio": round(self.reused / len(latencies), 3) if latencies else None,
+            "latency_ms": {
+                "mean": ms(sum(latencies) / len(latencies)) if latencies else None,
+                "p50": ms(percentile(latencies, 50)),
+                "p95": ms(percentile(latencies, 95)),
+                "p99": ms(percentile(latencies, 99)),
+                "max": ms(latencies[-1]) if latencies else None,
+            },
+            "outcomes": dict(self.outcomes),
+            "hedges": dict(self.hedges),
+            "time_to_success_s": {c: round(self.success_at[c], 3) if c in self.success_at else None for c in courses},
+            "all_succeeded": all(c in self.success_at for c in courses),
+        }
+
+
+def open_session():
+    # 모의 서버의 /index.do 에서 세션 쿠키를 받아 요청 헤더에 설정
+    response, _ = sugang_request.POOL.request("GET", "/index.do")
+    cookie = SimpleCookie(response.getheader("Set-Cookie", ""))
+    sugang_request.set_session(cookie["SGJSESSIONID"].value, "bench")
+
+
+def run_sequential(recorder, deadline, scheduler, batch):
+    # main.run_sequential 을 그대로 돌리고, 전송 함수만 기록용으로 감싸 제한 시간이 지나면 멈춤
+    main.send_sugang_request = recorder.wrap(sugang_request.send_sugang_request, deadline)
+    main.send_sugang_batch = recorder.wrap_batch(sugang_request.send_sugang_batch, deadline)
+    try:
+        main.run_sequential(scheduler, batch)
+    except Deadline:
+        pass
+    finally:
+        main.send_sugang_request = sugang_request.send_sugang_request
+        main.send_sugang_batch = sugang_request.send_sugang_batch
+
+
+async def run_async(recorder, duration, scheduler, args):
+    # main.run_async 와 같은 인자로 엔진을 돌림 (전송 함수만 기록용)
+    try:
+        await asyncio.wait_for(
+            async_engine.run_engine(main.subject_data, main.handle_response, args.concurrency, scheduler,
+                                    args.attempts, args.retry_delay, main.subject_priority, retry=main.RETRY,
+                                    pending=main.pending_divisions, on_reject=main.drop_division,
+                                    send=recorder.wrap(sugang_request.send_sugang_request)),
+            duration)
+    except asyncio.TimeoutError:
+        pass
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="수강신청 루프 종단간 벤치마크")
+    parser.add_argument("--mode", choices=["sequential", "async"], default="async")
+    parser.add_argument("--courses", type=int, default=8, help="신청할 가상 과목 수")
+    parser.add_argument("--duration", type=float, default=10.0, help="최대 실행 시간(초)")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--rate", type=float, default=0.0, help="고정 초당 요청 수 (0 이면 제한 없음)")
+    parser.add_argument("--adaptive", action="store_true", help="AIMD 스케줄러 사용 (--rate 는 시작 속도)")
+    parser.add_argument("--max-rate", type=float, default=50.0, help="AIMD 스케줄러의 초당 요청 수 상한")
+    parser.add_argument("--attempts", type=int, default=1)
+    parser.add_argument("--retry-delay", type=float, default=0.0)
+    parser.add_argument("--timeout", type=float, default=10.0, help="요청별 제한 시간(초)")
+    parser.add_argument("--hedge-percentile", type=float, default=0.0,
+                        help="백업 요청을 보낼 응답 시간 백분위수 (0 이면 비교하지 않음)")
+    parser.add_argument("--hedge-max-ratio", type=float, default=0.05, help="백업 요청 비율 상한")
+    parser.add_argument("--hedge-min-delay", type=float, default=0.005, help="백업 요청 전 최소 대기 시간(초)")
+    parser.add_argument("--output", default=None, help="결과 JSON 저장 경로")
+    add_server_arguments(parser)
+    args = parser.parse_args()
+
+    # 벤치마크 중에는 실제 휴대폰 알림을 보내지 않음
+    alerts = []
+    main.send_mobile_alert = lambda message, **options: alerts.append(message)
+    sugang_request.set_request_timeout(args.timeout or None)
+
+    if args.hedge_percentile <= 0:
+        report = run_benchmark(args, alerts)
+    else:
+        # 같은 조건으로 백업 요청 없이/있이 한 번씩 돌려 꼬리 지연 변화를 비교
+        baseline = run_benchmark(args, alerts)
+        hedger = Hedger(percentile=args.hedge_percentile, max_ratio=args.hedge_max_ratio,
+                        min_delay=args.hedge_min_delay)
+        report = run_benchmark(args, alerts, hedger)
+        p99_off, p99_on = baseline["latency_ms"]["p99"], report["latency_ms"]["p99"]
+        report["hedging"] = {
+            **{k: round(v, 4) for k, v in hedger.stats().items()},
+            "p99_off_ms": p99_off,
+            "p99_on_ms": p99_on,
+            "p99_change_pct": round((p99_on - p99_off) / p99_off * 100, 1) if p99_off and p99_on else None,
+            "baseline": baseline,
+        }
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    if args.hedge_percentile > 0:
+        hedging = report["hedging"]
+        print(f"p99: 백업 요청 없음 {hedging['p99_off_ms']}ms -> 백업 요청 사용 {hedging['p99_on_ms']}ms "
+              f"({hedging['p99_change_pct']}%), 백업 요청 {hedging['hedges']}/{hedging['requests']}회")
+
+
+def run_benchmark(args, alerts, hedger=None):
+    sugang_request.set_hedging(hedger)
+    sugang_request.ATTEMPTS.clear()
+    courses = [f"BENCH{i:04d}" for i in range(args.courses)]
+    # main 의 과목 목록을 벤치마크용으로 바꿈 (파일 감시 없음)
+    main.subject_data = {course: 1 for course in courses}
+    main.subject_priority = {}
+    main.COURSES = None
+    main.DROPPED.clear()
+    sugang_request.BATCH_SUPPORTED = None
+
+    with MockSugangServer(**server_options(args)) as server:
+        host, port = server.address
+        sugang_request.set_target(host, port, use_tls=False)
+        open_session()
+        sugang_request.prewarm((args.concurrency if args.mode == "async" else 1) + (hedger is not None))
+
+        if args.adaptive:
+            scheduler = AdaptiveScheduler(initial_rate=args.rate or 1.0, max_rate=args.max_rate)
+        else:
+            scheduler = FixedRateScheduler(args.rate)
+
+        recorder = Recorder()
+        if args.mode == "async":
+            asyncio.run(run_async(recorder, args.duration, scheduler, args))
+        else:
+            run_sequential(recorder, recorder.started + args.duration, scheduler, args.batch)
+        result = recorder.summary(courses)
+        result["final_rate"] = scheduler.rate
+        server_requests = server.state.requests
+
+    sugang_request.set_hedging(None)
+    return {
+        "mode": args.mode,
+        "config": vars(args),
+        "python": platform.python_version(),
+        "server_requests": server_requests,
+        "alerts": len(alerts),
+        **result,
+    }
+
+
+if __name__ == "__main__":
+    main_cli()
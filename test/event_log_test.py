@@ -0,0 +1,120 @@
+"""
+이벤트 로그와 로그 분석기 테스트
+
+백그라운드 작성 스레드가 쓴 줄이 파일을 돌려써도 빠짐없이 순서대로 읽히는지,
+분석기가 과목별 시도/성공 시각/오류 구간을 맞게 모으는지, --json 출력이 표준 JSON 인지,
+알림을 보내면 alert 이벤트가 남는지 확인합니다.
+pytest 로 실행하거나 직접 실행할 수 있습니다:
+python test/event_log_test.py
+"""
+
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import event_log
+import notifier
+from event_log import EventLog
+import log_analyzer
+from log_analyzer import Analyzer, log_files, read_events
+
+
+def test_write_rotate_read():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "events.jsonl")
+        log = EventLog(path, max_bytes=400, backups=20)
+        for i in range(40):
+            log.write("attempt", {"course": "HALB0001", "div": 1, "attempt": i + 1, "outcome": "over_capacity",
+                                  "elapsed": 0.01 * (i % 5 + 1)})
+        log.close()
+        files = log_files([path])
+        assert len(files) > 2 and files[-1] == path
+        assert all(os.path.getsize(f) <= 400 for f in files)
+        events = list(read_events(files))
+        assert [e["attempt"] for e in events] == list(range(1, 41))
+        assert log.written == 40
+
+
+def test_backups_are_limited():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "events.jsonl")
+        log = EventLog(path, max_bytes=200, backups=2)
+        for i in range(30):
+            log.write("launch", {"index": i})
+        log.close()
+        files = log_files([path])
+        assert len(files) == 3
+        # 가장 오래된 파일부터 지워지고 마지막 줄은 남음
+        events = list(read_events(files))
+        assert events[-1]["index"] == 29 and events[0]["index"] > 0
+
+
+def test_analyzer():
+    analyzer = Analyzer(burst_threshold=3)
+    events = [{"ts": 100.0 + i * 0.1, "kind": "attempt", "course": "HALB0001", "div": 1, "attempt": i + 1,
+               "outcome": "server_error", "elapsed": 0.2} for i in range(6)]
+    events.append({"ts": 101.0, "kind": "attempt_error", "course": "HALB0001", "div": 1, "error": "reset"})
+    events.append({"ts": 103.5, "kind": "attempt", "course": "HALB0001", "div": 1, "attempt": 8,
+                   "outcome": "success", "elapsed": 0.05, "granted": True})
+    for event in events:
+        analyzer.add(event)
+    report = analyzer.finish().report()
+    stats = report["courses"]["HALB0001-1"]
+    assert stats["attempts"] == 8 and stats["errors"] == 7
+    assert stats["granted_at"] == 103.5 and report["timeline"][0]["event"] == "granted"
+    assert 0.15 < stats["p50"] <= 0.25
+    # 초당 오류 3건 이상인 100초만 오류 구간 (101초는 1건)
+    assert report["error_bursts"] == [{"start": 100, "end": 100, "errors": 6, "peak": 6}]
+
+
+def test_json_report_has_no_infinity():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "events.jsonl")
+        with open(path, "w", encoding="utf-8") as f:
+            # 마지막 구간(약 56초)을 넘는 응답 시간 - 분위수가 inf 가 됨
+            f.write(json.dumps({"ts": 100.0, "kind": "attempt", "course": "HALB0001", "div": 1,
+                                "attempt": 1, "outcome": "server_error", "elapsed": 120.0}) + "\n")
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            assert log_analyzer.main([path, "--json"]) == 0
+
+    def reject(constant):
+        raise ValueError(f"표준 JSON 이 아닌 값: {constant}")
+    report = json.loads(output.getvalue(), parse_constant=reject)
+    stats = report["courses"]["HALB0001-1"]
+    assert stats["p50"] is None and stats["p99"] is None and stats["mean"] == 120.0
+
+
+def test_alert_is_logged():
+    submitted = []
+    submit = notifier._notifier.submit
+    notifier._notifier.submit = lambda message, kind=None, priority=None: submitted.append(message) or True
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "events.jsonl")
+        # configure 는 켜져 있던 로그를 닫으므로 직접 바꿔 끼우고 끝나면 되돌림
+        previous, event_log._log = event_log._log, EventLog(path)
+        try:
+            assert notifier.send_mobile_alert("자리 생김", kind="success", urgent=True) is True
+        finally:
+            event_log._log.close()
+            event_log._log = previous
+            notifier._notifier.submit = submit
+        events = list(read_events([path]))
+    assert submitted == ["자리 생김"]
+    assert len(events) == 1
+    assert events[0]["kind"] == "alert" and events[0]["alert_kind"] == "success"
+    assert events[0]["urgent"] is True and events[0]["queued"] is True
+
+
+if __name__ == "__main__":
+    test_write_rotate_read()
+    test_backups_are_limited()
+    test_analyzer()
+    test_json_report_has_no_infinity()
+    test_alert_is_logged()
+    print("통과")
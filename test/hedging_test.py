@@ -0,0 +1,63 @@
+"""
+헤지(백업) 요청 테스트
+
+늦은 주 요청에 백업 요청이 나가 먼저 끝난 쪽이 쓰이는지, 백업 비율 상한을 지키는지 확인합니다.
+pytest 로 실행하거나 직접 실행할 수 있습니다:
+python test/hedging_test.py
+"""
+
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from hedging import Hedger
+
+
+def fake_send(delays):
+    """호출 순서대로 delays 만큼 걸리는 요청 (취소되면 바로 ConnectionError)"""
+    calls = iter(delays)
+    lock = threading.Lock()
+
+    def send(cancel):
+        with lock:
+            delay, name = next(calls)
+        deadline = time.perf_counter() + delay
+        while time.perf_counter() < deadline:
+            if cancel.cancelled:
+                raise ConnectionError("취소됨")
+            time.sleep(0.001)
+        return name
+    return send
+
+
+def test_slow_primary_loses_to_backup():
+    hedger = Hedger(max_ratio=1.0, initial_delay=0.02)
+    start = time.perf_counter()
+    response, winner = hedger.run(fake_send([(1.0, "primary"), (0.01, "backup")]))
+    assert (response, winner) == ("backup", "backup")
+    assert time.perf_counter() - start < 0.5
+    assert hedger.stats()["backup_wins"] == 1
+
+
+def test_fast_primary_sends_no_backup():
+    hedger = Hedger(max_ratio=1.0, initial_delay=0.2)
+    assert hedger.run(fake_send([(0.0, "primary")])) == ("primary", None)
+    assert hedger.hedges == 0
+
+
+def test_hedge_ratio_cap():
+    hedger = Hedger(max_ratio=0.25, initial_delay=0.0, min_samples=10 ** 6)
+    for _ in range(20):
+        hedger.run(fake_send([(0.005, "primary"), (0.005, "backup")]))
+    assert hedger.hedges <= 0.25 * hedger.requests
+    assert hedger.hedges > 0
+
+
+if __name__ == "__main__":
+    test_slow_primary_loses_to_backup()
+    test_fast_primary_sends_no_backup()
+    test_hedge_ratio_cap()
+    print("통과")
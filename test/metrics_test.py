@@ -0,0 +1,50 @@
+"""
+지표 레지스트리 테스트
+
+히스토그램 분위수가 구간 경계로 근사되는지, 마지막 구간을 넘은 값이 있어도 JSON 스냅샷이
+표준 JSON 으로 저장되는지 (Infinity 없이), Prometheus 출력에는 +Inf 구간이 남는지 확인합니다.
+pytest 로 실행하거나 직접 실행할 수 있습니다:
+python test/metrics_test.py
+"""
+
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from metrics import Histogram, Registry
+
+
+def test_histogram_quantile():
+    histogram = Histogram((0.1, 0.5, 1.0))
+    assert histogram.quantile(0.5) is None
+    for value in (0.05, 0.05, 0.3, 0.8):
+        histogram.observe(value)
+    assert histogram.quantile(0.5) == 0.1
+    assert histogram.quantile(0.75) == 0.5
+    assert histogram.quantile(1.0) == 1.0
+    histogram.observe(3.0)
+    assert histogram.quantile(1.0) == float("inf")
+
+
+def test_snapshot_is_strict_json():
+    registry = Registry()
+    registry.inc("requests_total", outcome="success")
+    registry.set("send_rate", 2.0)
+    for value in (0.01, 20.0, 30.0):
+        registry.observe("latency_seconds", value, buckets=(0.1, 1.0))
+    snapshot = json.loads(json.dumps(registry.snapshot(), allow_nan=False))
+    latency = snapshot["histograms"]["latency_seconds"]["_"]
+    assert latency["count"] == 3 and latency["p50"] is None and latency["p99"] is None
+    assert snapshot["counters"]["requests_total"]["outcome=success"] == 1
+    assert snapshot["gauges"]["send_rate"]["_"] == 2.0
+    text = registry.render_prometheus()
+    assert 'latency_seconds_bucket{le="1.0"} 1' in text
+    assert 'latency_seconds_bucket{le="+Inf"} 3' in text
+
+
+if __name__ == "__main__":
+    test_histogram_quantile()
+    test_snapshot_is_strict_json()
+    print("통과")
@@ -0,0 +1,489 @@
+"""
+상명대학교 수강신청 서버 로컬 모의 서버
+
+/UcrTlsn/tlsnAplyDirect.do 와 /index.do, SSO 로그인(/svc/tk/Auth.do) 을 흉내 냅니다.
+- 응답 지연 분포 (const:ms, uniform:a:b, exp:mean, lognormal:median:sigma)
+- 과목별 여석 발생 시각 (서버 시작 기준 초)
+- 세션 만료(-3000), 제한 인원 초과, 수강신청 기간 오류
+- /index.do 본문 크기 지정과 Range 요청 (HEAD 와 부분 GET 비교용)
+- 신청 응답 압축(gzip/deflate/br), 뒤에 붙는 데이터셋 길이, 전송 대역폭 제한
+- 장애 구간 동안 모든 요청에 503 응답 (재시도 정책/서킷 브레이커 확인용)
+- 여러 과목을 한 요청에 담은 묶음 신청(ds) 처리 또는 거절 (--batch)
+- 인증서를 주면 HTTPS 로 응답 (TLS 세션 재개 확인용)
+
+단독 실행:
+python test/mock_sugang_server.py --port 8080 --latency lognormal:20:0.5 --opens-at 2
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import re
+import secrets
+import ssl
+import sys
+import threading
+import time
+import urllib.parse
+import zlib
+from contextlib import contextmanager
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dataset_codec import decode
+
+APLY_PATH = "/UcrTlsn/tlsnAplyDirect.do"
+APLY_DATASET = "dmParamTlsnAplyDirect"
+APLY_BATCH_DATASET = "dsParamTlsnAplyDirect"
+INDEX_PATH = "/index.do"
+SSO_AUTH_PATH = "/svc/tk/Auth.do"
+SSO_LOGIN_PATH = "/svc/tk/Login.do"
+SSO_RELAY_PATH = "/sso/relay.do"
+RANGE_RE = re.compile(r"bytes=(\d+)-(\d*)$")
+
+LOGIN_PAGE = """<html><head><script>function doLogin() { document.forms[0].submit(); }</script></head><body>
+<form name="form" method="post" action="%s">
+<input type="hidden" name="RelayState" value="/agree/main.jsp">
+<input type="text" id="user_id" name="user_id" value="">
+<input type="password" id="user_password" name="user_password" value="">
+</form></body></html>"""
+
+RELAY_PAGE = """<html><body onload="document.forms[0].submit()">
+<form method="post" action="%s"><input type="hidden" name="ssoToken" value="%s"></form>
+</body></html>"""
+
+
+def compress(body, encoding):
+    if encoding == "gzip":
+        obj = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        return obj.compress(body) + obj.flush()
+    if encoding == "deflate":
+        return zlib.compress(body)
+    if encoding == "br":
+        return brotli.compress(body)
+    raise ValueError(f"알 수 없는 압축 방식: {encoding}")
+
+
+def parse_latency(spec):
+    """지연 분포 문자열을 밀리초 단위 샘플 함수로 변환"""
+    kind, *args = spec.split(":")
+    args = [float(a) for a in args]
+    if kind == "const":
+        return lambda: args[0]
+    if kind == "uniform":
+        return lambda: random.uniform(args[0], args[1])
+    if kind == "exp":
+        return lambda: random.expovariate(1.0 / args[0])
+    if kind == "lognormal":
+        return lambda: random.lognormvariate(math.log(args[0]), args[1])
+    raise ValueError(f"알 수 없는 지연 분포: {spec}")
+
+
+class MockSugangState:
+    """모의 서버의 여석, 세션, 신청 내역"""
+
+    def __init__(self, seat_schedule=None, default_release=(), opens_at=0.0, closes_at=None,
+                 session_ttl=None, session_expiry_rate=0.0, latency="const:0",
+                 sso_user=None, sso_password=None, clock_offset=0.0, index_size=0,
+                 encoding="identity", padding_rows=0, bandwidth=0, outages=(), batch=False):
+        self.started = time.monotonic()
+        # 과목별 여석 발생 시각 목록. 목록에 없는 과목은 default_release 를 따름
+        self.seat_schedule = {k: sorted(v) for k, v in (seat_schedule or {}).items()}
+        self.default_release = sorted(default_release)
+        self.opens_at = opens_at
+        self.closes_at = closes_at
+        self.session_ttl = session_ttl
+        self.session_expiry_rate = session_expiry_rate
+        self.latency = parse_latency(latency)
+        # 지정하지 않으면 비어 있지 않은 아이디/비밀번호는 모두 로그인 성공
+        self.sso_user = sso_user
+        self.sso_password = sso_password
+        self.sso_tokens = set()
+        # Date 헤더에 더할 시계 차이(초), 시계 동기화 테스트용
+        self.clock_offset = clock_offset
+        # /index.do 본문 (실제 페이지 크기를 흉내 내도록 index_size 바이트까지 채움)
+        page = b"<html><body>sugang</body></html>"
+        self.index_page = page + b" " * max(index_size - len(page), 0)
+        # 신청 응답 압축 방식 (auto 면 요청의 Accept-Encoding 에서 고름)
+        self.encoding = encoding
+        # 결과 필드 뒤에 붙는 목록 데이터 행 수 (실제 응답 크기 흉내)
+        self.padding = [{"strSbjNo": f"HALB{i:04d}", "strSbjNm": "과목명", "strDivcls": "1"}
+                        for i in range(padding_rows)]
+        # 응답 전송 속도 제한 (바이트/초, 0 이면 제한 없음)
+        self.bandwidth = bandwidth
+        # 모든 요청에 503 을 돌려줄 장애 구간 목록 [(시작 초, 끝 초)]
+        self.outages = list(outages)
+        # 여러 과목 묶음 신청을 받을지 여부 (받지 않으면 형식 오류로 응답)
+        self.batch = batch
+        self.logins = 0
+        self.taken = {}           # 과목별로 이미 배정된 좌석 수
+        self.registered = set()   # (세션, 과목)
+        self.sessions = {}        # 세션 ID -> 발급 시각
+        self.requests = 0         # 과목별 신청 처리 수 (묶음 요청은 행마다 셈)
+        self.round_trips = 0      # 신청 경로로 들어온 POST 요청 수
+        self.lock = threading.Lock()
+
+    def elapsed(self):
+        return time.monotonic() - self.started
+
+    def in_outage(self):
+        now = self.elapsed()
+        return any(start <= now < end for start, end in self.outages)
+
+    def new_session(self):
+        session_id = secrets.token_hex(16)
+        with self.lock:
+            self.sessions[session_id] = self.elapsed()
+        return session_id
+
+    def sso_login(self, user_id, password):
+        """로그인에 성공하면 중계 토큰을, 실패하면 None 을 돌려줌"""
+        if not user_id or not password:
+            return None
+        if self.sso_user is not None and (user_id, password) != (self.sso_user, self.sso_password):
+            return None
+        token = secrets.token_hex(8)
+        with self.lock:
+            self.sso_tokens.add(token)
+        return token
+
+    def redeem(self, token):
+        with self.lock:
+            if token not in self.sso_tokens:
+                return None
+            self.sso_tokens.discard(token)
+            self.logins += 1
+        return self.new_session()
+
+    def session_valid(self, session_id):
+        # 등록되지 않은 세션도 처음 보면 발급된 것으로 간주 (수동 입력 토큰 흉내)
+        with self.lock:
+            issued = self.sessions.setdefault(session_id, self.elapsed())
+        if self.session_ttl is not None and self.elapsed() - issued > self.session_ttl:
+            return False
+        return random.random() >= self.session_expiry_rate
+
+    def apply(self, session_id, course, div):
+        """신청 결과를 (ErrorCode, ErrorMsg, 성공 여부) 로 돌려줌"""
+        now = self.elapsed()
+        with self.lock:
+            self.requests += 1
+        if not session_id or not self.session_valid(session_id):
+            return -3000, "세션이 만료되었습니다. 다시 로그인하세요.", False
+        if now < self.opens_at or (self.closes_at is not None and now > self.closes_at):
+            return -1, "수강신청 기간이 아닙니다.", False
+        key = (session_id, course)
+        with self.lock:
+            if key in self.registered:
+                return -1, "이미 신청한 과목입니다.", False
+            releases = self.seat_schedule.get(course, self.default_release)
+            released = sum(1 for t in releases if t <= now)
+            if self.taken.get(course, 0) >= released:
+                return -1, "수강 제한 인원을 초과하였습니다.", False
+            self.taken[course] = self.taken.get(course, 0) + 1
+            self.registered.add(key)
+        return 0, "", True
+
+
+def make_handler(state):
+    class MockSugangHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def log_message(self, format, *args):
+            pass
+
+        def date_time_string(self, timestamp=None):
+            # send_response 가 붙이는 Date 헤더에 시계 차이를 반영
+            return formatdate((timestamp or time.time()) + state.clock_offset, usegmt=True)
+
+        def _cookies(self):
+            cookies = {}
+            for part in (self.headers.get("Cookie") or "").split(";"):
+                name, _, value = part.strip().partition("=")
+                if name:
+                    cookies[name] = value
+            return cookies
+
+        def _send(self, status, body, content_type="application/json; charset=utf-8", extra=None):
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            for name, value in (extra or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            if self.command != "HEAD":
+                self.wfile.write(body)
+
+        def _index(self):
+            extra = {}
+            if "SGJSESSIONID" not in self._cookies():
+                extra["Set-Cookie"] = f"SGJSESSIONID={state.new_session()}; Path=/; HttpOnly"
+            body = state.index_page
+            match = RANGE_RE.match(self.headers.get("Range") or "")
+            if match and self.command == "GET":
+                start = int(match.group(1))
+                end = min(int(match.group(2) or len(body) - 1), len(body) - 1)
+                if start <= end:
+                    extra["Content-Range"] = f"bytes {start}-{end}/{len(body)}"
+                    self._send(206, body[start:end + 1], "text/html; charset=utf-8", extra)
+                    return
+            self._send(200, body, "text/html; charset=utf-8", extra)
+
+        def _form(self, body):
+            return {k: v[0] for k, v in urllib.parse.parse_qs(body.decode("utf-8"), keep_blank_values=True).items()}
+
+        def _sso(self, path, body):
+            if path == SSO_AUTH_PATH:
+                self._send(200, (LOGIN_PAGE % SSO_LOGIN_PATH).encode("utf-8"), "text/html; charset=utf-8")
+            elif path == SSO_LOGIN_PATH:
+                form = self._form(body)
+                token = state.sso_login(form.get("user_id"), form.get("user_password"))
+                if token is None:
+                    self._send(200, (LOGIN_PAGE % SSO_LOGIN_PATH).encode("utf-8"), "text/html; charset=utf-8")
+                else:
+                    self._send(200, (RELAY_PAGE % (SSO_RELAY_PATH, token)).encode("utf-8"), "text/html; charset=utf-8")
+            else:
+                session_id = state.redeem(self._form(body).get("ssoToken"))
+                if session_id is None:
+                    self._send(403, b"invalid token", "text/plain")
+                    return
+                self.send_response(302)
+                self.send_header("Location", INDEX_PATH)
+                self.send_header("Set-Cookie", f"SGJSESSIONID={session_id}; Path=/; HttpOnly")
+                self.send_header("Set-Cookie", f"WMONID={secrets.token_hex(6)}; Path=/")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+        def do_HEAD(self):
+            if state.in_outage():
+                self._send(503, b"")
+            elif self.path.split("?")[0] == INDEX_PATH:
+                self._index()
+            else:
+                self._send(404, b"")
+
+        def do_GET(self):
+            path = self.path.split("?")[0]
+            if state.in_outage():
+                self._send(503, b"service unavailable", "text/plain")
+            elif path == INDEX_PATH:
+                self._index()
+            elif path == SSO_AUTH_PATH:
+                self._sso(path, b"")
+            else:
+                self._send(404, b"not found", "text/plain")
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            body = self.rfile.read(length)
+            path = self.path.split("?")[0]
+            if path in (SSO_LOGIN_PATH, SSO_RELAY_PATH):
+                self._sso(path, body)
+                return
+            if path != APLY_PATH:
+                self._send(404, b"not found", "text/plain")
+                return
+            if state.in_outage():
+                self._send(503, b"service unavailable", "text/plain")
+                return
+            time.sleep(max(state.latency(), 0.0) / 1000.0)
+            with state.lock:
+                state.round_trips += 1
+            session_id = self._cookies().get("SGJSESSIONID")
+            try:
+                datasets, _ = decode(body)
+            except ValueError:
+                datasets = {}
+            if APLY_BATCH_DATASET in datasets and not (session_id and state.session_valid(session_id)):
+                # 세션은 데이터셋을 보기 전에 검사하므로 묶음 요청도 행별 결과 없이 최상위 -3000 으로 응답
+                with state.lock:
+                    state.requests += len(datasets[APLY_BATCH_DATASET].rows)
+                payload = {"ErrorCode": -3000, "ErrorMsg": "세션이 만료되었습니다. 다시 로그인하세요."}
+            elif APLY_BATCH_DATASET in datasets and state.batch:
+                rows = []
+                for row in datasets[APLY_BATCH_DATASET].rows:
+                    course, div = row.get("strSbjNo", ""), row.get("strDivcls", "")
+                    code, message, granted = state.apply(session_id, course, div)
+                    rows.append({"strSbjNo": course, "strDivcls": div, "ErrorCode": code, "ErrorMsg": message,
+                                 "strRtnCd": "true" if granted else "false"})
+                payload = {"ErrorCode": 0, "ErrorMsg": "", "dsResult": rows}
+            elif APLY_DATASET in datasets:
+                row = datasets[APLY_DATASET].row
+                course, div = row.get("strSbjNo", ""), row.get("strDivcls", "")
+                code, message, granted = state.apply(session_id, course, div)
+                payload = {"ErrorCode": code, "ErrorMsg": message}
+                if code == 0:
+                    payload["dmResult"] = {"strRtnCd": "true" if granted else "false", "strSbjNo": course, "strDivcls": div}
+            else:
+                payload = {"ErrorCode": -1, "ErrorMsg": "요청 형식이 올바르지 않습니다."}
+            if state.padding:
+                payload["dsTlsnList"] = state.padding
+            body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+            encoding = self._choose_encoding()
+            extra = {}
+            if encoding != "identity":
+                body = compress(body, encoding)
+                extra["Content-Encoding"] = encoding
+            if state.bandwidth:
+                time.sleep(len(body) / state.bandwidth)
+            self._send(200, body, extra=extra)
+
+        def _choose_encoding(self):
+            if state.encoding != "auto":
+                return state.encoding
+            accepted = [e.strip().split(";")[0] for e in (self.headers.get("Accept-Encoding") or "").split(",")]
+            for encoding in ("br", "gzip", "deflate"):
+                if encoding in accepted and (encoding != "br" or brotli is not None):
+                    return encoding
+            return "identity"
+
+    return MockSugangHandler
+
+
+class _QuietHTTPServer(ThreadingHTTPServer):
+    def handle_error(self, request, client_address):
+        # 헤지 요청 취소 등으로 클라이언트가 먼저 끊은 경우는 정상이므로 출력하지 않음
+        if isinstance(sys.exc_info()[1], ConnectionError):
+            return
+        super().handle_error(request, client_address)
+
+
+class MockSugangServer:
+    """백그라운드 스레드에서 도는 모의 수강신청 서버"""
+
+    def __init__(self, host="127.0.0.1", port=0, certfile=None, keyfile=None, **state_options):
+        self.state = MockSugangState(**state_options)
+        self.httpd = _QuietHTTPServer((host, port), make_handler(self.state))
+        if certfile:
+            # 핸드셰이크는 accept 할 때 함 (세션 티켓은 OpenSSL 기본값대로 발급)
+            context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+            context.load_cert_chain(certfile, keyfile)
+            self.httpd.socket = context.wrap_socket(self.httpd.socket, server_side=True)
+        self.httpd.daemon_threads = True
+        self.thread = None
+
+    @property
+    def address(self):
+        return self.httpd.server_address[:2]
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+@contextmanager
+def use_target(server, ssl_context=None):
+    """sugang_request 가 모의 서버로 요청하게 하고, 끝나면 원래 대상과 쿠키, 묶음 지원 여부를 되돌림
+
+    테스트가 실행 순서에 따라 서로의 전역 상태를 물려받지 않도록 씁니다.
+    HTTPS 모의 서버는 인증서를 믿는 ssl_context 를 함께 줍니다.
+    """
+    import sugang_request
+    saved = (sugang_request.POOL, dict(sugang_request.HEADERS), sugang_request.SESSIONS,
+             sugang_request.BATCH_SUPPORTED)
+    host, port = server.address
+    sugang_request.set_target(host, port, use_tls=ssl_context is not None, ssl_context=ssl_context)
+    try:
+        yield sugang_request.POOL
+    finally:
+        sugang_request.POOL.close()
+        sugang_request.POOL, headers, sugang_request.SESSIONS, sugang_request.BATCH_SUPPORTED = saved
+        sugang_request.HEADERS.clear()
+        sugang_request.HEADERS.update(headers)
+        sugang_request.CACHE.set_headers(sugang_request.request_headers())
+
+
+def parse_schedule(values):
+    """'학수번호=초,초' 형식 목록을 여석 발생 시각 딕셔너리로 변환"""
+    schedule = {}
+    for value in values or []:
+        course, _, times = value.partition("=")
+        schedule[course] = [float(t) for t in times.split(",") if t]
+    return schedule
+
+
+def add_server_arguments(parser):
+    parser.add_argument("--latency", default="const:0", help="응답 지연 분포 (밀리초)")
+    parser.add_argument("--seats", action="append", metavar="학수번호=초,초", help="과목별 여석 발생 시각")
+    parser.add_argument("--default-release", default="", help="기본 여석 발생 시각 (쉼표 구분, 초)")
+    parser.add_argument("--opens-at", type=float, default=0.0, help="수강신청 시작 시각 (서버 시작 기준 초)")
+    parser.add_argument("--closes-at", type=float, default=None, help="수강신청 종료 시각")
+    parser.add_argument("--session-ttl", type=float, default=None, help="세션 유효 시간(초)")
+    parser.add_argument("--session-expiry-rate", type=float, default=0.0, help="요청마다 세션이 만료될 확률")
+    parser.add_argument("--sso-user", default=None, help="SSO 로그인 허용 아이디 (없으면 모두 허용)")
+    parser.add_argument("--sso-password", default=None, help="SSO 로그인 허용 비밀번호")
+    parser.add_argument("--clock-offset", type=float, default=0.0, help="Date 헤더 시계 차이(초)")
+    parser.add_argument("--index-size", type=int, default=0, help="/index.do 본문 크기(바이트)")
+    parser.add_argument("--encoding", default="identity", choices=["identity", "gzip", "deflate", "br", "auto"],
+                        help="신청 응답 압축 방식 (auto: 요청의 Accept-Encoding 에 따름)")
+    parser.add_argument("--padding-rows", type=int, default=0, help="신청 응답 뒤에 붙일 목록 데이터 행 수")
+    parser.add_argument("--bandwidth", type=float, default=0, help="응답 전송 속도 제한(바이트/초)")
+    parser.add_argument("--outage", action="append", metavar="시작-끝", help="모든 요청에 503 을 돌려줄 구간(초)")
+    parser.add_argument("--batch", action="store_true", help="여러 과목을 한 요청에 담은 묶음 신청을 받음")
+
+
+def server_options(args):
+    return {
+        "latency": args.latency,
+        "seat_schedule": parse_schedule(args.seats),
+        "default_release": [float(t) for t in args.default_release.split(",") if t],
+        "opens_at": args.opens_at,
+        "closes_at": args.closes_at,
+        "session_ttl": args.session_ttl,
+        "session_expiry_rate": args.session_expiry_rate,
+        "sso_user": args.sso_user,
+        "sso_password": args.sso_password,
+        "clock_offset": args.clock_offset,
+        "index_size": args.index_size,
+        "encoding": args.encoding,
+        "padding_rows": args.padding_rows,
+        "bandwidth": args.bandwidth,
+        "outages": [tuple(float(t) for t in window.split("-")) for window in args.outage or []],
+        "batch": args.batch,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="모의 수강신청 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--certfile", default=None, help="HTTPS 로 응답할 때 쓸 인증서 (PEM)")
+    parser.add_argument("--keyfile", default=None, help="인증서 개인 키 (PEM)")
+    add_server_arguments(parser)
+    args = parser.parse_args()
+
+    server = MockSugangServer(args.host, args.port, args.certfile, args.keyfile, **server_options(args))
+    host, port = server.address
+    scheme = "https" if args.certfile else "http"
+    print(f"모의 수강신청 서버 실행 중: {scheme}://{host}:{port}{APLY_PATH}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
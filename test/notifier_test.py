@@ -0,0 +1,92 @@
+"""
+알림 전송기 테스트
+
+알림을 넣는 쪽이 전송을 기다리지 않는지, 같은 종류 알림이 묶이고 급한 알림은 묶이지 않는지,
+큐가 가득 차면 덜 급한 알림부터 버리는지 로컬 ntfy 흉내 서버로 확인합니다.
+pytest 로 실행하거나 직접 실행할 수 있습니다:
+python test/notifier_test.py
+"""
+
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from notifier import PRIORITY_DEFAULT, PRIORITY_URGENT, AlertQueue, Notifier
+
+
+class FakeNtfy:
+    """받은 알림을 (본문, Priority 헤더) 로 기록하고 delay 초 뒤에 응답"""
+
+    def __init__(self, delay=0.0):
+        self.received = []
+        owner = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers["Content-Length"])).decode("utf-8")
+                time.sleep(delay)
+                owner.received.append((body, self.headers["Priority"]))
+                self.send_response(200)
+                self.send_header("Content-Length", "2")
+                self.end_headers()
+                self.wfile.write(b"{}")
+
+            def log_message(self, format, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.httpd.daemon_threads = True
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def notifier(self, **options):
+        host, port = self.httpd.server_address[:2]
+        return Notifier("topic", host=host, port=port, use_tls=False, **options)
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def test_submit_does_not_wait_and_coalesces():
+    server = FakeNtfy(delay=0.2)
+    try:
+        notifier = server.notifier(coalesce_interval=0.5)
+        start = time.perf_counter()
+        assert notifier.submit("인원 초과", kind="over_capacity")
+        assert not notifier.submit("인원 초과", kind="over_capacity")
+        assert not notifier.submit("인원 초과", kind="over_capacity")
+        assert notifier.submit("성공!", kind="over_capacity", priority=PRIORITY_URGENT)
+        # 서버가 느려도 넣는 쪽은 바로 돌아옴
+        assert time.perf_counter() - start < 0.1
+        assert notifier.flush(5)
+        time.sleep(0.5)
+        assert notifier.submit("인원 초과", kind="over_capacity")
+        assert notifier.flush(5)
+    finally:
+        server.close()
+    assert sorted(server.received) == sorted([("인원 초과", "3"), ("성공!", "5"),
+                                              ("인원 초과 (같은 알림 2회 생략)", "3")])
+    assert notifier.sent == 3 and notifier.failed == 0
+
+
+def test_queue_drops_least_urgent():
+    queue = AlertQueue(2)
+    assert queue.put(PRIORITY_DEFAULT, "a")
+    assert queue.put(PRIORITY_DEFAULT, "b")
+    assert not queue.put(PRIORITY_DEFAULT, "c")
+    # 급한 알림은 덜 급한 알림을 밀어내고 들어감
+    assert queue.put(PRIORITY_URGENT, "urgent")
+    assert queue.dropped == 2
+    assert [queue.get(0), queue.get(0), queue.get(0)] == ["urgent", "a", None]
+
+
+if __name__ == "__main__":
+    test_submit_does_not_wait_and_coalesces()
+    test_queue_drops_least_urgent()
+    print("통과")
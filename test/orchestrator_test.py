@@ -0,0 +1,90 @@
+"""
+여러 계정 동시 실행 테스트
+
+계정 파일 검사와, 모의 서버에 여러 계정을 함께 돌렸을 때 계정마다 자기 세션으로만
+신청하는지, 전송 속도 상한을 모든 계정이 함께 지키는지, 진행 상황이 계정별로 모이는지 확인합니다.
+pytest 로 실행하거나 직접 실행할 수 있습니다:
+python test/orchestrator_test.py
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import orchestrator
+from mock_sugang_server import MockSugangServer, use_target
+from orchestrator import AccountWorker, parse_accounts, run_accounts
+from scheduler import FixedRateScheduler
+
+ACCOUNTS = {"accounts": [
+    {"name": "a1", "SGJSESSIONID": "token-a1", "subject_data": {"HALB0001": 1}},
+    {"name": "a2", "SGJSESSIONID": "token-a2", "subject_data": {"HALB0001": 1, "HALB0002": [2, 1]}},
+    {"name": "a3", "id": "user3", "password": "pw", "sessions": 2, "subject_data": {"HALB0002": 1}},
+]}
+
+
+def test_parse_accounts():
+    accounts = parse_accounts(ACCOUNTS)
+    assert [a.name for a in accounts] == ["a1", "a2", "a3"]
+    assert accounts[1].subject_data == {"HALB0001": 1, "HALB0002": (2, 1)}
+    assert accounts[0].tokens == ("token-a1", "") and accounts[2].sessions == 2
+    for bad in ({"accounts": []},
+                {"accounts": [{"name": "x", "subject_data": {"HALB0001": 1}}]},
+                {"accounts": [ACCOUNTS["accounts"][0], ACCOUNTS["accounts"][0]]},
+                {"accounts": [{"name": "x", "SGJSESSIONID": "t", "subject_data": {"bad": 1}}]}):
+        try:
+            parse_accounts(bad)
+        except ValueError:
+            continue
+        raise AssertionError(bad)
+
+
+def test_accounts_share_rate_but_not_sessions():
+    logins = []
+    alerts = []
+
+    def login(user_id, password):
+        logins.append(user_id)
+        return {"SGJSESSIONID": f"token-{user_id}-{len(logins)}", "WMONID": "w"}
+
+    # 두 과목 모두 처음엔 한 자리, 0.3초 뒤에 한 자리가 더 남
+    seats = {"HALB0001": [0, 0.3], "HALB0002": [0, 0.3]}
+    rate = 40.0
+    send_mobile_alert = orchestrator.send_mobile_alert
+    orchestrator.send_mobile_alert = lambda message, kind=None, urgent=False: alerts.append(message)
+    try:
+        with MockSugangServer(seat_schedule=seats) as server, use_target(server):
+            workers = [AccountWorker(account) for account in parse_accounts(ACCOUNTS)]
+            start = time.monotonic()
+            rows = asyncio.run(asyncio.wait_for(run_accounts(
+                workers, FixedRateScheduler(rate), concurrency=2, retry_delay=0.01,
+                login=login, report_interval=0), 10))
+            elapsed = time.monotonic() - start
+            registered = set(server.state.registered)
+            requests = server.state.requests
+    finally:
+        orchestrator.send_mobile_alert = send_mobile_alert
+
+    assert logins == ["user3", "user3"]
+    assert all(not row["pending"] and row["status"] == "done" for row in rows)
+    # 모의 서버는 과목 단위로 좌석을 세므로 a2 는 두 분반 중 먼저 도착한 쪽으로 신청됨
+    assert rows[1]["granted"]["HALB0001"] == 1 and rows[1]["granted"]["HALB0002"] in (1, 2)
+    # 계정마다 자기 세션으로만 좌석을 받음
+    tokens = {"a1": {"token-a1"}, "a2": {"token-a2"}, "a3": {"token-user3-1", "token-user3-2"}}
+    for row in rows:
+        for course in row["granted"]:
+            assert any((token, course) in registered for token in tokens[row["account"]]), (row, registered)
+    assert len(registered) == 4
+    assert sum("성공" in message for message in alerts) == 4
+    assert all(message.startswith("[a") for message in alerts)
+    # 모든 계정을 합친 전송 속도가 상한을 넘지 않음 (첫 요청은 바로 나감)
+    assert requests <= rate * elapsed + 1
+
+
+if __name__ == "__main__":
+    test_parse_accounts()
+    test_accounts_share_rate_but_not_sessions()
+    print("통과")
@@ -0,0 +1,90 @@
+"""
+요청 조립 비용 마이크로벤치마크
+
+전송 한 번마다 요청을 만드는 세 가지 경로의 CPU 시간과 메모리 할당을 비교합니다.
+1. 기존 urllib 방식 (폼 dict -> urlencode -> urllib.request.Request, 헤더 복사)
+2. 연결 풀 방식 (폼 dict -> urlencode -> 헤더 dict 병합 -> 바이트열 조립)
+3. 요청 캐시 방식 (미리 조립한 바이트열 조회)
+
+python test/request_cache_bench.py [반복 횟수]
+"""
+
+import os
+import sys
+import time
+import timeit
+import tracemalloc
+import urllib.parse
+import urllib.request
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import sugang_request
+from connection_pool import build_request
+
+COURSE, DIV = "HALB0001", 1
+
+
+def legacy_path():
+    # 바뀌기 전 sugang_request 의 폼 조립을 그대로 옮김 (기준선이 새 코덱을 거치지 않도록)
+    data = {
+        '_AUTH_MENU_KEY': '',
+        '@d1#strCampusRcd': 'CMN001.0001',
+        '@d1#strSbjNo': COURSE,
+        '@d1#strDivcls': str(DIV),
+        '@d#': '@d1#',
+        '@d1#': 'dmParamTlsnAplyDirect',
+        '@d1#tp': 'dm'
+    }
+    data_encoded = urllib.parse.urlencode(data).encode('utf-8')
+    request = urllib.request.Request(
+        url='https://sugang.smu.ac.kr/UcrTlsn/tlsnAplyDirect.do',
+        data=data_encoded,
+        headers=sugang_request.HEADERS,
+        method='POST'
+    )
+    return request.header_items()
+
+
+def pool_path():
+    headers = sugang_request.request_headers()
+    return build_request('POST', sugang_request.APLY_PATH, headers, sugang_request.encode_form(COURSE, DIV))
+
+
+def cache_path():
+    return sugang_request.CACHE.get(COURSE, DIV)
+
+
+def measure_alloc(func, number):
+    # 호출 한 번이 잠깐 잡는 메모리(최대치)와 남기는 블록 수의 평균
+    tracemalloc.start()
+    func()
+    peak_total = 0
+    for _ in range(number):
+        tracemalloc.reset_peak()
+        base, _ = tracemalloc.get_traced_memory()
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+        peak_total += peak - base
+    tracemalloc.stop()
+    return peak_total / number
+
+
+def main():
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    sugang_request.set_session("0123456789ABCDEF0123456789ABCDEF", "WMONID0123")
+    sugang_request.prebuild_requests([(COURSE, DIV)])
+    # 캐시는 Cookie 줄을 헤더 끝에 두므로 헤더 순서는 무시하고 비교
+    assert sorted(cache_path().split(b"\r\n")) == sorted(pool_path().split(b"\r\n")), \
+        "캐시된 요청과 새로 조립한 요청이 달라졌습니다."
+
+    print(f"요청 조립 마이크로벤치마크 (반복 {number}회)\n")
+    print(f"{'경로':<14}{'CPU(us/회)':>12}{'할당(B/회)':>14}")
+    for name, func in (("기존 urllib", legacy_path), ("연결 풀 조립", pool_path), ("요청 캐시", cache_path)):
+        cpu = min(timeit.repeat(func, number=number, repeat=3, timer=time.process_time)) / number * 1e6
+        alloc = measure_alloc(func, min(number, 5000))
+        print(f"{name:<14}{cpu:>12.3f}{alloc:>14.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+미리 조립한 요청 캐시 테스트
+
+캐시가 만든 요청 바이트열이 매번 새로 조립한 요청과 같은지, 세션이 바뀌면 Cookie 줄만
+바뀌는지, 대상 서버가 바뀌면 다시 조립되는지, 다른 세션의 Cookie 줄을 끼울 수 있는지 확인합니다.
+pytest 로 실행하거나 직접 실행할 수 있습니다:
+python test/request_cache_test.py
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from connection_pool import build_request
+from request_cache import RequestCache
+
+PATH = "/UcrTlsn/tlsnAplyDirect.do"
+
+
+def encode(course, div):
+    return f"sbj={course}&div={div}".encode()
+
+
+def headers(host, cookie):
+    return {"Host": host, "Connection": "keep-alive", "Cookie": cookie,
+            "Content-Type": "application/x-www-form-urlencoded"}
+
+
+def fresh(host, cookie, course, div):
+    # 캐시 없이 매번 조립하는 요청 (Cookie 줄 위치만 캐시와 맞춤)
+    static = {k: v for k, v in headers(host, cookie).items() if k != "Cookie"}
+    return build_request("POST", PATH, dict(static, Cookie=cookie), encode(course, div))
+
+
+def test_cached_payload_matches_fresh_build():
+    cache = RequestCache("POST", PATH, headers("sugang", "S=1"), encode)
+    assert cache.prebuild([("HALB0001", 1), ("HALB0002", 3)]) == 2
+    assert cache.get("HALB0001", 1) == fresh("sugang", "S=1", "HALB0001", 1)
+    # 같은 객체를 다시 돌려줌 (요청마다 조립하지 않음)
+    assert cache.get("HALB0002", 3) is cache.get("HALB0002", 3)
+
+
+def test_cookie_and_header_changes():
+    cache = RequestCache("POST", PATH, headers("sugang", "S=1"), encode)
+    cache.prebuild([("HALB0001", 1)])
+    cache.set_cookie("S=2")
+    assert cache.get("HALB0001", 1) == fresh("sugang", "S=2", "HALB0001", 1)
+    cache.set_headers(headers("localhost:8080", "S=3"))
+    assert len(cache) == 1
+    assert cache.get("HALB0001", 1) == fresh("localhost:8080", "S=3", "HALB0001", 1)
+    # 세션 풀에서 고른 세션의 Cookie 줄을 끼우면 기본 쿠키는 들어가지 않음
+    other = cache.get("HALB0001", 1, cookie_line=b"Cookie: S=9\r\n")
+    assert b"S=9" in other and b"S=3" not in other
+    body = b"batch=1"
+    assert cache.payload_for(body).endswith(b"Cookie: S=3\r\nContent-Length: 7\r\n\r\nbatch=1")
+
+
+if __name__ == "__main__":
+    test_cached_payload_matches_fresh_build()
+    test_cookie_and_header_changes()
+    print("통과")
@@ -0,0 +1,60 @@
+"""
+응답 판별 방식 마이크로벤치마크
+
+기존 main.py 의 문자열 포함 검사(본문 전체 디코딩 후 "in" 검사)와
+response_parser 의 규칙 테이블 파서(청크 단위, 결과 확정 시 중단)를 비교합니다.
+python test/response_parser_bench.py [반복 횟수]
+"""
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from response_parser import ResponseParser
+
+CHUNK = 1024
+# 실제 응답처럼 결과 필드 뒤에 데이터셋이 길게 붙은 본문을 가정
+PADDING = ',"dsTlsnList":[' + ','.join('{"strSbjNo":"HALB%04d","strSbjNm":"과목명"}' % i for i in range(200)) + ']}'
+BODIES = {
+    "세션 만료": ('{"ErrorCode":-3000,"ErrorMsg":"세션이 만료되었습니다."' + PADDING).encode("utf-8"),
+    "인원 초과": ('{"ErrorCode":-1,"ErrorMsg":"제한 인원을 초과하였습니다."' + PADDING).encode("utf-8"),
+    "성공": ('{"ErrorCode":0,"ErrorMsg":"","dmResult":{"strRtnCd":"true"}' + PADDING).encode("utf-8"),
+}
+
+
+def legacy_check(body):
+    response_text = body.decode("utf-8")
+    if "-3000" in response_text:
+        return "session_expired"
+    elif "초과" in response_text:
+        return "over_capacity"
+    elif "기간" in response_text:
+        return "out_of_period"
+    elif "true" in response_text:
+        return "success"
+    return None
+
+
+def parser_check(body):
+    parser = ResponseParser()
+    for start in range(0, len(body), CHUNK):
+        result = parser.feed(body[start:start + CHUNK])
+        if result is not None:
+            return result
+    return parser.finish()
+
+
+def main():
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    print(f"응답 판별 마이크로벤치마크 (반복 {number}회, 본문 약 {len(BODIES['성공']) // 1024}KB)\n")
+    print(f"{'응답 종류':<10}{'기존(us)':>12}{'파서(us)':>12}{'배율':>8}")
+    for name, body in BODIES.items():
+        legacy = min(timeit.repeat(lambda: legacy_check(body), number=number, repeat=3)) / number * 1e6
+        parsed = min(timeit.repeat(lambda: parser_check(body), number=number, repeat=3)) / number * 1e6
+        print(f"{name:<10}{legacy:>12.2f}{parsed:>12.2f}{legacy / parsed:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+tlsnAplyDirect 응답 파서 코퍼스 테스트
+
+response_corpus.jsonl 의 응답 본문마다 기대 결과를 확인합니다.
+pytest 로 실행하거나 직접 실행할 수 있습니다:
+python test/response_parser_test.py
+"""
+
+import os
+import sys
+import json
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from response_parser import ResponseParser, parse_response
+
+CORPUS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "response_corpus.jsonl")
+
+
+def load_corpus():
+    with open(CORPUS_PATH, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def check_case(case, result):
+    assert result.outcome.value == case["outcome"], (case["name"], result)
+    assert result.code == case["code"], (case["name"], result)
+    assert result.granted == case["granted"], (case["name"], result)
+    assert result.retry == case["retry"], (case["name"], result)
+
+
+def test_corpus_whole_body():
+    for case in load_corpus():
+        check_case(case, parse_response(case["body"]))
+
+
+def test_corpus_byte_by_byte():
+    # 청크 경계가 어디서 잘려도 같은 결과가 나와야 함
+    for case in load_corpus():
+        body = case["body"].encode("utf-8")
+        parser = ResponseParser()
+        result = None
+        for i in range(len(body)):
+            result = parser.feed(body[i:i + 1])
+            if result is not None:
+                break
+        check_case(case, result or parser.finish())
+
+
+def test_early_exit():
+    # 결과가 정해진 뒤의 청크는 읽지 않아도 됨
+    parser = ResponseParser()
+    result = parser.feed(b'{"ErrorCode":-3000,')
+    assert result is not None and result.code == -3000
+    assert parser.feed(b'"ErrorMsg":"' + b'x' * 10000 + b'"}') is result
+    assert len(parser.buffer) < 32
+
+
+def test_server_error_status():
+    result = parse_response(b"<html>Internal Server Error</html>", status=500)
+    assert result.outcome.value == "server_error" and result.retry
+
+
+if __name__ == "__main__":
+    for name, func in list(globals().items()):
+        if name.startswith("test_") and callable(func):
+            func()
+            print(f"통과: {name}")
@@ -0,0 +1,86 @@
+"""
+재시도 정책과 서킷 브레이커 테스트
+
+실패 종류 분류, 백오프 상한, 브레이커의 열림/복구 확인/닫힘 전환을 가짜 시계로 확인합니다.
+pytest 로 실행하거나 직접 실행할 수 있습니다:
+python test/retry_policy_test.py
+"""
+
+import http.client
+import os
+import random
+import socket
+import ssl
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from response_parser import parse_response
+from retry_policy import Backoff, CircuitBreaker, Failure, RetryPolicy, classify
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_classify():
+    assert classify(socket.gaierror(-2, "Name or service not known")) == Failure.DNS
+    assert classify(ssl.SSLError(1, "handshake failure")) == Failure.TLS
+    assert classify(socket.timeout("timed out")) == Failure.TIMEOUT
+    assert classify(ConnectionResetError()) == Failure.RESET
+    assert classify(http.client.RemoteDisconnected()) == Failure.RESET
+    assert classify(ValueError()) == Failure.OTHER
+    assert classify(result=parse_response(b"", 503)) == Failure.SERVER_ERROR
+    assert classify(result=parse_response('{"ErrorMsg":"수강 제한 인원을 초과하였습니다."}'.encode())) is None
+
+
+def test_backoff_grows_to_maximum():
+    backoff = Backoff(base=0.1, maximum=1.0, jitter=0.5)
+    rng = random.Random(1)
+    delays = [backoff.delay(n, rng) for n in range(1, 10)]
+    assert 0.05 <= delays[0] <= 0.1
+    assert all(0.5 <= d <= 1.0 for d in delays[5:])
+
+
+def test_breaker_opens_probes_and_closes():
+    clock = FakeClock()
+    probes = []
+    breaker = CircuitBreaker(probe=lambda: probes.append(clock.now) or len(probes) > 1,
+                             threshold=3, cooldown=1.0, clock=clock)
+    policy = RetryPolicy(breaker=breaker, rng=random.Random(0))
+    for _ in range(3):
+        policy.record(error=ConnectionResetError())
+    assert policy.open and breaker.remaining() == 1.0
+
+    # 첫 복구 확인은 실패 -> cooldown 두 배
+    clock.now = 1.0
+    assert breaker.try_probe() is False
+    assert breaker.state == CircuitBreaker.OPEN and breaker.cooldown == 2.0
+    clock.now = 2.0
+    assert breaker.try_probe() is False and probes == [1.0]
+
+    clock.now = 3.0
+    breaker.wait(sleep=lambda seconds: None)
+    assert not policy.open and probes == [1.0, 3.0]
+    assert breaker.cooldown == 1.0
+
+
+def test_other_failures_do_not_open_breaker():
+    breaker = CircuitBreaker(threshold=2, clock=FakeClock())
+    policy = RetryPolicy(breaker=breaker)
+    for _ in range(5):
+        failure, delay = policy.record(error=ValueError())
+    assert failure == Failure.OTHER and delay > 0
+    assert not policy.open
+
+
+if __name__ == "__main__":
+    test_classify()
+    test_backoff_grows_to_maximum()
+    test_breaker_opens_probes_and_closes()
+    test_other_failures_do_not_open_breaker()
+    print("통과")
@@ -0,0 +1,64 @@
+"""
+전송 스케줄러 테스트
+
+jitter 를 넣어도 전송 간격이 호스트별 상한(고정 속도의 rate, 적응형의 max_rate)보다
+짧아지지 않는지, 적응형 스케줄러가 오류에 속도를 줄이고 정상 응답에 다시 올리는지
+가짜 시계로 확인합니다.
+pytest 로 실행하거나 직접 실행할 수 있습니다:
+python test/scheduler_test.py
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scheduler import AdaptiveScheduler, FixedRateScheduler
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def slot_gaps(scheduler, count=2000):
+    # 시계를 멈춘 채 슬롯을 잇달아 예약하면 예약 시각의 차이가 곧 전송 간격
+    slots = [scheduler.reserve() for _ in range(count)]
+    return [b - a for a, b in zip(slots, slots[1:])]
+
+
+def test_jitter_never_exceeds_ceiling():
+    fixed = FixedRateScheduler(10.0, jitter=0.3, clock=FakeClock())
+    gaps = slot_gaps(fixed)
+    assert min(gaps) >= 0.1 - 1e-9
+    # 흔들림은 남아 있음
+    assert max(gaps) > 0.12
+
+    adaptive = AdaptiveScheduler(initial_rate=2.0, max_rate=2.0, jitter=0.3, clock=FakeClock())
+    assert min(slot_gaps(adaptive)) >= 0.5 - 1e-9
+    # 상한보다 느리게 보내는 중이면 상한까지는 간격을 줄일 수 있음
+    slower = AdaptiveScheduler(initial_rate=1.0, max_rate=2.0, jitter=0.3, clock=FakeClock())
+    gaps = slot_gaps(slower)
+    assert min(gaps) >= 0.5 - 1e-9 and min(gaps) < 0.9
+
+
+def test_adaptive_rate():
+    clock = FakeClock()
+    scheduler = AdaptiveScheduler(initial_rate=1.0, min_rate=0.25, max_rate=2.0, clock=clock)
+    clock.now = 1.0
+    scheduler.observe(0.1)
+    assert scheduler.rate == 1.1
+    scheduler.observe(0.1, error=True)
+    assert scheduler.rate == 0.55
+    # 감소 대기 시간 안의 오류는 한 번만 반영
+    scheduler.observe(5.0)
+    assert scheduler.rate == 0.55
+
+
+if __name__ == "__main__":
+    test_jitter_never_exceeds_ceiling()
+    test_adaptive_rate()
+    print("통과")
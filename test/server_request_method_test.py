@@ -1,163 +1,239 @@
-import requests
-import time
+"""
+서버 요청 방식 벤치마크
+
+로컬 모의 서버(mock_sugang_server.py)를 띄우고 요청 방식별 지연을 perf_counter_ns 로 잽니다.
+- keep-alive 연결 재사용 vs 매번 새 연결
+- 순차 전송 vs 동시 전송 (묶음 하나를 보내는 데 걸린 시간)
+- HEAD vs 1바이트 Range GET vs 전체 GET (세션 확인용 요청 비교)
+- HTTP/1.1 vs HTTP/2 (httpx[http2] 가 설치되어 있고 --url 로 HTTP/2 서버를 지정한 경우만)
+
+워밍업 후 반복 측정한 p50/p90/p99 를 JSON 으로 저장하고, --baseline 으로 이전 결과와 비교해
+p50 또는 p99 가 허용치보다 느려진 항목이 있으면 종료 코드 1 로 끝납니다.
+
+python test/server_request_method_test.py --iterations 500 --output bench_methods.json
+python test/server_request_method_test.py --baseline bench_methods.json --tolerance 0.25
+"""
+
+import argparse
+import json
+import math
+import os
+import platform
 import statistics
-from tabulate import tabulate
-
-
-
-def test_request_methods(url, test_count=10):
-    """HEAD와 GET 요청의 속도를 여러 번 테스트하여 비교합니다."""
-    print(f"서버 요청 방식 속도 비교 테스트: {url}")
-    print(f"테스트 횟수: {test_count}회\n")
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from connection_pool import ConnectionPool
+from mock_sugang_server import INDEX_PATH, MockSugangServer, add_server_arguments, server_options
+
+
+def percentile(sorted_values, q):
+    # 선형 보간 백분위수
+    if not sorted_values:
+        return None
+    position = (len(sorted_values) - 1) * q / 100.0
+    low = math.floor(position)
+    high = min(low + 1, len(sorted_values) - 1)
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (position - low)
+
+
+def summarize(samples_ns):
+    values = sorted(ns / 1e6 for ns in samples_ns)
+    return {
+        "n": len(values),
+        "mean_ms": statistics.mean(values),
+        "stdev_ms": statistics.stdev(values) if len(values) > 1 else 0.0,
+        "min_ms": values[0],
+        "p50_ms": percentile(values, 50),
+        "p90_ms": percentile(values, 90),
+        "p99_ms": percentile(values, 99),
+        "max_ms": values[-1],
+    }
 
-    # 결과 저장용 리스트
-    head_times = []
-    get_times = []
-    results = []
 
-    # 공통 헤더 설정
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
-        'Accept': '*/*',
-        'Connection': 'keep-alive'
+def measure(run_once, iterations, warmup):
+    """워밍업을 버리고 iterations 번 잰 값(ns) 목록"""
+    for _ in range(warmup):
+        run_once()
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter_ns()
+        run_once()
+        samples.append(time.perf_counter_ns() - start)
+    return samples
+
+
+class Scenarios:
+    """비교 항목별 요청 함수 (host, port 의 HTTP/1.1 서버 대상)"""
+
+    def __init__(self, host, port, batch, workers):
+        self.host = host
+        self.port = port
+        self.batch = batch
+        self.workers = workers
+        self.keepalive = ConnectionPool(host, port, use_tls=False, maxsize=max(workers, 1))
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+
+    def close(self):
+        self.executor.shutdown()
+        self.keepalive.close()
+
+    def _head(self, pool, headers=None):
+        response, _ = pool.request("HEAD", INDEX_PATH, headers=headers)
+        assert response.status == 200, response.status
+
+    # keep-alive vs 새 연결
+    def head_keepalive(self):
+        self._head(self.keepalive)
+
+    def head_fresh_connection(self):
+        # Connection: close 를 보내면 풀은 연결을 돌려받지 않으므로 매번 연결부터 다시 맺음
+        self._head(self.keepalive, {"Connection": "close"})
+
+    # 순차 vs 동시
+    def batch_sequential(self):
+        for _ in range(self.batch):
+            self._head(self.keepalive)
+
+    def batch_concurrent(self):
+        for future in [self.executor.submit(self._head, self.keepalive) for _ in range(self.batch)]:
+            future.result()
+
+    # HEAD vs Range GET
+    def head(self):
+        self._head(self.keepalive)
+
+    def range_get(self):
+        response, data = self.keepalive.request("GET", INDEX_PATH, headers={"Range": "bytes=0-0"})
+        assert response.status in (200, 206) and data, response.status
+
+    def full_get(self):
+        response, data = self.keepalive.request("GET", INDEX_PATH)
+        assert response.status == 200 and data, response.status
+
+    def groups(self):
+        return {
+            "connection": [("keepalive", self.head_keepalive), ("fresh", self.head_fresh_connection)],
+            "concurrency": [("sequential", self.batch_sequential), ("concurrent", self.batch_concurrent)],
+            "method": [("head", self.head), ("range_get", self.range_get), ("full_get", self.full_get)],
+        }
+
+
+def http2_group(url):
+    """httpx 로 같은 URL 에 HTTP/1.1 과 HTTP/2 요청을 보내는 함수 (준비가 안 되면 사유 문자열)"""
+    if not url:
+        return "로컬 모의 서버는 HTTP/1.1 만 지원합니다 (--url 로 HTTP/2 서버 지정)"
+    try:
+        import httpx
+        import h2  # noqa: F401  httpx 의 http2 옵션에 필요
+    except ImportError:
+        return "httpx[http2] 가 설치되어 있지 않습니다"
+
+    clients = {"http1": httpx.Client(http1=True, http2=False), "http2": httpx.Client(http1=False, http2=True)}
+
+    def request(client, expected):
+        def run_once():
+            response = client.head(url)
+            assert response.http_version == expected, response.http_version
+        return run_once
+
+    return [("http1", request(clients["http1"], "HTTP/1.1")), ("http2", request(clients["http2"], "HTTP/2"))]
+
+
+def compare(results, baseline, tolerance):
+    """기준 결과보다 p50 또는 p99 가 tolerance 비율 넘게 느려진 항목 목록"""
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get("results", {}).get(name)
+        if not previous:
+            continue
+        for key in ("p50_ms", "p99_ms"):
+            if previous[key] and current[key] > previous[key] * (1 + tolerance):
+                regressions.append({"scenario": name, "stat": key, "baseline": previous[key],
+                                    "current": current[key], "ratio": current[key] / previous[key]})
+    return regressions
+
+
+def print_table(results, skipped):
+    print(f"{'항목':<28}{'n':>6}{'평균':>10}{'p50':>10}{'p90':>10}{'p99':>10}  (ms)")
+    for name, stats in results.items():
+        print(f"{name:<28}{stats['n']:>6}{stats['mean_ms']:>10.3f}{stats['p50_ms']:>10.3f}"
+              f"{stats['p90_ms']:>10.3f}{stats['p99_ms']:>10.3f}")
+    for name, reason in skipped.items():
+        print(f"{name:<28}건너뜀: {reason}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="서버 요청 방식 벤치마크")
+    parser.add_argument("--iterations", type=int, default=300, help="항목별 측정 횟수")
+    parser.add_argument("--warmup", type=int, default=30, help="측정 전에 버리는 요청 수")
+    parser.add_argument("--batch", type=int, default=8, help="순차/동시 비교에서 한 번에 보낼 요청 수")
+    parser.add_argument("--workers", type=int, default=8, help="동시 전송 스레드 수")
+    parser.add_argument("--only", action="append", help="이 그룹만 실행 (connection, concurrency, method, http2)")
+    parser.add_argument("--url", default=None, help="HTTP/1.1 vs HTTP/2 비교에 쓸 실제 서버 URL")
+    parser.add_argument("--output", default=None, help="결과 JSON 저장 경로")
+    parser.add_argument("--baseline", default=None, help="비교할 이전 결과 JSON")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="느려져도 허용할 비율 (0.2 = 20%%)")
+    add_server_arguments(parser)
+    parser.set_defaults(index_size=16 * 1024)
+    args = parser.parse_args()
+
+    results = {}
+    skipped = {}
+    with MockSugangServer(**server_options(args)) as server:
+        host, port = server.address
+        scenarios = Scenarios(host, port, args.batch, args.workers)
+        try:
+            groups = scenarios.groups()
+            groups["http2"] = http2_group(args.url)
+            for group, cases in groups.items():
+                if args.only and group not in args.only:
+                    continue
+                if isinstance(cases, str):
+                    skipped[group] = cases
+                    continue
+                for name, run_once in cases:
+                    samples = measure(run_once, args.iterations, args.warmup)
+                    results[f"{group}.{name}"] = summarize(samples)
+        finally:
+            scenarios.close()
+        connects, reuses = scenarios.keepalive.connects, scenarios.keepalive.reuses
+
+    print(f"서버 요청 방식 벤치마크 (반복 {args.iterations}회, 워밍업 {args.warmup}회)\n")
+    print_table(results, skipped)
+    print(f"\n연결 풀: 새 연결 {connects}회, 재사용 {reuses}회")
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {k: v for k, v in vars(args).items() if k not in ("output", "baseline")},
+        "results": results,
+        "skipped": skipped,
     }
 
-    try:
-        # 여러 번 테스트 수행
-        for i in range(test_count):
-            print(f"테스트 #{i + 1} 실행 중...")
-
-            # HEAD 요청 테스트
-            try:
-                start_time = time.time()
-                head_response = requests.head(
-                    url,
-                    headers=headers,
-                    timeout=5,
-                    allow_redirects=False
-                )
-                head_time = (time.time() - start_time) * 1000  # 밀리초로 변환
-                head_status = head_response.status_code
-                head_headers_count = len(head_response.headers)
-                head_times.append(head_time)
-            except Exception as e:
-                print(f"HEAD 요청 오류: {e}")
-                head_time = None
-                head_status = "오류"
-                head_headers_count = 0
-
-            # 잠시 대기 (서버 부하 방지)
-            time.sleep(0.5)
-
-            # GET 요청 테스트
-            try:
-                start_time = time.time()
-                get_response = requests.get(
-                    url,
-                    headers=headers,
-                    timeout=5,
-                    allow_redirects=False,
-                    stream=True  # 응답 본문 크기 비교를 위해 스트림 모드 사용
-                )
-                get_time = (time.time() - start_time) * 1000  # 밀리초로 변환
-
-                # 응답 본문 크기 계산 (스트림 모드에서)
-                content_size = 0
-                for chunk in get_response.iter_content(chunk_size=1024):
-                    content_size += len(chunk)
-
-                get_status = get_response.status_code
-                get_headers_count = len(get_response.headers)
-                get_times.append(get_time)
-            except Exception as e:
-                print(f"GET 요청 오류: {e}")
-                get_time = None
-                get_status = "오류"
-                get_headers_count = 0
-                content_size = 0
-
-            # 결과 저장
-            faster = "HEAD" if head_time and get_time and head_time < get_time else "GET" if head_time and get_time else "-"
-            diff = abs(head_time - get_time) if head_time and get_time else None
-            results.append({
-                "테스트 #": i + 1,
-                "HEAD 상태": head_status,
-                "HEAD 시간(ms)": round(head_time, 2) if head_time else None,
-                "GET 상태": get_status,
-                "GET 시간(ms)": round(get_time, 2) if get_time else None,
-                "더 빠른 방식": faster,
-                "시간차(ms)": round(diff, 2) if diff else None
-            })
-
-            # 잠시 대기 (서버 부하 방지)
-            time.sleep(1.0)
-
-        # 결과 테이블 출력
-        print("\n" + "=" * 50)
-        print("테스트 결과 상세")
-        print("=" * 50)
-        print(tabulate(results, headers="keys", tablefmt="grid"))
-
-        # 통계 분석
-        valid_head_times = [t for t in head_times if t is not None]
-        valid_get_times = [t for t in get_times if t is not None]
-
-        if valid_head_times and valid_get_times:
-            head_avg = statistics.mean(valid_head_times)
-            get_avg = statistics.mean(valid_get_times)
-
-            head_median = statistics.median(valid_head_times)
-            get_median = statistics.median(valid_get_times)
-
-            try:
-                head_stdev = statistics.stdev(valid_head_times)
-                get_stdev = statistics.stdev(valid_get_times)
-            except:
-                head_stdev = 0
-                get_stdev = 0
-
-            faster_count = sum(1 for r in results if r["더 빠른 방식"] == "HEAD")
-            slower_count = sum(1 for r in results if r["더 빠른 방식"] == "GET")
-
-            print("\n" + "=" * 50)
-            print("통계 분석")
-            print("=" * 50)
-            stats_table = [
-                ["평균 응답 시간(ms)", round(head_avg, 2), round(get_avg, 2), "HEAD" if head_avg < get_avg else "GET",
-                 round(abs(head_avg - get_avg), 2)],
-                ["중앙값(ms)", round(head_median, 2), round(get_median, 2), "HEAD" if head_median < get_median else "GET",
-                 round(abs(head_median - get_median), 2)],
-                ["표준 편차(ms)", round(head_stdev, 2), round(get_stdev, 2), "-", "-"],
-                ["가장 빨랐던 횟수", faster_count, slower_count, "HEAD" if faster_count > slower_count else "GET",
-                 abs(faster_count - slower_count)]
-            ]
-            print(tabulate(stats_table, headers=["통계", "HEAD", "GET", "우세", "차이"], tablefmt="grid"))
-
-            # 최종 결론
-            print("\n" + "=" * 50)
-            print("최종 결론")
-            print("=" * 50)
-            if head_avg < get_avg:
-                print(f"✅ HEAD 요청이 평균 {round(get_avg - head_avg, 2)}ms 더 빠릅니다.")
-                recommendation = "세션 확인에 HEAD 요청을 사용하는 것이 효율적입니다."
-            else:
-                print(f"📊 GET 요청이 평균 {round(head_avg - get_avg, 2)}ms 더 빠릅니다.")
-                recommendation = "세션 확인에 stream=True 옵션을 사용한 GET 요청을 고려해보세요."
-
-            if abs(head_avg - get_avg) < 10:
-                print("⚠️ 두 방식의 차이가 10ms 미만으로 큰 차이가 없습니다.")
-                recommendation += " 다만 차이가 크지 않으므로 다른 요소도 함께 고려하세요."
-
-            print(f"💡 권장사항: {recommendation}")
-
-
-    except Exception as e:
-        print(f"테스트 중 오류 발생: {e}")
+    status = 0
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        report["regressions"] = regressions
+        if regressions:
+            status = 1
+            print(f"\n기준 대비 {args.tolerance:.0%} 넘게 느려진 항목")
+            for item in regressions:
+                print(f"  {item['scenario']} {item['stat']}: {item['baseline']:.3f} -> "
+                      f"{item['current']:.3f}ms (x{item['ratio']:.2f})")
+        else:
+            print("\n기준 결과 대비 성능 저하 없음")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"결과 저장: {args.output}")
+    return status
 
 
 if __name__ == "__main__":
-    # 테스트할 URL
-    url = "https://sugang.smu.ac.kr/index.do"  # 상명대학교 수강신청 시스템 URL
-
-    # 10회 테스트 실행
-    test_request_methods(url, test_count=10)
\ No newline at end of file
+    sys.exit(main())
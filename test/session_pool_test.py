@@ -0,0 +1,71 @@
+"""
+세션 풀 테스트
+
+세션을 돌아가며 쓰는지, 만료된 세션은 바로 빠지고 백그라운드 재로그인 뒤 돌아오는지,
+모의 서버에서 -3000 을 받으면 같은 요청 안에서 다른 세션으로 다시 보내 성공하는지 확인합니다.
+pytest 로 실행하거나 직접 실행할 수 있습니다:
+python test/session_pool_test.py
+"""
+
+import os
+import sys
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import sugang_request
+from mock_sugang_server import MockSugangServer, use_target
+from response_parser import Outcome
+from session_pool import EXPIRED, HEALTHY, SessionPool
+
+
+def test_rotation_and_refresh():
+    release = threading.Event()
+    refreshed = []
+
+    def login():
+        release.wait(5)
+        return {"SGJSESSIONID": "new-1", "WMONID": "w"}
+
+    pool = SessionPool(login=login, on_refresh=refreshed.append)
+    first, second = pool.add("s1", "w"), pool.add("s2", "w")
+    assert {pool.next().id for _ in range(4)} == {1, 2}
+
+    assert pool.mark_expired(first)
+    assert not pool.mark_expired(first)
+    # 갱신하는 동안에는 남은 세션만 씀
+    assert all(pool.next() is second for _ in range(3))
+    release.set()
+    for _ in range(50):
+        if first.state == HEALTHY:
+            break
+        threading.Event().wait(0.02)
+    assert first.state == HEALTHY and first.sgjsessionid == "new-1"
+    assert refreshed == [{"SGJSESSIONID": "new-1", "WMONID": "w"}]
+
+    # 다시 로그인할 수 없으면 만료 상태로 남고, 살아 있는 세션이 없으면 기다리지 않고 None
+    manual = SessionPool()
+    session = manual.add("s", "w")
+    manual.mark_expired(session)
+    assert session.state == EXPIRED and manual.next() is None
+
+
+def test_instant_failover_against_mock():
+    with MockSugangServer(seat_schedule={"HALB0001": [0]}, session_ttl=60) as server, use_target(server):
+        # 첫 세션은 서버에서 오래전에 발급된 것으로 두어 만료 응답을 받게 함
+        server.state.sessions["stale"] = -120.0
+        pool = SessionPool()
+        pool.add("stale", "w")
+        pool.add("fresh", "w")
+        sugang_request.set_session_pool(pool)
+        response = sugang_request.send_sugang_request("HALB0001", 1)
+        round_trips = server.state.round_trips
+    assert response.result.outcome == Outcome.SUCCESS and response.session == 2
+    assert round_trips == 2
+    assert pool.health() == {"healthy": 1, "expired": 1, "refreshing": 0}
+
+
+if __name__ == "__main__":
+    test_rotation_and_refresh()
+    test_instant_failover_against_mock()
+    print("통과")
@@ -0,0 +1,82 @@
+"""
+시뮬레이터 테스트
+
+가상 시계로 돌린 구간이 재현 가능한지, 정책 차이가 결과에 드러나는지,
+이벤트 로그에서 구간을 만들 수 있는지 확인합니다.
+pytest 로 실행하거나 직접 실행할 수 있습니다:
+python test/simulator_test.py
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from simulator import Policy, Scenario, evaluate, parse_latency, run_window
+
+
+def test_policy_parse():
+    assert Policy.parse("fixed:2") == Policy("fixed:2", "fixed", 2.0, 0.0)
+    policy = Policy.parse("aimd:0.5:4+nobreaker")
+    assert (policy.kind, policy.rate, policy.max_rate, policy.retry, policy.breaker) == ("aimd", 0.5, 4.0, True, False)
+
+
+def test_same_seed_same_window():
+    scenario = Scenario(duration=120, courses=["A", "B"], random_slowdowns=1, session_ttl=40)
+    policy = Policy.parse("aimd:0.5:2")
+    assert run_window(scenario, policy, 7) == run_window(scenario, policy, 7)
+
+
+def test_window_leaves_global_random_alone():
+    # 시뮬레이션이 프로세스 전체의 random 상태를 다시 정하면 같은 프로세스의 다른 난수가 고정돼 버림
+    state = random.getstate()
+    expected = random.random()
+    random.setstate(state)
+    run_window(Scenario(duration=30, courses=["A"]), Policy.parse("fixed:2"), 3, jitter=0.3)
+    assert random.random() == expected
+
+
+def test_faster_policy_reacts_sooner_and_sends_more():
+    scenario = Scenario(duration=120, courses=["A"], latency=parse_latency("const:50"), grab_time=0)
+    slow = evaluate(scenario, Policy.parse("fixed:0.5"), runs=30, jitter=0.0)
+    fast = evaluate(scenario, Policy.parse("fixed:4"), runs=30, jitter=0.0)
+    # 경쟁자가 없으면 두 정책 모두 자리를 잡지만, 빠른 정책이 먼저 잡고 요청은 더 많이 보냄
+    assert slow["seat_rate"] == fast["seat_rate"] == 1.0
+    assert fast["reaction_s"]["p90"] < slow["reaction_s"]["p90"]
+    assert fast["requests_per_seat"] > slow["requests_per_seat"]
+
+
+def test_runs_faster_than_real_time():
+    scenario = Scenario(duration=600, courses=["A", "B", "C"], seat_releases=0)
+    start = time.perf_counter()
+    granted_at, won, requests, probes, errors = run_window(scenario, Policy.parse("fixed:2"), 1)
+    assert not granted_at and requests > 1000
+    assert time.perf_counter() - start < 5
+
+
+def test_scenario_from_events():
+    events = [
+        {"ts": 100.0, "kind": "attempt", "course": "A", "outcome": "over_capacity", "elapsed": 0.05},
+        {"ts": 101.2, "kind": "attempt", "course": "A", "outcome": "server_error", "elapsed": 0.3},
+        {"ts": 102.5, "kind": "attempt_error", "course": "A", "error": "TimeoutError"},
+        {"ts": 104.0, "kind": "attempt", "course": "A", "outcome": "session_expired", "elapsed": 0.05},
+        {"ts": 110.0, "kind": "attempt", "course": "A", "outcome": "success", "granted": True, "elapsed": 0.05},
+    ]
+    scenario = Scenario.from_events(events)
+    assert scenario.courses == ["A"]
+    assert scenario.seat_times == {"A": [10.0]}
+    assert scenario.outages == [(1, 3, 1.0)]
+    assert scenario.expiries == [4.0]
+    assert run_window(scenario, Policy.parse("fixed:2"), 0)[0].keys() <= {"A"}
+
+
+if __name__ == "__main__":
+    test_policy_parse()
+    test_same_seed_same_window()
+    test_window_leaves_global_random_alone()
+    test_faster_policy_reacts_sooner_and_sends_more()
+    test_runs_faster_than_real_time()
+    test_scenario_from_events()
+    print("통과")
@@ -0,0 +1,75 @@
+"""
+SSO 로그인 테스트
+
+모의 서버의 Auth.do -> Login.do -> 중계 폼 흐름을 따라가 SGJSESSIONID/WMONID 쿠키를 받는지,
+비밀번호가 틀리면 LoginError 가 나는지, 캐시된 세션을 그대로 쓰다가
+refresh_in_background 가 새 세션으로 바꾸는지 확인합니다.
+pytest 로 실행하거나 직접 실행할 수 있습니다:
+python test/sso_login_test.py
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mock_sugang_server import INDEX_PATH, SSO_AUTH_PATH, MockSugangServer
+from sso_login import LoginError, SessionManager, load_cached_tokens, login, save_tokens
+
+
+def urls(server):
+    host, port = server.address
+    return f"http://{host}:{port}{SSO_AUTH_PATH}", f"http://{host}:{port}{INDEX_PATH}"
+
+
+def test_login_returns_session_cookies():
+    with MockSugangServer(sso_user="202012345", sso_password="secret") as server:
+        tokens = login("202012345", "secret", *urls(server))
+        assert tokens["SGJSESSIONID"] in server.state.sessions
+        assert tokens["WMONID"]
+        assert tokens["expires"] > tokens["obtained"]
+        assert server.state.logins == 1
+
+
+def test_wrong_password():
+    with MockSugangServer(sso_user="202012345", sso_password="secret") as server:
+        try:
+            login("202012345", "wrong", *urls(server))
+        except LoginError:
+            pass
+        else:
+            raise AssertionError("틀린 비밀번호로 로그인되었습니다")
+        assert server.state.logins == 0
+
+
+def test_cached_session_then_background_refresh():
+    with MockSugangServer(sso_user="202012345", sso_password="secret") as server, \
+            tempfile.TemporaryDirectory() as directory:
+        cache_path = os.path.join(directory, "session.json")
+        now = time.time()
+        save_tokens({"SGJSESSIONID": "cached", "WMONID": "w", "obtained": now, "expires": now + 600},
+                    cache_path)
+        updates = []
+        manager = SessionManager("202012345", "secret", on_update=lambda sid, wmonid: updates.append(sid),
+                                 cache_path=cache_path, sso_url=urls(server)[0], sugang_index_url=urls(server)[1])
+
+        # 캐시가 유효하면 로그인하지 않고 그대로 씀
+        assert manager.start()["SGJSESSIONID"] == "cached"
+        assert updates == ["cached"] and server.state.logins == 0
+
+        assert manager.refresh_in_background()
+        manager._refreshing.join(10)
+
+        new_id = manager.tokens["SGJSESSIONID"]
+        assert new_id != "cached" and new_id in server.state.sessions
+        assert updates == ["cached", new_id] and manager.refreshes == 1 and server.state.logins == 1
+        assert load_cached_tokens(cache_path)["SGJSESSIONID"] == new_id
+
+
+if __name__ == "__main__":
+    test_login_returns_session_cookies()
+    test_wrong_password()
+    test_cached_session_then_background_refresh()
+    print("통과")
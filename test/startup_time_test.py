@@ -0,0 +1,63 @@
+"""
+run 경로 시작 시간 예산 테스트
+
+python -X importtime 으로 `python -m sugang run` 이 불러오는 모듈(sugang, main)의 import 시간을 재고
+예산(STARTUP_BUDGET_MS, 환경 변수 SUGANG_STARTUP_BUDGET_MS 로 조정)을 넘지 않는지,
+run 에 필요 없는 무거운 모듈이 딸려 오지 않는지 확인합니다.
+pytest 로 실행하거나 직접 실행할 수 있습니다:
+python test/startup_time_test.py
+"""
+
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+STARTUP_BUDGET_MS = float(os.environ.get("SUGANG_STARTUP_BUDGET_MS", 150))
+RUNS = 3
+
+# run 경로에서 불러오면 안 되는 모듈 (다른 하위 명령이나 선택 기능에서만 필요)
+FORBIDDEN = {"requests", "tabulate", "selenium", "playwright", "httpx", "asyncio",
+             "http.server", "urllib.request", "http.cookiejar", "log_analyzer", "sso_login"}
+
+RUN_PATH_CODE = "import sugang; import main"
+
+
+def import_times():
+    """{모듈 이름: 누적 import 시간(us)} (-X importtime 출력)"""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", RUN_PATH_CODE],
+                            cwd=ROOT, capture_output=True, text=True, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def run_path_ms(times):
+    return (times.get("sugang", 0) + times.get("main", 0)) / 1000
+
+
+def test_run_path_startup_budget():
+    # 가장 빠른 측정값으로 비교 (디스크 캐시, 다른 프로세스 영향 줄이기)
+    best = min(run_path_ms(import_times()) for _ in range(RUNS))
+    assert best <= STARTUP_BUDGET_MS, f"run 경로 import {best:.1f}ms > 예산 {STARTUP_BUDGET_MS:.0f}ms"
+
+
+def test_run_path_skips_heavy_modules():
+    loaded = FORBIDDEN & set(import_times())
+    assert not loaded, f"run 경로에서 불필요한 모듈을 불러옴: {sorted(loaded)}"
+
+
+if __name__ == "__main__":
+    times = import_times()
+    slowest = sorted(times.items(), key=lambda item: -item[1])[:10]
+    print(f"run 경로 import: {run_path_ms(times):.1f}ms (예산 {STARTUP_BUDGET_MS:.0f}ms)")
+    for name, us in slowest:
+        print(f"  {name:<30}{us / 1000:>8.1f}ms")
+    test_run_path_startup_budget()
+    test_run_path_skips_heavy_modules()
+    print("통과")
@@ -0,0 +1,68 @@
+"""
+상태 저장소 테스트
+
+같은 응답이 이어지면 디스크에 다시 쓰지 않는지, 성공 기록과 세션 토큰이 정리 없이 죽은
+프로세스 뒤에도 남아 재시작한 저장소에서 그대로 읽히는지 확인합니다.
+pytest 로 실행하거나 직접 실행할 수 있습니다:
+python test/state_store_test.py
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from response_parser import parse_response
+from state_store import StateStore
+
+OVER = parse_response('{"ErrorCode":-1,"ErrorMsg":"수강 제한 인원을 초과하였습니다."}')
+GRANTED = parse_response('{"ErrorCode":0,"ErrorMsg":"","dmResult":{"strRtnCd":"true"}}')
+
+CRASH_SCRIPT = """
+import os, sys
+sys.path.insert(0, sys.argv[1])
+from response_parser import parse_response
+from state_store import StateStore
+store = StateStore(sys.argv[2])
+store.record("HALB0001", 2, parse_response('{"ErrorCode":0,"ErrorMsg":"","dmResult":{"strRtnCd":"true"}}'))
+store.save_session("token", "wmon")
+os._exit(1)   # close 없이 강제 종료
+"""
+
+
+def test_repeated_outcome_not_rewritten():
+    with tempfile.TemporaryDirectory() as directory:
+        store = StateStore(os.path.join(directory, "state.db"))
+        assert store.record("HALB0001", 1, OVER)
+        assert not store.record("HALB0001", 1, OVER)
+        # 후보 분반을 번갈아 보내며 같은 거절을 받는 동안에도 쓰지 않음
+        assert not store.record("HALB0001", 2, OVER)
+        assert store.record("HALB0001", 2, GRANTED)
+        assert store.writes == 2
+        assert store.granted() == {"HALB0001": 2}
+        store.close()
+
+
+def test_state_survives_crash():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "state.db")
+        subprocess.run([sys.executable, "-c", CRASH_SCRIPT, ROOT, path], timeout=30)
+        store = StateStore(path)
+        assert store.granted() == {"HALB0001": 2}
+        tokens = store.load_session()
+        assert tokens["SGJSESSIONID"] == "token" and tokens["WMONID"] == "wmon"
+        assert store.last_outcomes()["HALB0001"][:2] == (2, "success")
+        # 다시 읽은 마지막 응답과 같으면 쓰지 않음
+        assert not store.record("HALB0001", 2, GRANTED)
+        store.reset()
+        assert store.granted() == {} and store.load_session() is None
+        store.close()
+
+
+if __name__ == "__main__":
+    test_repeated_outcome_not_rewritten()
+    test_state_survives_crash()
+    print("통과")
@@ -0,0 +1,132 @@
+"""
+TLS 세션 재개와 DNS 캐시 벤치마크
+
+openssl 명령으로 자체 서명 인증서를 만들어 모의 서버를 HTTPS 로 띄우고, 새 연결마다
+전체 핸드셰이크를 하는 경우와 이전 세션을 재개하는 경우의 TLS 단계 시간을 비교합니다.
+DNS 는 매번 getaddrinfo 를 부르는 경우와 캐시(재시작 흉내로 파일에서 다시 읽은 캐시 포함)를
+비교합니다. localhost 조회는 실제 DNS 보다 훨씬 빠르므로 --host 로 실제 이름을 줄 수 있습니다.
+
+python test/tls_resume_bench.py --connections 200
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import socket
+import ssl
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import connection_pool
+from connection_pool import ConnectionPool
+from dns_cache import DnsCache
+from mock_sugang_server import INDEX_PATH, MockSugangServer
+
+
+def percentile(sorted_values, q):
+    # 최근접 순위 방식 백분위수
+    index = max(0, min(len(sorted_values) - 1, int(round(q / 100.0 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+def make_self_signed(directory):
+    """localhost 용 자체 서명 인증서 (openssl 이 없으면 None)"""
+    if shutil.which("openssl") is None:
+        return None
+    certfile, keyfile = os.path.join(directory, "cert.pem"), os.path.join(directory, "key.pem")
+    subprocess.run(["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+                    "-keyout", keyfile, "-out", certfile, "-subj", "/CN=localhost",
+                    "-addext", "subjectAltName=DNS:localhost,IP:127.0.0.1"],
+                   check=True, capture_output=True)
+    return certfile, keyfile
+
+
+def summarize(name, samples_ms, **extra):
+    samples_ms.sort()
+    return {"case": name, "mean_ms": statistics.mean(samples_ms), "p50_ms": percentile(samples_ms, 50),
+            "p99_ms": percentile(samples_ms, 99), **extra}
+
+
+def tls_case(name, port, context, connections, resume):
+    connection_pool.TLS_SESSIONS.clear()
+    pool = ConnectionPool("localhost", port, use_tls=True, maxsize=1, ssl_context=context)
+    samples = []
+    for _ in range(connections):
+        if not resume:
+            connection_pool.TLS_SESSIONS.clear()
+        with pool.open("HEAD", INDEX_PATH) as response:
+            response.read()
+            samples.append(response.timings["tls"] * 1000)
+        # 매번 새 연결을 열도록 유휴 연결을 닫음
+        pool.close()
+    return summarize(name, samples, full=pool.tls_full, resumed=pool.tls_resumed)
+
+
+def dns_case(host, port, lookups, path):
+    direct = []
+    for _ in range(lookups):
+        start = time.perf_counter()
+        socket.getaddrinfo(host, port, 0, socket.SOCK_STREAM)
+        direct.append((time.perf_counter() - start) * 1000)
+    cache = DnsCache(path)
+    cache.resolve(host, port)
+    # 재시작 흉내: 파일에서 새로 읽은 캐시의 첫 조회
+    restarted = DnsCache(path)
+    start = time.perf_counter()
+    restarted.resolve(host, port)
+    first_after_restart = (time.perf_counter() - start) * 1000
+    cached = []
+    for _ in range(lookups):
+        start = time.perf_counter()
+        restarted.resolve(host, port)
+        cached.append((time.perf_counter() - start) * 1000)
+    assert restarted.misses == 0
+    return [summarize("getaddrinfo", direct),
+            summarize("캐시", cached, first_after_restart_ms=first_after_restart)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="TLS 세션 재개와 DNS 캐시 벤치마크")
+    parser.add_argument("--connections", type=int, default=200, help="경우마다 새로 열 연결 수")
+    parser.add_argument("--lookups", type=int, default=200, help="DNS 조회 횟수")
+    parser.add_argument("--host", default="localhost", help="DNS 조회 대상 호스트")
+    parser.add_argument("--output", default=None, help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    results = {"tls": [], "dns": []}
+    with tempfile.TemporaryDirectory() as directory:
+        files = make_self_signed(directory)
+        if files is None:
+            print("openssl 명령이 없어 TLS 측정을 건너뜁니다.")
+        else:
+            context = ssl.create_default_context(cafile=files[0])
+            with MockSugangServer(certfile=files[0], keyfile=files[1]) as server:
+                port = server.address[1]
+                print(f"{'TLS':<12}{'평균ms':>9}{'p50':>9}{'p99':>9}{'전체':>7}{'재개':>7}")
+                for name, resume in (("전체 핸드셰이크", False), ("세션 재개", True)):
+                    row = tls_case(name, port, context, args.connections, resume)
+                    results["tls"].append(row)
+                    print(f"{name:<12}{row['mean_ms']:>9.3f}{row['p50_ms']:>9.3f}{row['p99_ms']:>9.3f}"
+                          f"{row['full']:>7}{row['resumed']:>7}")
+        print(f"\n{'DNS (' + args.host + ')':<24}{'평균ms':>9}{'p50':>9}{'p99':>9}")
+        for row in dns_case(args.host, 443, args.lookups, os.path.join(directory, "dns.json")):
+            results["dns"].append(row)
+            print(f"{row['case']:<24}{row['mean_ms']:>9.4f}{row['p50_ms']:>9.4f}{row['p99_ms']:>9.4f}")
+        print(f"재시작 후 첫 조회: {results['dns'][1]['first_after_restart_ms']:.4f}ms")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"python": platform.python_version(), "openssl": ssl.OPENSSL_VERSION,
+                       "config": vars(args), "results": results}, f, ensure_ascii=False, indent=2)
+        print(f"결과 저장: {args.output}")
+
+
+if __name__ == "__main__":
+    main()